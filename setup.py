@@ -6,7 +6,9 @@ Created on 2018/9/16
 """
 from setuptools import find_packages, setup
 
-install_requires = ['six', 'simplejson', 'delorean', 'pandas', 'python-dateutil', 'pytz', 'pyasn1==0.4.4', 'rsa==4.0', 'stomp.py']
+install_requires = ['six', 'simplejson', 'delorean', 'pandas', 'python-dateutil', 'pytz', 'pyasn1==0.4.4', 'rsa==4.0',
+                    'stomp.py', 'futures; python_version < "3.0"']
+extras_require = {'crypto': ['cryptography'], 'async': ['aiohttp']}
 
 setup(
     name='tigeropen',
@@ -20,6 +22,7 @@ setup(
     url='https://github.com/tigerbrokers/openapi-python-sdk',
     platforms='any',
     install_requires=install_requires,
+    extras_require=extras_require,
     classifiers=[
         'Programming Language :: Python',
         'Operating System :: Microsoft :: Windows',
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import calendar
+import datetime
+import unittest
+
+import pandas as pd
+
+from tigeropen.common.consts import BarPeriod
+from tigeropen.common.util.common_utils import eastern
+from tigeropen.push.bar_builder import BarBuilder
+
+
+def to_timestamp(*args):
+    return calendar.timegm(eastern.localize(datetime.datetime(*args)).utctimetuple()) * 1000
+
+
+class BarBuilderTest(unittest.TestCase):
+    """
+    日内K线按开盘时间切分，预热K线保留服务端的时间和成交量
+    """
+
+    def test_hour_bars_align_to_session_open(self):
+        builder = BarBuilder(periods=(BarPeriod.ONE_HOUR, BarPeriod.HALF_HOUR), cumulative_volume=False)
+        builder.update('AAPL', 157.0, 100, to_timestamp(2019, 1, 7, 9, 45))
+        bar = builder.get_current_bar('AAPL', BarPeriod.ONE_HOUR)
+        self.assertEqual(bar.time, to_timestamp(2019, 1, 7, 9, 30))
+        self.assertEqual(bar.end_time, to_timestamp(2019, 1, 7, 10, 30))
+        bar = builder.get_current_bar('AAPL', BarPeriod.HALF_HOUR)
+        self.assertEqual(bar.time, to_timestamp(2019, 1, 7, 9, 30))
+
+    def test_session_open_is_configurable(self):
+        builder = BarBuilder(periods=(BarPeriod.ONE_HOUR,), session_open=datetime.time(9, 0))
+        builder.update('AAPL', 157.0, 100, to_timestamp(2019, 1, 7, 9, 45))
+        self.assertEqual(builder.get_current_bar('AAPL', BarPeriod.ONE_HOUR).time, to_timestamp(2019, 1, 7, 9, 0))
+
+    def test_seed_keeps_bar_time_and_volume(self):
+        builder = BarBuilder(periods=(BarPeriod.ONE_HOUR,), cumulative_volume=False)
+        start = to_timestamp(2019, 1, 7, 9, 30)
+        bars = pd.DataFrame({'symbol': ['AAPL'], 'time': [start], 'open': [157.0], 'high': [158.0],
+                             'low': [156.0], 'close': [157.5], 'volume': [12.5]})
+        builder.seed(bars, BarPeriod.ONE_HOUR, timestamp=to_timestamp(2019, 1, 7, 10, 0))
+        bar = builder.get_current_bar('AAPL', BarPeriod.ONE_HOUR)
+        self.assertEqual(bar.time, start)
+        self.assertEqual(bar.end_time, to_timestamp(2019, 1, 7, 10, 30))
+        self.assertEqual(bar.volume, 12.5)
+
+        # 后续行情继续更新预热的K线
+        builder.update('AAPL', 159.0, 10, to_timestamp(2019, 1, 7, 10, 15))
+        self.assertIs(builder.get_current_bar('AAPL', BarPeriod.ONE_HOUR), bar)
+        self.assertEqual((bar.high, bar.volume), (159.0, 22.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
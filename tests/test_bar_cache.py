@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from tigeropen.quote.quote_client import QuoteClient
+from tigeropen.tiger_open_config import TigerOpenClientConfig
+
+
+class CachedBarsTest(unittest.TestCase):
+    """
+    启用本地K线缓存时 get_bars 的补数逻辑，服务端以时间 1..300 的K线模拟
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        config = TigerOpenClientConfig()
+        config.bar_cache_dir = self.cache_dir
+        config.bar_cache_refresh_interval = 3600
+        self.client = QuoteClient(config)
+        self.requests = []
+        self.client._QuoteClient__get_bars = self.fetch
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def fetch(self, symbols, period, begin_time, end_time, right, limit, lang):
+        self.requests.append((begin_time, end_time, limit))
+        frames = []
+        for symbol in symbols:
+            times = [t for t in range(1, 301) if (begin_time == -1 or t >= begin_time)
+                     and (end_time == -1 or t <= end_time)]
+            if limit:
+                times = times[-limit:]
+            frames.append(pd.DataFrame({'symbol': symbol, 'time': times, 'close': [float(t) for t in times]}))
+        return pd.concat(frames, ignore_index=True)
+
+    def test_end_time_before_cached_range(self):
+        self.client.get_bars(['AAPL'], begin_time=100, end_time=200, limit=1000)
+        bars = self.client.get_bars(['AAPL'], end_time=50, limit=10)
+        self.assertEqual(list(bars['time']), list(range(41, 51)))
+        # 早于缓存的K线不写入缓存，缓存仍从 100 开始
+        bars = self.client.get_bars(['AAPL'], begin_time=100, end_time=105, limit=1000)
+        self.assertEqual(list(bars['time']), list(range(100, 106)))
+
+    def test_backfill_counts_only_bars_before_end_time(self):
+        self.client.get_bars(['AAPL'], begin_time=100, end_time=200, limit=1000)
+        bars = self.client.get_bars(['AAPL'], end_time=105, limit=20)
+        self.assertEqual(list(bars['time']), list(range(86, 106)))
+
+    def test_cached_range_needs_no_request(self):
+        self.client.get_bars(['AAPL'], begin_time=100, end_time=200, limit=1000)
+        del self.requests[:]
+        bars = self.client.get_bars(['AAPL'], end_time=150, limit=10)
+        self.assertEqual(list(bars['time']), list(range(141, 151)))
+        self.assertEqual(self.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
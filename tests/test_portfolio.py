@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+
+from tigeropen.trade.domain.contract import Contract
+from tigeropen.trade.domain.position import Position
+from tigeropen.trade.portfolio import PortfolioMirror
+
+
+class FakeTradeClient(object):
+
+    def __init__(self, positions, error=None):
+        self.positions = positions
+        self.error = error
+
+    def get_positions(self, account=None, **kwargs):
+        if self.error:
+            raise self.error
+        return list(self.positions)
+
+    def get_assets(self, account=None):
+        return []
+
+
+class FakeLogger(object):
+
+    def __init__(self):
+        self.warnings = []
+        self.errors = []
+        self.logged = threading.Event()
+
+    def warning(self, msg, *args):
+        self.warnings.append(msg % args)
+
+    def error(self, msg, *args, **kwargs):
+        self.errors.append(msg)
+        self.logged.set()
+
+
+def option_position(strike, quantity):
+    contract = Contract('AAPL', 'USD', sec_type='OPT', expiry='20190118', strike=strike, put_call='CALL')
+    return Position('DU575569', contract, quantity=quantity)
+
+
+class PortfolioMirrorTest(unittest.TestCase):
+    """
+    持仓推送的匹配和后台对账
+    """
+
+    def setUp(self):
+        self.logger = FakeLogger()
+        self.positions = [option_position(150.0, 1), option_position(155.0, 2)]
+        self.mirror = PortfolioMirror(FakeTradeClient(self.positions), logger=self.logger)
+        self.mirror.load('DU575569')
+
+    def test_ambiguous_push_is_left_for_reconcile(self):
+        # 推送没有 contract_id 和 strike，同时匹配两个期权持仓
+        self.mirror.on_position_changed('DU575569', [('symbol', 'AAPL'), ('sec_type', 'OPT'), ('quantity', 5)])
+        positions = self.mirror.get_positions(account='DU575569', symbol='AAPL')
+        self.assertEqual(sorted(position.quantity for position in positions), [1, 2])
+        self.assertEqual(len(self.logger.warnings), 1)
+
+    def test_unique_push_updates_position(self):
+        self.mirror.on_position_changed('DU575569', [('symbol', 'AAPL'), ('sec_type', 'OPT'), ('strike', 155.0),
+                                                     ('quantity', 5)])
+        positions = self.mirror.get_positions(account='DU575569', symbol='AAPL')
+        self.assertEqual(sorted(position.quantity for position in positions), [1, 5])
+        self.assertEqual(self.logger.warnings, [])
+
+    def test_reconcile_failure_is_logged(self):
+        self.mirror._trade_client.error = RuntimeError('gateway unavailable')
+        self.mirror.start_reconcile(0.01)
+        try:
+            self.assertTrue(self.logger.logged.wait(5))
+        finally:
+            self.mirror.stop_reconcile()
+        self.assertEqual(str(self.logger.errors[0]), 'gateway unavailable')
+
+
+if __name__ == '__main__':
+    unittest.main()
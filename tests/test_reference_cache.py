@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+
+from tigeropen.common.reference_cache import ReferenceDataCache
+
+
+def cached_files(directory):
+    return sorted(os.path.relpath(os.path.join(root, name), directory)
+                  for root, _, names in os.walk(directory) for name in names if name.endswith('.pkl'))
+
+
+class ReferenceDataCacheTest(unittest.TestCase):
+    """
+    按 namespace 清除持久化的缓存
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def create_cache(self):
+        return ReferenceDataCache(ttl=3600, cache_dir=self.cache_dir, session_refresh=False)
+
+    def test_clear_namespace_removes_files_of_other_processes(self):
+        cache = self.create_cache()
+        cache.put(('contract', 'DU575569', 14), 'AAPL')
+        cache.put(('symbols', 'US'), ['AAPL', 'TSLA'])
+
+        # 新的缓存实例没有读取过这些键，清除时同样删除磁盘上的文件
+        cache = self.create_cache()
+        cache.clear('contract')
+        self.assertEqual([os.path.dirname(path) for path in cached_files(self.cache_dir)], ['symbols'])
+        self.assertIsNone(self.create_cache().lookup(('contract', 'DU575569', 14)))
+        self.assertEqual(self.create_cache().lookup(('symbols', 'US')), ['AAPL', 'TSLA'])
+
+        cache.clear()
+        self.assertEqual(cached_files(self.cache_dir), [])
+
+    def test_namespace_with_path_characters(self):
+        cache = self.create_cache()
+        cache.put(('../contract', 1), 'AAPL')
+        self.assertEqual(len(cached_files(self.cache_dir)), 1)
+        self.assertEqual(self.create_cache().lookup(('../contract', 1)), 'AAPL')
+        cache.clear('../contract')
+        self.assertEqual(cached_files(self.cache_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
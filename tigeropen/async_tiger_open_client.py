@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+基于 asyncio 的开放平台客户端基类，AsyncQuoteClient 和 AsyncTradeClient 共用
+"""
+import asyncio
+import functools
+
+from tigeropen.common.consts import SignVerifyPolicy
+from tigeropen.common.exceptions import ApiException, RateLimitException
+from tigeropen.common.util.async_web_utils import AsyncHttpTransport
+from tigeropen.common.util.request_context import RequestContext, get_request_context
+from tigeropen.tiger_open_client import TigerOpenClient
+
+
+class AsyncTigerOpenClient(TigerOpenClient):
+    """
+    TigerOpenClient 的 asyncio 版本，签名和验签逻辑与同步客户端一致，请求通过 AsyncHttpTransport 发送
+    验签在事件循环的默认线程池中执行，不使用同步客户端的连接池和后台验签线程
+    client_config：客户端配置
+    logger：日志对象
+    transport：可选，多个客户端共享同一个 AsyncHttpTransport 以复用连接
+    """
+
+    def __init__(self, client_config, logger=None, transport=None):
+        self._setup(client_config, logger)
+        if transport is None:
+            transport = AsyncHttpTransport(limit=client_config.connection_pool_size * 10,
+                                           keepalive_timeout=client_config.connection_idle_timeout)
+        self._transport = transport
+        self._logger = logger
+
+    """
+    内部方法，按接口频率限制等待或拒绝请求，等待期间不阻塞事件循环
+    """
+
+    async def _acquire_rate_limit(self, request, context):
+        config = self.client_config
+        loop = asyncio.get_event_loop()
+        deadline = None if config.rate_limit_timeout is None else loop.time() + config.rate_limit_timeout
+        while True:
+            wait = self.rate_limiter.try_acquire(request.method)
+            if not wait:
+                return
+            if not config.rate_limit_blocking or (deadline is not None and loop.time() + wait > deadline):
+                raise RateLimitException('[' + context.request_id + ']rate limit exceeded. method:' + request.method)
+            await asyncio.sleep(wait)
+
+    """
+    执行接口请求
+    """
+
+    async def execute(self, request):
+        context = RequestContext(request.method, self._logger).activate()
+        await self._acquire_rate_limit(request, context)
+        # 等待期间其他协程可能修改了当前线程的上下文
+        context.activate()
+        params = self._prepare_request(request, context)
+        timestamp = params.get('timestamp')
+
+        response = await self._transport.do_post(self.client_config.server_url, self.headers, params,
+                                                 self.client_config.timeout, self.client_config.charset)
+
+        return await self._parse_response(response, timestamp, context)
+
+    """
+    内部方法，解析请求返回结果，验签在线程池中执行，不阻塞事件循环
+    """
+
+    async def _parse_response(self, response_str, timestamp=None, context=None):
+        context = context or get_request_context(self._logger)
+        response_str, response_content = self._load_response(response_str, context)
+        sign = self._get_response_sign(response_content, timestamp)
+        if sign is None:
+            return response_content
+
+        loop = asyncio.get_event_loop()
+        verify = functools.partial(self._verify_sign, context, timestamp, sign, response_str)
+        policy = self.client_config.sign_verify_policy
+        if policy == SignVerifyPolicy.DEFERRED:
+            # 响应直接返回，验签失败时通过回调通知
+            loop.run_in_executor(None, verify).add_done_callback(self._on_deferred_verify_done)
+        elif self._should_verify(policy):
+            await loop.run_in_executor(None, verify)
+
+        return response_content
+
+    def _on_deferred_verify_done(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self._on_deferred_verify_failed(future.exception())
+
+    """
+    内部方法，执行请求并解析为指定的响应对象，失败时抛出 ApiException
+    """
+
+    async def _fetch_response(self, request, response_class):
+        try:
+            response_content = await self.execute(request)
+        except Exception as e:
+            if self._logger:
+                self._logger.error(e, exc_info=True)
+            raise e
+        if not response_content:
+            return None
+        response = response_class()
+        response.parse_response_content(response_content)
+        if not response.is_success():
+            raise ApiException(response.code, response.message)
+        return response
+
+    async def close(self):
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -68,6 +68,14 @@ class Language(Enum):
     en_US = 'en_US'  # 英文
 
 
+@unique
+class SignVerifyPolicy(Enum):
+    ALWAYS = 'always'  # 每个响应都同步验签
+    SAMPLED = 'sampled'  # 每 N 个响应同步验签一次
+    DEFERRED = 'deferred'  # 在后台线程验签，失败时通过回调通知
+    TRADE_ONLY = 'trade_only'  # 仅对交易客户端(TradeClient)的响应验签
+
+
 @unique
 class QuoteRight(Enum):
     BR = 'br'  # 前复权
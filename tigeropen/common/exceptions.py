@@ -23,3 +23,7 @@ class RequestException(Exception):
 
 class ResponseException(Exception):
     pass
+
+
+class RateLimitException(RequestException):
+    pass
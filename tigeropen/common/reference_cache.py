@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+股票列表、合约等参考数据的内存和磁盘缓存
+"""
+import datetime
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+
+import pandas as pd
+
+from tigeropen.common.util.common_utils import eastern, china, hongkong
+
+# 各市场每天的数据刷新时间(当地时间)，之前缓存的数据在该时间之后视为过期
+SESSION_BOUNDARIES = {'US': (eastern, 4, 0), 'HK': (hongkong, 9, 0), 'CN': (china, 9, 0)}
+
+CURRENCY_MARKETS = {'USD': 'US', 'HKD': 'HK', 'CNH': 'CN', 'CNY': 'CN'}
+
+# 可直接用作持久化子目录名的 namespace
+_NAMESPACE_PATTERN = re.compile(r'^[A-Za-z0-9_\-]+$')
+
+
+def last_session_boundary(market=None, now=None):
+    """
+    市场最近一次的数据刷新时间(秒级时间戳)，market 为空或 ALL 时取所有市场中最近的一次
+    """
+    if now is None:
+        now = time.time()
+    if market in SESSION_BOUNDARIES:
+        markets = [market]
+    else:
+        markets = SESSION_BOUNDARIES.keys()
+    latest = None
+    for name in markets:
+        timezone, hour, minute = SESSION_BOUNDARIES[name]
+        local = datetime.datetime.fromtimestamp(now, timezone)
+        boundary = local.replace(hour=hour, minute=minute, second=0, microsecond=0, tzinfo=None)
+        if boundary > local.replace(tzinfo=None):
+            boundary -= datetime.timedelta(days=1)
+        boundary = timezone.localize(boundary)
+        timestamp = (boundary - boundary.utcoffset()).replace(tzinfo=None) - datetime.datetime(1970, 1, 1)
+        timestamp = timestamp.total_seconds()
+        if latest is None or timestamp > latest:
+            latest = timestamp
+    return latest
+
+
+def create_reference_cache(client_config):
+    """
+    按客户端配置创建参考数据缓存，未启用时返回 None
+    """
+    if not client_config or not client_config.reference_cache_ttl:
+        return None
+    return ReferenceDataCache(ttl=client_config.reference_cache_ttl, cache_dir=client_config.reference_cache_dir,
+                              session_refresh=client_config.reference_cache_session_refresh)
+
+
+class ReferenceDataCache(object):
+    """
+    股票列表、合约等变化较少的参考数据的缓存
+    ttl：缓存有效期，单位秒
+    cache_dir：可选，缓存持久化目录，进程重启后可直接使用，每个 namespace(键的第一个元素)一个子目录
+    session_refresh：是否在每个市场的数据刷新时间(SESSION_BOUNDARIES)之后使之前缓存的数据过期
+    """
+
+    def __init__(self, ttl=24 * 60 * 60, cache_dir=None, session_refresh=True):
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.session_refresh = session_refresh
+        self._lock = threading.Lock()
+        self._entries = dict()
+        if cache_dir and not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    def get(self, key, loader, market=None):
+        """
+        读取缓存，不存在或已过期时调用 loader 加载，loader 返回 None 时不缓存
+        :param key: 缓存键，可哈希的元组
+        :param loader: 加载数据的函数
+        :param market: 数据所属市场，用于判断是否跨过数据刷新时间
+        """
+        value = self.lookup(key)
+        if value is not None:
+            return value
+        value = loader()
+        if value is not None:
+            self.put(key, value, market)
+        return self._copy(value)
+
+    def lookup(self, key):
+        """
+        读取未过期的缓存，不存在时返回 None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self.cache_dir:
+            entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    self._entries[key] = entry
+        if entry is None:
+            return None
+        stored_at, market, value = entry
+        if not self._is_fresh(stored_at, market):
+            self.invalidate(key)
+            return None
+        return self._copy(value)
+
+    def put(self, key, value, market=None):
+        entry = (time.time(), market, value)
+        with self._lock:
+            self._entries[key] = entry
+        if self.cache_dir:
+            path = self._path(key)
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                try:
+                    os.makedirs(directory)
+                except OSError:
+                    # 其他线程已创建
+                    if not os.path.isdir(directory):
+                        raise
+            tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.current_thread().ident)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((key, entry), f, pickle.HIGHEST_PROTOCOL)
+            getattr(os, 'replace', os.rename)(tmp_path, path)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self, namespace=None):
+        """
+        清除缓存，namespace 不为空时只清除键的第一个元素等于 namespace 的缓存
+        """
+        with self._lock:
+            keys = [key for key in self._entries if namespace is None or key[0] == namespace]
+        for key in keys:
+            self.invalidate(key)
+        if not self.cache_dir:
+            return
+        # 删除持久化文件，包括本进程没有读取过的缓存
+        directory = self.cache_dir if namespace is None else self._namespace_dir(namespace)
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.endswith('.pkl'):
+                    try:
+                        os.remove(os.path.join(root, name))
+                    except OSError:
+                        pass
+
+    def _is_fresh(self, stored_at, market):
+        now = time.time()
+        if self.ttl and now - stored_at >= self.ttl:
+            return False
+        if self.session_refresh and stored_at < last_session_boundary(market, now):
+            return False
+        return True
+
+    def _namespace_dir(self, namespace):
+        name = str(namespace)
+        if not _NAMESPACE_PATTERN.match(name):
+            name = hashlib.md5(repr(namespace).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, name)
+
+    def _path(self, key):
+        name = hashlib.md5(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self._namespace_dir(key[0]), name + '.pkl')
+
+    def _load(self, key):
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                stored_key, entry = pickle.load(f)
+        except Exception:
+            return None
+        return entry if stored_key == key else None
+
+    @staticmethod
+    def _copy(value):
+        """
+        返回副本，避免调用方修改缓存中的数据
+        """
+        if isinstance(value, pd.DataFrame):
+            return value.copy()
+        if isinstance(value, list):
+            return list(value)
+        return value
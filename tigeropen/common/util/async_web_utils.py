@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+异步客户端基于 aiohttp 的 HTTP 传输
+"""
+import asyncio
+import json
+
+from tigeropen.common.consts import THREAD_LOCAL
+from tigeropen.common.exceptions import RequestException, ResponseException
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncHttpTransport(object):
+    """
+    基于 aiohttp 的非阻塞 HTTP 传输，同一事件循环内复用长连接
+    limit：同时打开的最大连接数
+    limit_per_host：每个主机同时打开的最大连接数，0 表示不限
+    keepalive_timeout：空闲连接的保留时间，单位秒
+    """
+
+    def __init__(self, limit=100, limit_per_host=0, keepalive_timeout=60):
+        if aiohttp is None:
+            raise ImportError('aiohttp is required for the asyncio clients, install it with: pip install aiohttp')
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def do_post(self, url, headers=None, params=None, timeout=15, charset=None):
+        session = self._get_session()
+        request_id = getattr(THREAD_LOCAL, 'uuid', '')
+        try:
+            async with session.post(url, data=json.dumps(params), headers=headers,
+                                    timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                result = await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise RequestException('[' + request_id + ']post request failed. ' + str(e))
+
+        if status != 200:
+            if charset:
+                result = result.decode(charset)
+            raise ResponseException('[' + request_id + ']invalid http status ' + str(status) +
+                                    ',detail body:' + str(result))
+        return result
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+接口字段名到领域对象属性名的预生成映射表
+"""
+import threading
+
+import six
+
+from tigeropen.common.util.key_utils import KeyMapping, LRUCache, underline_to_camel
+
+_FIELD_MAPPINGS = dict()
+_lock = threading.Lock()
+_MISSING = object()
+
+
+def get_slots(cls):
+    """
+    返回类及其父类声明的全部 __slots__ 属性
+    """
+    attributes = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, six.string_types):
+            slots = (slots,)
+        for name in slots:
+            if name not in attributes:
+                attributes.append(name)
+    return attributes
+
+
+class FieldMapping(KeyMapping):
+    """
+    接口返回的字段名到领域对象属性名的映射表，在 KeyMapping 的翻译规则上只保留领域对象的属性，
+    并预先生成翻译结果，解析时每个字段只需一次字典查找
+    attributes：领域对象的属性名
+    mappings：{字段名: 属性名}，字段名与属性名不一致时的显式映射
+    normalize：其余字段名转换为属性名的函数，None 表示字段名即属性名
+    """
+
+    def __init__(self, attributes, mappings=None, normalize=None):
+        super(FieldMapping, self).__init__(mappings, normalize)
+        self._attributes = frozenset(attributes)
+        self._table = dict()
+        # 预先生成显式映射、属性名本身及其驼峰形式
+        keys = list(self.mappings)
+        for name in self._attributes:
+            keys.append(name)
+            if normalize is not None:
+                keys.append(underline_to_camel(name))
+        for key in keys:
+            self._table[key] = self._resolve(key)
+        # 其余字段按需解析，缓存条数有上限，防止异常数据使映射表无限增长
+        self._lazy = LRUCache()
+
+    def _resolve(self, key):
+        tag = super(FieldMapping, self).get(key)
+        return tag if tag in self._attributes else None
+
+    def get(self, key):
+        """
+        返回字段对应的属性名，不是领域对象的属性时返回 None
+        """
+        try:
+            return self._table[key]
+        except KeyError:
+            pass
+        tag = self._lazy.get(key, _MISSING)
+        if tag is _MISSING:
+            tag = self._resolve(key)
+            self._lazy.put(key, tag)
+        return tag
+
+    def apply(self, obj, fields):
+        """
+        将 fields 中值不为 None 且对应领域对象属性的字段写入 obj
+        """
+        table = self._table
+        for key, value in fields.items():
+            if value is None:
+                continue
+            try:
+                tag = table[key]
+            except KeyError:
+                tag = self.get(key)
+            if tag is not None:
+                setattr(obj, tag, value)
+        return obj
+
+
+def get_field_mapping(cls, mappings=None, normalize=None):
+    """
+    返回领域对象类的字段映射表，同一个类、映射和转换函数只生成一次
+    """
+    key = (cls, tuple(sorted(mappings.items())) if mappings else (), normalize)
+    field_mapping = _FIELD_MAPPINGS.get(key)
+    if field_mapping is None:
+        with _lock:
+            field_mapping = _FIELD_MAPPINGS.get(key)
+            if field_mapping is None:
+                field_mapping = FieldMapping(get_slots(cls), mappings, normalize)
+                _FIELD_MAPPINGS[key] = field_mapping
+    return field_mapping
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+响应解析使用的 JSON 解码，已安装 orjson/ujson 时优先使用
+"""
+import six
+
+try:
+    import orjson
+
+    JSON_BACKEND = 'orjson'
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        JSON_BACKEND = 'ujson'
+        _loads = ujson.loads
+    except ImportError:
+        import json
+
+        JSON_BACKEND = 'json'
+        _loads = json.loads
+
+
+def loads(value):
+    """
+    解析 JSON 字符串，优先使用已安装的 orjson/ujson，否则使用标准库
+    """
+    return _loads(value)
+
+
+def decode_data(data):
+    """
+    解析响应中的 data 字段：网关返回的 data 多为嵌套的 JSON 字符串，已解析过的对象原样返回
+    """
+    if isinstance(data, (six.string_types, six.binary_type)):
+        return _loads(data)
+    return data
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+接口和推送字段名的转换与翻译表
+"""
+import re
+import threading
+from collections import OrderedDict
+
+# 字段名转换结果的缓存条数上限
+KEY_CACHE_SIZE = 4096
+
+_CAMEL_PATTERN = re.compile(r'([a-z]|\d)([A-Z])')
+_UNDERLINE_PATTERN = re.compile(r'_([a-z])')
+_MISSING = object()
+
+
+class LRUCache(object):
+    """
+    线程安全的 LRU 缓存，超过 maxsize 时淘汰最久未使用的条目
+    """
+
+    def __init__(self, maxsize=KEY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.pop(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._data[key] = value
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def memoize(maxsize=KEY_CACHE_SIZE):
+    """
+    单参数函数的 LRU 缓存装饰器，缓存对象为被装饰函数的 cache 属性
+    """
+    def decorator(func):
+        cache = LRUCache(maxsize)
+
+        def wrapper(key):
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(key)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+
+@memoize()
+def camel_to_underline(key):
+    """
+    驼峰字段名转为下划线形式，如 netLiquidation -> net_liquidation
+    """
+    return _CAMEL_PATTERN.sub(r'\1_\2', key).lower()
+
+
+def underline_to_camel(name):
+    """
+    下划线属性名转为驼峰形式，如 net_liquidation -> netLiquidation
+    """
+    return _UNDERLINE_PATTERN.sub(lambda match: match.group(1).upper(), name)
+
+
+class KeyMapping(object):
+    """
+    接口和推送的字段名翻译表，显式映射直接查表，其余字段名交给 normalize 转换
+    mappings：{字段名: 属性名}
+    normalize：未映射字段名的转换函数，应为 memoize 缓存过的函数(如 camel_to_underline)，None 表示保留原字段名
+    ignore_unmapped：是否忽略未映射的字段，为 True 时 get 返回 None
+    只接受领域对象属性的翻译表见 field_utils.FieldMapping
+    """
+
+    def __init__(self, mappings=None, normalize=None, ignore_unmapped=False):
+        self.mappings = dict(mappings) if mappings else dict()
+        self._normalize = normalize
+        self._ignore_unmapped = ignore_unmapped
+
+    def get(self, key):
+        tag = self.mappings.get(key)
+        if tag is not None:
+            return tag
+        if self._ignore_unmapped:
+            return None
+        if self._normalize is None:
+            return key
+        return self._normalize(key)
+
+    def translate(self, fields):
+        """
+        翻译 {字段名: 值}，忽略的字段不返回
+        :return: [(属性名, 值)]
+        """
+        get_tag = self.get
+        items = []
+        for key, value in fields.items():
+            tag = get_tag(key)
+            if tag is not None:
+                items.append((tag, value))
+        return items
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+按接口限制请求频率的令牌桶限流
+"""
+import heapq
+import itertools
+import threading
+import time
+
+from tigeropen.common.consts.service_types import ORDER_NO, PREVIEW_ORDER, PLACE_ORDER, CANCEL_ORDER, MODIFY_ORDER, \
+    ACCOUNTS, ASSETS, POSITIONS, ORDERS, ACTIVE_ORDERS, CONTRACT
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# 优先级，数值越小越优先
+PRIORITY_ORDER = 0  # 下单、改单、撤单
+PRIORITY_ACCOUNT = 1  # 账户、持仓、订单查询
+PRIORITY_QUOTE = 2  # 行情
+
+METHOD_PRIORITIES = {ORDER_NO: PRIORITY_ORDER, PREVIEW_ORDER: PRIORITY_ORDER, PLACE_ORDER: PRIORITY_ORDER,
+                     CANCEL_ORDER: PRIORITY_ORDER, MODIFY_ORDER: PRIORITY_ORDER,
+                     ACCOUNTS: PRIORITY_ACCOUNT, ASSETS: PRIORITY_ACCOUNT, POSITIONS: PRIORITY_ACCOUNT,
+                     ORDERS: PRIORITY_ACCOUNT, ACTIVE_ORDERS: PRIORITY_ACCOUNT, CONTRACT: PRIORITY_ACCOUNT}
+
+
+class TokenBucket(object):
+    """
+    令牌桶，period 秒内最多 max_calls 次
+    """
+
+    def __init__(self, max_calls, period=60):
+        self.max_calls = max_calls
+        self.period = period
+        self.rate = float(max_calls) / period
+        self.tokens = float(max_calls)
+        self.timestamp = _monotonic()
+
+    def wait_time(self, now):
+        """
+        补充令牌，返回获得一个令牌还需等待的秒数
+        """
+        elapsed = now - self.timestamp
+        if elapsed > 0:
+            self.tokens = min(float(self.max_calls), self.tokens + elapsed * self.rate)
+            self.timestamp = now
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        self.tokens -= 1
+
+
+class RateLimiter(object):
+    """
+    按接口(P_METHOD)限流的令牌桶调度器，线程安全
+    等待同一个令牌桶的请求按优先级(METHOD_PRIORITIES)和到达顺序依次放行
+    limits：{method: (max_calls, period)}
+    global_limit：(max_calls, period)，所有接口共享的总频率限制
+    """
+
+    def __init__(self, limits=None, global_limit=None):
+        self._condition = threading.Condition()
+        self._buckets = dict()
+        self._global_bucket = None
+        self._waiters = []
+        self._sequence = itertools.count()
+        if limits:
+            self.update_limits(limits)
+        if global_limit:
+            self.set_global_limit(*global_limit)
+
+    def set_limit(self, method, max_calls, period=60):
+        with self._condition:
+            bucket = self._buckets.get(method)
+            if bucket is not None and bucket.max_calls == max_calls and bucket.period == period:
+                return
+            self._buckets[method] = TokenBucket(max_calls, period)
+            self._condition.notify_all()
+
+    def remove_limit(self, method):
+        with self._condition:
+            self._buckets.pop(method, None)
+            self._condition.notify_all()
+
+    def update_limits(self, limits):
+        for method, limit in limits.items():
+            self.set_limit(method, *limit)
+
+    def set_global_limit(self, max_calls, period=60):
+        with self._condition:
+            bucket = self._global_bucket
+            if bucket is not None and bucket.max_calls == max_calls and bucket.period == period:
+                return
+            self._global_bucket = TokenBucket(max_calls, period) if max_calls else None
+            self._condition.notify_all()
+
+    def get_limits(self):
+        with self._condition:
+            return {method: (bucket.max_calls, bucket.period) for method, bucket in self._buckets.items()}
+
+    def is_limited(self, method):
+        return method in self._buckets or self._global_bucket is not None
+
+    def try_acquire(self, method, priority=None):
+        """
+        非阻塞获取令牌
+        :return: 0 表示已获得令牌，否则为建议等待的秒数
+        """
+        if priority is None:
+            priority = METHOD_PRIORITIES.get(method, PRIORITY_QUOTE)
+        with self._condition:
+            if not self.is_limited(method):
+                return 0
+            wait = self._wait_time(method, _monotonic())
+            if wait > 0:
+                return wait
+            entry = (priority, float('inf'), method)
+            if not self._is_first(entry):
+                return 0.001
+            self._consume(method)
+            return 0
+
+    def acquire(self, method, blocking=True, timeout=None, priority=None):
+        """
+        获取一个令牌
+        :param method: 接口名称，见 service_types
+        :param blocking: 是否阻塞等待
+        :param timeout: 阻塞等待的最长时间，单位秒，None 表示一直等待
+        :param priority: 优先级，默认按 METHOD_PRIORITIES
+        :return: 是否获得令牌
+        """
+        if not blocking:
+            return self.try_acquire(method, priority) == 0
+        if priority is None:
+            priority = METHOD_PRIORITIES.get(method, PRIORITY_QUOTE)
+        deadline = None if timeout is None else _monotonic() + timeout
+
+        with self._condition:
+            if not self.is_limited(method):
+                return True
+            entry = (priority, next(self._sequence), method)
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = _monotonic()
+                    wait = None
+                    if self._is_first(entry):
+                        wait = self._wait_time(method, now)
+                        if wait <= 0:
+                            self._consume(method)
+                            return True
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+    def _is_first(self, entry):
+        """
+        是否没有更优先且竞争同一令牌桶的等待者
+        """
+        for other in self._waiters:
+            if other < entry and (other[2] == entry[2] or self._global_bucket is not None):
+                return False
+        return True
+
+    def _wait_time(self, method, now):
+        wait = 0
+        bucket = self._buckets.get(method)
+        if bucket is not None:
+            wait = bucket.wait_time(now)
+        if self._global_bucket is not None:
+            wait = max(wait, self._global_bucket.wait_time(now))
+        return wait
+
+    def _consume(self, method):
+        bucket = self._buckets.get(method)
+        if bucket is not None:
+            bucket.consume()
+        if self._global_bucket is not None:
+            self._global_bucket.consume()
+
+
+_default_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter():
+    """
+    进程内共享的限流器，QuoteClient 和 TradeClient 默认使用
+    """
+    return _default_rate_limiter
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+请求编号和请求日志上下文
+"""
+import itertools
+import os
+import time
+
+from tigeropen.common.consts import THREAD_LOCAL
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+_request_counter = itertools.count(1)
+# 进程标识，区分同一台机器上多个进程的请求编号
+_process_tag = '%x' % os.getpid()
+
+
+def next_request_id():
+    """
+    进程内递增的请求编号，用于替代每次生成 uuid
+    """
+    return '%s-%d' % (_process_tag, next(_request_counter))
+
+
+def truncate(text, limit):
+    """
+    截断过长的日志内容
+    :param text: 日志内容
+    :param limit: 最大字符数，为空时不截断
+    """
+    if not limit or len(text) <= limit:
+        return text
+    return '%s...(%d more)' % (text[:limit], len(text) - limit)
+
+
+class RequestContext(object):
+    """
+    单次请求的上下文：请求编号、接口名称、日志对象和开始时间
+    日志只有在 logger 开启对应级别时才会格式化
+    """
+    __slots__ = ('request_id', 'method', 'logger', 'start_time')
+
+    def __init__(self, method=None, logger=None):
+        self.request_id = next_request_id()
+        self.method = method
+        self.logger = logger
+        self.start_time = _monotonic()
+
+    @property
+    def elapsed(self):
+        return _monotonic() - self.start_time
+
+    def activate(self):
+        """
+        设置为当前线程的请求上下文，THREAD_LOCAL.uuid 保留为请求编号以兼容原有日志和异常信息
+        """
+        THREAD_LOCAL.context = self
+        THREAD_LOCAL.uuid = self.request_id
+        THREAD_LOCAL.logger = self.logger
+        return self
+
+    def is_enabled_for(self, level):
+        return self.logger is not None and self.logger.isEnabledFor(level)
+
+    def log(self, level, msg, *args):
+        if self.is_enabled_for(level):
+            self.logger.log(level, '[%s]' + msg, self.request_id, *args)
+
+    def log_body(self, level, label, body, limit=None):
+        """
+        记录请求或响应内容，超过 limit 个字符的部分被截断
+        """
+        if self.is_enabled_for(level):
+            self.logger.log(level, '[%s]%s:%s', self.request_id, label, truncate(body, limit))
+
+
+def get_request_context(logger=None):
+    """
+    当前线程的请求上下文，不存在时创建一个新的上下文
+    """
+    context = getattr(THREAD_LOCAL, 'context', None)
+    if context is None:
+        context = RequestContext(logger=logger).activate()
+    return context
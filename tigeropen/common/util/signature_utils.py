@@ -7,9 +7,25 @@ Created on 2018/9/20
 
 import base64
 import json
+import threading
 import rsa
 
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+    HAS_CRYPTOGRAPHY = True
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+
 from tigeropen.common.consts import PYTHON_VERSION_3
+from tigeropen.common.exceptions import ResponseException
 from tigeropen.common.util.string_utils import add_start_end
 
 
@@ -53,11 +69,125 @@ def fill_public_key_marker(public_key):
     return add_start_end(public_key, "-----BEGIN PUBLIC KEY-----\n", "\n-----END PUBLIC KEY-----")
 
 
+class RsaSignBackend(object):
+    """
+    基于纯 Python rsa 包的签名实现
+    """
+    name = 'rsa'
+
+    def load_private_key(self, private_key):
+        return rsa.PrivateKey.load_pkcs1(fill_private_key_marker(private_key), format='PEM')
+
+    def load_public_key(self, public_key):
+        return rsa.PublicKey.load_pkcs1_openssl_pem(fill_public_key_marker(public_key))
+
+    def sign(self, key, message):
+        return rsa.sign(message, key, 'SHA-1')
+
+    def verify(self, key, message, signature):
+        return rsa.verify(message, signature, key)
+
+
+class CryptographySignBackend(object):
+    """
+    基于 cryptography (OpenSSL) 的签名实现，签名结果与 RsaSignBackend 一致
+    """
+    name = 'cryptography'
+
+    def load_private_key(self, private_key):
+        return serialization.load_pem_private_key(fill_private_key_marker(private_key).encode('utf-8'),
+                                                  password=None, backend=default_backend())
+
+    def load_public_key(self, public_key):
+        return serialization.load_pem_public_key(fill_public_key_marker(public_key).encode('utf-8'),
+                                                 backend=default_backend())
+
+    def sign(self, key, message):
+        return key.sign(message, padding.PKCS1v15(), hashes.SHA1())
+
+    def verify(self, key, message, signature):
+        try:
+            key.verify(signature, message, padding.PKCS1v15(), hashes.SHA1())
+        except InvalidSignature:
+            return False
+        return True
+
+
+SIGN_BACKENDS = {RsaSignBackend.name: RsaSignBackend}
+if HAS_CRYPTOGRAPHY:
+    SIGN_BACKENDS[CryptographySignBackend.name] = CryptographySignBackend
+
+_sign_backend = CryptographySignBackend() if HAS_CRYPTOGRAPHY else RsaSignBackend()
+
+
+def get_sign_backend():
+    return _sign_backend
+
+
+def set_sign_backend(name):
+    """
+    切换签名实现
+    :param name: rsa 或 cryptography(需安装 cryptography)
+    """
+    global _sign_backend
+    if name not in SIGN_BACKENDS:
+        raise ValueError('unsupported sign backend: ' + str(name))
+    _sign_backend = SIGN_BACKENDS[name]()
+
+
+# 解析后的密钥对象缓存，以 (签名实现, 密钥字符串) 为键，配置中的密钥变化后自然会命中新的条目
+KEY_CACHE_SIZE = 16
+_private_key_cache = dict()
+_public_key_cache = dict()
+_key_cache_lock = threading.Lock()
+
+
+def _get_cached_key(cache, key_str, backend, loader):
+    cache_key = (backend.name, key_str)
+    key = cache.get(cache_key)
+    if key is not None:
+        return key
+    key = loader(key_str)
+    with _key_cache_lock:
+        if len(cache) >= KEY_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[cache_key] = key
+    return key
+
+
+def load_private_key(private_key, backend=None):
+    """
+    解析 PKCS#1 私钥，结果按密钥字符串缓存
+    :param private_key: 私钥字符串，可不带 PEM 头尾
+    :param backend: 签名实现，默认为当前选中的实现
+    :return: 当前签名实现对应的私钥对象
+    """
+    backend = backend or _sign_backend
+    return _get_cached_key(_private_key_cache, private_key, backend, backend.load_private_key)
+
+
+def load_public_key(public_key, backend=None):
+    """
+    解析 OpenSSL 格式公钥，结果按密钥字符串缓存
+    :param public_key: 公钥字符串，可不带 PEM 头尾
+    :param backend: 签名实现，默认为当前选中的实现
+    :return: 当前签名实现对应的公钥对象
+    """
+    backend = backend or _sign_backend
+    return _get_cached_key(_public_key_cache, public_key, backend, backend.load_public_key)
+
+
+def clear_key_cache():
+    with _key_cache_lock:
+        _private_key_cache.clear()
+        _public_key_cache.clear()
+
+
 def sign_with_rsa(private_key, sign_content, charset):
     if PYTHON_VERSION_3:
         sign_content = sign_content.encode(charset)
-    private_key = fill_private_key_marker(private_key)
-    signature = rsa.sign(sign_content, rsa.PrivateKey.load_pkcs1(private_key, format='PEM'), 'SHA-1')
+    backend = _sign_backend
+    signature = backend.sign(load_private_key(private_key, backend), sign_content)
     sign = base64.b64encode(signature)
     if PYTHON_VERSION_3:
         sign = str(sign, encoding=charset)
@@ -65,6 +195,73 @@ def sign_with_rsa(private_key, sign_content, charset):
 
 
 def verify_with_rsa(public_key, message, sign):
-    public_key = fill_public_key_marker(public_key)
     sign = base64.b64decode(sign)
-    return rsa.verify(message, sign, rsa.PublicKey.load_pkcs1_openssl_pem(public_key))
+    backend = _sign_backend
+    return backend.verify(load_public_key(public_key, backend), message, sign)
+
+
+class DeferredSignVerifier(object):
+    """
+    后台验签，响应先返回给调用方，验签在单独的线程中完成
+    callback：验签失败时的回调，参数为 ResponseException
+    max_pending：等待验签的最大响应数，超过后丢弃新的验签任务并计入 dropped
+    """
+
+    def __init__(self, callback=None, max_pending=10000):
+        self.callback = callback
+        self.verified = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue = queue.Queue(max_pending)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def pending(self):
+        return self._queue.qsize()
+
+    def submit(self, public_key, message, sign, response_str, request_id=''):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((public_key, message, sign, response_str, request_id))
+        except queue.Full:
+            # 多个请求线程可能同时提交
+            with self._lock:
+                self.dropped += 1
+
+    def join(self):
+        """
+        等待已提交的验签任务全部完成
+        """
+        self._queue.join()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name='tiger-sign-verifier')
+                thread.daemon = True
+                thread.start()
+                self._thread = thread
+
+    def _run(self):
+        while True:
+            public_key, message, sign, response_str, request_id = self._queue.get()
+            try:
+                try:
+                    error = None if verify_with_rsa(public_key, message, sign) else ''
+                except Exception as e:
+                    error = str(e) + ' '
+                with self._lock:
+                    if error is None:
+                        self.verified += 1
+                    else:
+                        self.failed += 1
+                if error is not None and self.callback:
+                    self.callback(ResponseException('[' + request_id + ']response sign verify failed. ' + error
+                                                    + response_str))
+            except Exception:
+                pass
+            finally:
+                self._queue.task_done()
@@ -4,9 +4,11 @@ Created on 2018/9/20
 
 @author: gaoan
 """
-import re
-
 from tigeropen.common.consts import PYTHON_VERSION_3
+# camel_to_underline 已移至 key_utils，在此保留导出以兼容从 string_utils 导入的代码
+from tigeropen.common.util.key_utils import camel_to_underline
+
+__all__ = ['add_start_end', 'camel_to_underline', 'get_string']
 
 
 def add_start_end(key, start_marker, end_marker):
@@ -17,12 +19,6 @@ def add_start_end(key, start_marker, end_marker):
     return key
 
 
-def camel_to_underline(hunp_str):
-    p = re.compile(r'([a-z]|\d)([A-Z])')
-    sub = re.sub(p, r'\1_\2', hunp_str).lower()
-    return sub
-
-
 def get_string(value):
     if PYTHON_VERSION_3:
         return value
@@ -4,8 +4,17 @@ Created on 2018/9/20
 
 @author: gaoan
 """
+import errno
 import json
+import select
+import socket
+import threading
+import time
+from collections import deque
+
 from tigeropen.common.consts import PYTHON_VERSION_3, THREAD_LOCAL
+from tigeropen.common.consts.params import P_METHOD
+from tigeropen.common.consts.service_types import PLACE_ORDER, MODIFY_ORDER, CANCEL_ORDER
 from tigeropen.common.exceptions import RequestException, ResponseException
 
 try:
@@ -21,6 +30,9 @@ try:
 except ImportError:
     from urllib import quote_plus
 
+# 非幂等的交易接口，复用连接失败时不自动重试，避免重复下单、改单、撤单
+NON_RETRYABLE_METHODS = frozenset([PLACE_ORDER, MODIFY_ORDER, CANCEL_ORDER])
+
 
 def url_encode(params, charset):
     query_string = ""
@@ -37,45 +49,231 @@ def url_encode(params, charset):
     return query_string
 
 
-def get_http_connection(url, query_string, timeout):
+def _split_url(url):
     url_parse_result = urlparse.urlparse(url)
+    scheme = url_parse_result.scheme
     host = url_parse_result.hostname
-    port = 80
-    connection = httplib.HTTPConnection(host=host, port=port, timeout=timeout)
-    if url.find("https") == 0:
-        port = 443
-        connection = httplib.HTTPSConnection(host=host, port=port, timeout=timeout)
+    if url_parse_result.port:
+        port = url_parse_result.port
+    else:
+        port = 443 if scheme == 'https' else 80
+    return url_parse_result, scheme, host, port
+
+
+def _build_request_url(url_parse_result, query_string):
     url = url_parse_result.scheme + "://" + url_parse_result.hostname
     if url_parse_result.port:
-        url += url_parse_result.port
+        url += ':' + str(url_parse_result.port)
     url += url_parse_result.path
     if query_string:
         url += ('?' + query_string)
-    return url, connection
+    return url
+
+
+def _new_connection(scheme, host, port, timeout):
+    if scheme == 'https':
+        return httplib.HTTPSConnection(host=host, port=port, timeout=timeout)
+    return httplib.HTTPConnection(host=host, port=port, timeout=timeout)
+
+
+def get_http_connection(url, query_string, timeout):
+    url_parse_result, scheme, host, port = _split_url(url)
+    connection = _new_connection(scheme, host, port, timeout)
+    return _build_request_url(url_parse_result, query_string), connection
+
+
+def _is_dropped(connection):
+    """
+    空闲连接可读说明服务端已关闭连接(或发来了意外数据)，不能再复用
+    """
+    sock = connection.sock
+    if sock is None:
+        return False
+    try:
+        return bool(select.select([sock], [], [], 0)[0])
+    except (ValueError, select.error):
+        return True
+
+
+class _PooledConnection(object):
+    __slots__ = ['connection', 'key', 'created_at', 'last_used', 'request_count']
+
+    def __init__(self, connection, key):
+        self.connection = connection
+        self.key = key
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.request_count = 0
+
+
+class HTTPConnectionPool(object):
+    """
+    按 (scheme, host, port) 复用的长连接池，线程安全
+    max_size：每个主机最多保留的空闲连接数
+    idle_timeout：空闲超过该秒数的连接会被丢弃，None 表示不限
+    max_requests：单个连接最多发送的请求数，超过后关闭重建，None 表示不限
+    """
+
+    def __init__(self, max_size=10, idle_timeout=60, max_requests=1000):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_requests = max_requests
+        self._lock = threading.Lock()
+        self._idle = dict()
+
+    def acquire(self, scheme, host, port, timeout):
+        """
+        取出一个空闲连接，没有可用连接时新建
+        :return: (_PooledConnection, 是否为复用的连接)
+        """
+        key = (scheme, host, port)
+        now = time.time()
+        expired = []
+        pooled = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate = idle.pop()
+                if self.idle_timeout is not None and now - candidate.last_used > self.idle_timeout:
+                    expired.append(candidate)
+                    continue
+                if _is_dropped(candidate.connection):
+                    expired.append(candidate)
+                    continue
+                pooled = candidate
+                break
+        for candidate in expired:
+            self._close(candidate)
+
+        if pooled is not None:
+            pooled.connection.timeout = timeout
+            if pooled.connection.sock is not None:
+                pooled.connection.sock.settimeout(timeout)
+            return pooled, True
+        return _PooledConnection(_new_connection(scheme, host, port, timeout), key), False
+
+    def release(self, pooled, reusable=True):
+        """
+        归还连接，不可复用、超过请求次数或池已满时直接关闭
+        """
+        pooled.request_count += 1
+        pooled.last_used = time.time()
+        if not reusable or (self.max_requests is not None and pooled.request_count >= self.max_requests):
+            self._close(pooled)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(pooled.key, deque())
+            if len(idle) < self.max_size:
+                idle.append(pooled)
+                return
+        self._close(pooled)
+
+    def discard(self, pooled):
+        self._close(pooled)
 
+    def clear(self):
+        with self._lock:
+            idle_list = list(self._idle.values())
+            self._idle = dict()
+        for idle in idle_list:
+            for pooled in idle:
+                self._close(pooled)
+
+    def idle_count(self, url=None):
+        with self._lock:
+            if url is None:
+                return sum(len(idle) for idle in self._idle.values())
+            _, scheme, host, port = _split_url(url)
+            return len(self._idle.get((scheme, host, port), ()))
+
+    @staticmethod
+    def _close(pooled):
+        try:
+            pooled.connection.close()
+        except Exception:
+            pass
+
+
+def _request_id():
+    return getattr(THREAD_LOCAL, 'uuid', '')
+
+
+def _send(connection, url, body, headers):
+    connection.request("POST", url, body=body, headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+def _is_stale_connection_error(e):
+    """
+    复用的空闲连接已被服务端关闭时的异常，此时请求尚未被服务端处理；超时不属于此类
+    """
+    if isinstance(e, socket.timeout):
+        return False
+    remote_disconnected = getattr(httplib, 'RemoteDisconnected', None)
+    if remote_disconnected is not None and isinstance(e, remote_disconnected):
+        return True
+    return isinstance(e, socket.error) and getattr(e, 'errno', None) in (errno.EPIPE, errno.ECONNRESET)
+
+
+def _check_status(response, result, charset):
+    if response.status != 200:
+        if PYTHON_VERSION_3 and charset:
+            result = result.decode(charset)
+        raise ResponseException('[' + _request_id() + ']invalid http status ' + str(response.status) +
+                                ',detail body:' + str(result))
+
+
+def do_post(url, query_string=None, headers=None, params=None, timeout=15, charset=None, pool=None):
+    if pool is not None:
+        return _do_pooled_post(pool, url, query_string, headers, params, timeout, charset)
 
-def do_post(url, query_string=None, headers=None, params=None, timeout=15, charset=None):
     url, connection = get_http_connection(url, query_string, timeout)
 
     try:
         connection.connect()
     except Exception as e:
-        raise RequestException('[' + THREAD_LOCAL.uuid + ']post connect failed. ' + str(e))
+        raise RequestException('[' + _request_id() + ']post connect failed. ' + str(e))
     try:
         connection.request("POST", url, body=json.dumps(params), headers=headers)
     except Exception as e:
-        raise RequestException('[' + THREAD_LOCAL.uuid + ']post request failed. ' + str(e))
+        raise RequestException('[' + _request_id() + ']post request failed. ' + str(e))
     response = connection.getresponse()
     result = response.read()
 
-    if response.status is not 200:
-        if PYTHON_VERSION_3 and charset:
-            result = result.decode(charset)
-        raise ResponseException('[' + THREAD_LOCAL.uuid + ']invalid http status ' + str(response.status) +
-                                ',detail body:' + result)
+    _check_status(response, result, charset)
     try:
         response.close()
         connection.close()
     except Exception as e:
         pass
     return result
+
+
+def _do_pooled_post(pool, url, query_string, headers, params, timeout, charset):
+    url_parse_result, scheme, host, port = _split_url(url)
+    url = _build_request_url(url_parse_result, query_string)
+    body = json.dumps(params)
+
+    pooled, reused = pool.acquire(scheme, host, port, timeout)
+    try:
+        if pooled.connection.sock is None:
+            pooled.connection.connect()
+        response, result = _send(pooled.connection, url, body, headers)
+    except Exception as e:
+        pool.discard(pooled)
+        method = params.get(P_METHOD) if params else None
+        if not reused or not _is_stale_connection_error(e) or method in NON_RETRYABLE_METHODS:
+            raise RequestException('[' + _request_id() + ']post request failed. ' + str(e))
+        # 复用的连接已被服务端关闭，换一个新连接重试一次
+        pooled = _PooledConnection(_new_connection(scheme, host, port, timeout), pooled.key)
+        try:
+            pooled.connection.connect()
+            response, result = _send(pooled.connection, url, body, headers)
+        except Exception as e:
+            pool.discard(pooled)
+            raise RequestException('[' + _request_id() + ']post request failed. ' + str(e))
+
+    pool.release(pooled, reusable=not response.will_close)
+    _check_status(response, result, charset)
+    return result
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+对比资产响应按字段映射表(FieldMapping)解析与原来逐字段 camel_to_underline + hasattr 解析的耗时
+并检查两者结果一致。每个账户包含汇总字段、多个分类(segments)和多个币种的市值(market_values)
+用法: python -m tigeropen.examples.asset_parse_benchmark [--accounts 账户数] [--segments 分类数]
+      [--currencies 币种数] [--number 次数]
+"""
+import argparse
+import random
+import re
+import timeit
+
+from tigeropen.common.util.key_utils import underline_to_camel
+from tigeropen.trade.domain.account import PortfolioAccount, Account, MarketValue
+from tigeropen.trade.response.assets_response import AssetsResponse, ACCOUNT_FIELD_MAPPINGS
+
+SEGMENT_NAMES = ['S', 'C', 'F', 'O', 'M', 'B']
+CURRENCIES = ['USD', 'HKD', 'CNH', 'SGD', 'AUD', 'EUR', 'GBP', 'JPY']
+# 接口实际会返回、但领域对象没有的字段
+EXTRA_FIELDS = ['accountType', 'capability', 'status']
+REVERSED_MAPPINGS = {value: key for key, value in ACCOUNT_FIELD_MAPPINGS.items()}
+
+
+def camel_to_underline(hunp_str):
+    """
+    原来不带缓存的字段名转换
+    """
+    p = re.compile(r'([a-z]|\d)([A-Z])')
+    return re.sub(p, r'\1_\2', hunp_str).lower()
+
+
+def parse_fields_by_key(obj, fields):
+    for key, value in fields.items():
+        if value is None:
+            continue
+        tag = ACCOUNT_FIELD_MAPPINGS[key] if key in ACCOUNT_FIELD_MAPPINGS else camel_to_underline(key)
+        if hasattr(obj, tag):
+            setattr(obj, tag, value)
+
+
+def parse_assets_by_key(data_json):
+    """
+    原来的解析方式，每个字段都转换字段名并用 hasattr 判断
+    """
+    assets = []
+    for item in data_json['items']:
+        asset = PortfolioAccount(item['account'])
+        summary = asset.summary
+        for key, value in item.items():
+            if value is None:
+                continue
+            tag = ACCOUNT_FIELD_MAPPINGS[key] if key in ACCOUNT_FIELD_MAPPINGS else camel_to_underline(key)
+            if hasattr(summary, tag):
+                setattr(summary, tag, value)
+            elif 'market_values' == tag:
+                for sub_value in value:
+                    parse_fields_by_key(asset.market_value(currency=sub_value['currency']), sub_value)
+            elif 'segments' == tag:
+                for sub_value in value:
+                    parse_fields_by_key(asset.segment(segment_name=sub_value['category']), sub_value)
+        assets.append(asset)
+    return assets
+
+
+def parse_assets_by_mapping(data_json):
+    response = AssetsResponse()
+    response.parse_response_content({'code': 0, 'data': data_json})
+    return response.assets
+
+
+def build_fields(cls, rand):
+    fields = dict()
+    for name in cls.__slots__:
+        if name in ('currency', 'timestamp'):
+            continue
+        fields[REVERSED_MAPPINGS.get(name, underline_to_camel(name))] = round(rand.uniform(0, 1000000), 2)
+    for name in EXTRA_FIELDS:
+        fields[name] = 'x'
+    fields['updateTime'] = 1546300800000
+    return fields
+
+
+def build_data(accounts, segments, currencies):
+    """
+    生成与资产接口 data 字段结构相同的数据
+    """
+    rand = random.Random(0)
+    items = []
+    for i in range(accounts):
+        item = build_fields(Account, rand)
+        item['account'] = 'DU%06d' % i
+        item['segments'] = []
+        for name in SEGMENT_NAMES[:segments]:
+            segment = build_fields(Account, rand)
+            segment['category'] = name
+            item['segments'].append(segment)
+        item['marketValues'] = []
+        for currency in CURRENCIES[:currencies]:
+            market_value = build_fields(MarketValue, rand)
+            market_value['currency'] = currency
+            item['marketValues'].append(market_value)
+        items.append(item)
+    return {'items': items}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark multi-segment asset response parsing')
+    parser.add_argument('--accounts', type=int, default=2000, help='accounts in the payload')
+    parser.add_argument('--segments', type=int, default=3, help='segments per account (max %d)' % len(SEGMENT_NAMES))
+    parser.add_argument('--currencies', type=int, default=5,
+                        help='market values per account (max %d)' % len(CURRENCIES))
+    parser.add_argument('--number', type=int, default=3, help='iterations')
+    args = parser.parse_args()
+
+    data_json = build_data(args.accounts, args.segments, args.currencies)
+    # 领域对象没有定义 __eq__，按 repr 比较全部字段
+    expected = [repr(asset) for asset in parse_assets_by_key(data_json)]
+    if expected != [repr(asset) for asset in parse_assets_by_mapping(data_json)]:
+        print('WARNING: key and mapping parsers return different assets')
+
+    print('%d accounts x %d segments x %d market values' % (args.accounts, args.segments, args.currencies))
+    for name, parse in (('key', parse_assets_by_key), ('mapping', parse_assets_by_mapping)):
+        elapsed = timeit.timeit(lambda: parse(data_json), number=args.number)
+        print('%-8s %8.1f ms/op' % (name, elapsed * 1000 / args.number))
+
+
+if __name__ == '__main__':
+    main()
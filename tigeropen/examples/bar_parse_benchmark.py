@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+对比K线响应的按列解析(QuoteBarResponse.parse_bars)与原来逐行构造 DataFrame 的耗时，并检查两者结果一致
+用法: python -m tigeropen.examples.bar_parse_benchmark [--symbols 数量] [--bars 每个股票的K线数] [--number 次数]
+"""
+import argparse
+import random
+import timeit
+
+import pandas as pd
+import six
+
+from tigeropen.common.util.string_utils import get_string
+from tigeropen.quote.response.quote_bar_response import QuoteBarResponse, COLUMNS, BAR_FIELD_MAPPINGS
+
+
+def parse_bars_by_row(data):
+    """
+    原来的逐行解析，每根K线生成一个 dict 和一行列表
+    """
+    bar_items = []
+    for symbol_item in data:
+        symbol = symbol_item.get('symbol')
+        if 'items' in symbol_item:
+            for item in symbol_item['items']:
+                item_values = {'symbol': symbol}
+                for key, value in item.items():
+                    if value is None:
+                        continue
+                    if isinstance(value, six.string_types):
+                        value = get_string(value)
+                    tag = BAR_FIELD_MAPPINGS[key] if key in BAR_FIELD_MAPPINGS else key
+                    item_values[tag] = value
+                bar_items.append([item_values.get(tag) for tag in COLUMNS])
+    return pd.DataFrame(bar_items, columns=COLUMNS)
+
+
+def build_data(symbols, bars):
+    """
+    生成与K线接口 data 字段结构相同的数据
+    """
+    rand = random.Random(0)
+    data = []
+    for i in range(symbols):
+        price = rand.uniform(10, 500)
+        items = []
+        for j in range(bars):
+            price *= rand.uniform(0.98, 1.02)
+            items.append({'time': 1546300800000 + j * 86400000, 'open': round(price, 2),
+                          'high': round(price * 1.01, 2), 'low': round(price * 0.99, 2),
+                          'close': round(price * rand.uniform(0.99, 1.01), 2),
+                          'volume': rand.randint(1000, 10000000)})
+        data.append({'symbol': 'SYM%d' % i, 'items': items})
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark kline response parsing')
+    parser.add_argument('--symbols', type=int, default=200, help='number of symbols')
+    parser.add_argument('--bars', type=int, default=1000, help='bars per symbol')
+    parser.add_argument('--number', type=int, default=3, help='iterations')
+    args = parser.parse_args()
+
+    data = build_data(args.symbols, args.bars)
+    if not parse_bars_by_row(data).equals(QuoteBarResponse.parse_bars(data)):
+        print('WARNING: row and column parsers return different frames')
+
+    print('%d symbols x %d bars' % (args.symbols, args.bars))
+    for name, parse in (('row', parse_bars_by_row), ('column', QuoteBarResponse.parse_bars)):
+        elapsed = timeit.timeit(lambda: parse(data), number=args.number)
+        print('%-8s %8.1f ms/op' % (name, elapsed * 1000 / args.number))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+对比标准库 json 与 orjson/ujson(已安装时)解析大体量订单历史和持仓响应的耗时
+响应结构与网关一致：外层 JSON 的 data 字段是嵌套的 JSON 字符串，两层都需要解析
+用法: python -m tigeropen.examples.json_benchmark [--orders 订单数] [--positions 持仓数] [--number 次数]
+"""
+import argparse
+import importlib
+import json
+import random
+import timeit
+
+
+def build_orders(count):
+    rand = random.Random(0)
+    items = []
+    for i in range(count):
+        price = round(rand.uniform(10, 500), 2)
+        items.append({
+            'account': 'DU575569', 'id': 140000000000 + i, 'orderId': i + 1, 'parentId': 0,
+            'symbol': 'SYM%d' % (i % 300), 'secType': 'STK', 'currency': 'USD', 'exchange': 'SMART',
+            'market': 'US', 'action': rand.choice(['BUY', 'SELL']), 'orderType': 'LMT',
+            'limitPrice': price, 'auxPrice': 0.0, 'totalQuantity': rand.randint(1, 1000) * 10,
+            'filledQuantity': 0, 'avgFillPrice': 0.0, 'lastFillPrice': 0.0, 'commission': 1.0,
+            'realizedPnl': round(rand.uniform(-100, 100), 2), 'timeInForce': 'DAY', 'outsideRth': False,
+            'openTime': 1546300800000 + i * 1000, 'latestTime': 1546300800000 + i * 1000 + 500,
+            'status': 'Filled', 'remark': '', 'localSymbol': 'SYM%d' % (i % 300), 'contractId': 1000 + i % 300,
+        })
+    return {'items': items}
+
+
+def build_positions(count):
+    rand = random.Random(1)
+    items = []
+    for i in range(count):
+        price = round(rand.uniform(10, 500), 2)
+        quantity = rand.randint(1, 1000)
+        items.append({
+            'account': 'DU575569', 'symbol': 'SYM%d' % i, 'secType': 'STK', 'currency': 'USD',
+            'exchange': 'SMART', 'market': 'US', 'contractId': 1000 + i, 'position': quantity,
+            'averageCost': price, 'latestPrice': round(price * rand.uniform(0.9, 1.1), 2),
+            'marketValue': round(price * quantity, 2), 'realizedPnl': 0.0,
+            'unrealizedPnl': round(rand.uniform(-1000, 1000), 2), 'localSymbol': 'SYM%d' % i,
+            'multiplier': 1.0,
+        })
+    return {'items': items}
+
+
+def build_response(data):
+    """
+    网关响应：data 字段是嵌套的 JSON 字符串
+    """
+    return json.dumps({'code': 0, 'message': 'success', 'timestamp': 1546300800000,
+                       'data': json.dumps(data)}).encode('utf-8')
+
+
+def available_backends():
+    backends = [('json', json.loads)]
+    for name in ('orjson', 'ujson'):
+        try:
+            backends.append((name, importlib.import_module(name).loads))
+        except ImportError:
+            print('%s not installed, skipped' % name)
+    return backends
+
+
+def decode(loads, response):
+    return loads(loads(response)['data'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark json decoding of trade responses')
+    parser.add_argument('--orders', type=int, default=5000, help='orders in the order history payload')
+    parser.add_argument('--positions', type=int, default=2000, help='positions in the positions payload')
+    parser.add_argument('--number', type=int, default=20, help='iterations')
+    args = parser.parse_args()
+
+    payloads = [('orders', build_response(build_orders(args.orders))),
+                ('positions', build_response(build_positions(args.positions)))]
+    backends = available_backends()
+    for label, response in payloads:
+        print('%s: %d bytes' % (label, len(response)))
+        expected = decode(json.loads, response)
+        for name, loads in backends:
+            if decode(loads, response) != expected:
+                print('WARNING: %s decodes differently from json' % name)
+            elapsed = timeit.timeit(lambda: decode(loads, response), number=args.number)
+            print('  %-8s %8.2f ms/op' % (name, elapsed * 1000 / args.number))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+对比行情推送的解码吞吐：原来逐字段截取前缀生成 (字段, 值) 列表的方式、decode_quote_items 和 decode_quote_tick
+每帧都包含 JSON 解析，与 PushClient 收到推送后的处理一致
+用法: python -m tigeropen.examples.quote_push_benchmark [--frames 推送内容文件] [--count 帧数]
+推送内容文件每行一帧 body(如从 PushClient.on_message 记录)，不指定时使用内置的示例帧
+"""
+import argparse
+import itertools
+import time
+
+import six
+
+from tigeropen.common.util.json_utils import loads
+from tigeropen.push.push_client import QUOTE_KEYS_MAPPINGS, QUOTE_DECODER
+from tigeropen.push.quote_tick import decode_quote_items, decode_quote_tick
+
+# 美股盘中、盘前盘后、只有买卖盘以及带字符串 latestTime 的推送
+SAMPLE_FRAMES = [
+    '{"symbol":"AAPL","latestPrice":157.74,"preClose":156.23,"volume":31337458,"open":156.48,"high":158.36,'
+    '"low":155.72,"latestTime":1546891200000,"askPrice":157.75,"askSize":300,"bidPrice":157.73,"bidSize":200}',
+    '{"symbol":"TSLA","latestPrice":334.96,"volume":8051431,"latestTime":1546891201000}',
+    '{"symbol":"MSFT","askPrice":101.95,"askSize":1100,"bidPrice":101.93,"bidSize":500,'
+    '"timestamp":1546891201500}',
+    '{"symbol":"AAPL","hourTradingLatestPrice":157.9,"hourTradingPreClose":157.74,"hourTradingVolume":412035,'
+    '"hourTradingLatestTime":"16:05 EST","hourTradingTag":"post"}',
+    '{"symbol":"00700","latestPrice":318.2,"preClose":316.0,"volume":13562045,"open":317.0,"high":320.4,'
+    '"low":315.6,"latestTime":1546920000000}',
+    '{"symbol":"NVDA","latestPrice":142.58,"high":143.1,"volume":12055932,"latestTime":"01-07 15:59:58 EST"}',
+    '{"symbol":"AMZN","bidPrice":1629.1,"bidSize":100,"latestTime":1546891202000}',
+    '{"symbol":"GOOG","latestPrice":1076.28,"preClose":1068.39,"volume":1764860,"open":1071.5,"high":1084.56,'
+    '"low":1060.53,"close":1076.28,"latestTime":1546891203000}',
+]
+
+
+def decode_by_prefix(data):
+    """
+    原来的解码方式，每个字段都判断并截取 hourTrading 前缀
+    """
+    items = []
+    for key, value in data.items():
+        if key.startswith('hourTrading'):
+            key = key[11:]
+        if key == 'latestTime' and isinstance(value, six.string_types):
+            continue
+        if key in QUOTE_KEYS_MAPPINGS:
+            items.append((QUOTE_KEYS_MAPPINGS.get(key), value))
+    return items
+
+
+def read_frames(path):
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark quote push decoding')
+    parser.add_argument('--frames', help='file with one recorded quote frame body per line')
+    parser.add_argument('--count', type=int, default=200000, help='frames decoded per method')
+    args = parser.parse_args()
+
+    frames = read_frames(args.frames) if args.frames else SAMPLE_FRAMES
+    for body in frames:
+        data = loads(body)
+        if decode_by_prefix(data) != decode_quote_items(data, QUOTE_DECODER):
+            print('WARNING: decoders differ on frame ' + body)
+
+    methods = [
+        ('tuple list (old)', lambda body: decode_by_prefix(loads(body))),
+        ('decode_quote_items', lambda body: decode_quote_items(loads(body), QUOTE_DECODER)),
+        ('decode_quote_tick', lambda body: decode_quote_tick(loads(body), QUOTE_DECODER)),
+    ]
+    print('%d distinct frames, %d frames per method' % (len(frames), args.count))
+    for name, decode in methods:
+        start = time.time()
+        for body in itertools.islice(itertools.cycle(frames), args.count):
+            decode(body)
+        elapsed = time.time() - start
+        print('%-20s %10.0f frames/s' % (name, args.count / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+对比各签名实现(rsa / cryptography)的请求签名和响应验签耗时
+用法: python -m tigeropen.examples.sign_benchmark [--private-key 私钥文件 --public-key 公钥文件] [--number 次数]
+未指定密钥文件时临时生成一对 1024 位密钥
+"""
+import argparse
+import base64
+import datetime
+import timeit
+
+import rsa
+from pyasn1.codec.der import encoder
+from rsa.asn1 import OpenSSLPubKey
+
+from tigeropen.common.util.signature_utils import get_sign_content, read_private_key, read_public_key, \
+    sign_with_rsa, verify_with_rsa, get_sign_backend, set_sign_backend, clear_key_cache, SIGN_BACKENDS
+
+RSA_OID = '1.2.840.113549.1.1.1'
+
+
+def generate_keys(bits):
+    """
+    生成 PKCS#1 私钥和 OpenSSL 格式公钥(与老虎公钥格式一致)，均去掉 PEM 头尾
+    """
+    public_key, private_key = rsa.newkeys(bits)
+    spki = OpenSSLPubKey()
+    spki['header']['oid'] = RSA_OID
+    spki['header']['parameters'] = b''
+    spki['key'] = b'\x00' + public_key.save_pkcs1(format='DER')
+    public_pem = base64.b64encode(encoder.encode(spki)).decode('ascii')
+    private_pem = private_key.save_pkcs1(format='PEM').decode('ascii')
+    private_pem = ''.join(line for line in private_pem.splitlines() if not line.startswith('-----'))
+    return private_pem, public_pem
+
+
+def build_sign_content():
+    """
+    与获取K线请求相同结构的签名内容
+    """
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    params = {
+        'tiger_id': '20150001',
+        'method': 'kline',
+        'charset': 'UTF-8',
+        'sign_type': 'RSA',
+        'timestamp': timestamp,
+        'version': '1.0',
+        'biz_content': '{"symbols":["AAPL","TSLA","MSFT","GOOG"],"period":"day","begin_time":-1,'
+                       '"end_time":-1,"right":"br","limit":251,"lang":"zh_CN"}',
+    }
+    return get_sign_content(params), timestamp
+
+
+def run(private_key, public_key, number):
+    sign_content, timestamp = build_sign_content()
+    message = timestamp.encode('utf-8')
+    signatures = dict()
+    for name in sorted(SIGN_BACKENDS):
+        set_sign_backend(name)
+        clear_key_cache()
+        # 先各执行一次，解析后的密钥进入缓存，计时只包含签名和验签本身
+        signatures[name] = sign_with_rsa(private_key, sign_content, 'utf-8')
+        response_sign = sign_with_rsa(private_key, timestamp, 'utf-8').encode('utf-8')
+        if not verify_with_rsa(public_key, message, response_sign):
+            raise RuntimeError(name + ' verify failed')
+        sign_time = timeit.timeit(lambda: sign_with_rsa(private_key, sign_content, 'utf-8'), number=number)
+        verify_time = timeit.timeit(lambda: verify_with_rsa(public_key, message, response_sign), number=number)
+        print('%-12s sign: %8.3f ms/op  verify: %8.3f ms/op' % (name, sign_time * 1000 / number,
+                                                                verify_time * 1000 / number))
+    if len(set(signatures.values())) > 1:
+        print('WARNING: signatures differ between backends')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark rsa sign backends')
+    parser.add_argument('--private-key', help='PKCS#1 private key file')
+    parser.add_argument('--public-key', help='public key file for verify')
+    parser.add_argument('--bits', type=int, default=1024, help='key size when generating keys')
+    parser.add_argument('--number', type=int, default=200, help='iterations per operation')
+    args = parser.parse_args()
+
+    if args.private_key and args.public_key:
+        private_key = read_private_key(args.private_key)
+        public_key = read_public_key(args.public_key)
+    else:
+        private_key, public_key = generate_keys(args.bits)
+
+    default_backend = get_sign_backend().name
+    try:
+        run(private_key, public_key, args.number)
+    finally:
+        set_sign_backend(default_backend)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+用 tracemalloc 对比领域对象使用 __slots__ 前后每个实例占用的内存
+"使用前"的类由同一个 __init__ 生成但不声明 __slots__，即原来基于实例 __dict__ 的对象
+用法: python -m tigeropen.examples.slots_memory_benchmark [--count 实例数]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from tigeropen.quote.domain.quote_brief import QuoteBrief, HourTrading
+from tigeropen.trade.domain.account import Account, MarketValue, PortfolioAccount
+from tigeropen.trade.domain.contract import Contract
+from tigeropen.trade.domain.position import Position
+
+CONTRACT = Contract('AAPL', 'USD', contract_id=14, sec_type='STK', exchange='SMART')
+
+# (类, 构造函数)，构造参数与接口解析时相同
+CASES = [
+    (Contract, lambda cls, i: cls('AAPL', 'USD', contract_id=i, sec_type='STK', exchange='SMART')),
+    (Position, lambda cls, i: cls('DU575569', CONTRACT, quantity=i, average_cost=150.5, market_price=157.7,
+                                  market_value=157.7 * i, realized_pnl=0.0, unrealized_pnl=7.2 * i)),
+    (QuoteBrief, lambda cls, i: cls()),
+    (HourTrading, lambda cls, i: cls()),
+    (Account, lambda cls, i: cls()),
+    (MarketValue, lambda cls, i: cls()),
+    (PortfolioAccount, lambda cls, i: cls('DU575569')),
+]
+
+
+def without_slots(cls):
+    """
+    与 cls 使用同一个 __init__，但实例属性保存在 __dict__ 中
+    """
+    return type(cls.__name__, (object,), {'__init__': cls.__init__})
+
+
+def measure(cls, create, count):
+    """
+    :return: 平均每个实例新分配的字节数(含属性值，不含保存实例的列表)
+    """
+    objects = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        objects[i] = create(cls, i)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return float(after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='per-object memory with and without __slots__')
+    parser.add_argument('--count', type=int, default=100000, help='instances per class')
+    args = parser.parse_args()
+
+    print('%-18s %12s %12s %8s' % ('class', '__dict__', '__slots__', 'saved'))
+    for cls, create in CASES:
+        dict_size = measure(without_slots(cls), create, args.count)
+        slots_size = measure(cls, create, args.count)
+        print('%-18s %10.0f B %10.0f B %7.0f%%' % (cls.__name__, dict_size, slots_size,
+                                                   100 * (1 - slots_size / dict_size)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+由行情推送实时生成K线
+"""
+import datetime
+import threading
+import time
+from collections import defaultdict, deque
+
+from tigeropen.common.consts import BarPeriod
+from tigeropen.common.util.common_utils import eastern
+
+# 按固定秒数切分的周期
+PERIOD_SECONDS = {BarPeriod.ONE_MINUTE: 60, BarPeriod.FIVE_MINUTES: 300, BarPeriod.FIFTEEN_MINUTES: 900,
+                  BarPeriod.HALF_HOUR: 1800, BarPeriod.ONE_HOUR: 3600}
+# 按日历切分的周期
+CALENDAR_PERIODS = (BarPeriod.DAY, BarPeriod.WEEK, BarPeriod.MONTH, BarPeriod.YEAR)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+# 美股、港股、A股的开盘时间
+DEFAULT_SESSION_OPEN = datetime.time(9, 30)
+
+
+class Bar(object):
+    """
+    一根K线，time 为K线开始时间(毫秒时间戳)，end_time 为结束时间，hour_trading 表示是否为盘前盘后K线
+    """
+    __slots__ = ('symbol', 'period', 'time', 'end_time', 'open', 'high', 'low', 'close', 'volume', 'hour_trading')
+
+    def __init__(self, symbol, period, time, end_time, open=None, high=None, low=None, close=None, volume=0,
+                 hour_trading=False):
+        self.symbol = symbol
+        self.period = period
+        self.hour_trading = hour_trading
+        self.time = time
+        self.end_time = end_time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def update(self, price, volume):
+        if self.open is None:
+            self.open = self.high = self.low = price
+        elif price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return "Bar(%s)" % self.to_dict().__repr__()
+
+
+class BarBuilder(object):
+    """
+    由行情推送实时生成K线，K线走完时回调 on_bar(bar)
+    periods：K线周期列表，元素为 BarPeriod 或秒数(如 5 表示 5 秒K线)
+    on_bar：K线走完时的回调
+    timezone：交易时段及日K以上周期的分界时区，默认美东时间
+    session_open：开盘时间(timezone 时区的 datetime.time)，分钟K和小时K从开盘时间起按周期切分，
+                  与服务端K线一致，如美股小时K为 9:30-10:30
+    cumulative_volume：推送的 volume 是否为当日累计成交量，是则K线成交量取相邻两次推送的差值
+    max_bars：每个股票每个周期保留的已走完K线数量
+    hour_trading：是否为盘前盘后行情生成K线，盘前盘后K线与盘中K线分开计算，默认忽略盘前盘后行情
+    """
+
+    def __init__(self, periods=(BarPeriod.ONE_MINUTE,), on_bar=None, timezone=eastern, cumulative_volume=True,
+                 max_bars=1000, hour_trading=False, session_open=DEFAULT_SESSION_OPEN):
+        self.periods = list(periods)
+        for period in self.periods:
+            if period not in PERIOD_SECONDS and period not in CALENDAR_PERIODS and not isinstance(period, int):
+                raise ValueError('unsupported bar period: ' + str(period))
+        self.on_bar = on_bar
+        self.timezone = timezone
+        self.session_open = session_open
+        self.cumulative_volume = cumulative_volume
+        self.hour_trading = hour_trading
+        self._lock = threading.Lock()
+        self._current = dict()
+        self._history = defaultdict(lambda: deque(maxlen=max_bars))
+        # 盘中和盘前盘后的累计成交量是两个独立的序列，按 (股票代码, 是否盘前盘后) 分别记录
+        self._last_volume = dict()
+
+    def attach(self, push_client):
+        """
+        接收 PushClient 的行情推送，已设置的 quote_changed 回调仍会被调用
+        """
+        callback = push_client.quote_changed
+
+        def quote_changed(symbol, items, hour_trading):
+            self.on_quote_changed(symbol, items, hour_trading)
+            if callback:
+                callback(symbol, items, hour_trading)
+
+        push_client.quote_changed = quote_changed
+
+    def on_quote_changed(self, symbol, items, hour_trading=False):
+        if hour_trading and not self.hour_trading:
+            return
+        fields = dict(items)
+        self.update(symbol, fields.get('latest_price'), fields.get('volume'), fields.get('latest_time'),
+                    hour_trading=hour_trading)
+
+    def update(self, symbol, price, volume=None, timestamp=None, hour_trading=False):
+        """
+        :param symbol: 股票代码
+        :param price: 最新价，为空时只记录成交量
+        :param volume: 成交量，cumulative_volume 为 True 时为当日累计成交量
+        :param timestamp: 毫秒时间戳，为空时使用本地时间
+        :param hour_trading: 是否为盘前盘后行情
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        closed = []
+        with self._lock:
+            volume = self._volume_delta((symbol, hour_trading), volume)
+            if price is None:
+                # 没有价格时成交量计入当前K线
+                for period in self.periods:
+                    bar = self._current.get((symbol, period, hour_trading))
+                    if bar is not None and bar.time <= timestamp < bar.end_time:
+                        bar.volume += volume
+                return
+            for period in self.periods:
+                key = (symbol, period, hour_trading)
+                bar = self._current.get(key)
+                if bar is not None and timestamp < bar.time:
+                    # 乱序到达的旧行情
+                    continue
+                if bar is None or timestamp >= bar.end_time:
+                    if bar is not None:
+                        self._history[key].append(bar)
+                        closed.append(bar)
+                    start, end = self._bounds(period, timestamp)
+                    bar = Bar(symbol, period, start, end, hour_trading=hour_trading)
+                    self._current[key] = bar
+                bar.update(price, volume)
+        self._emit(closed)
+
+    def close_expired(self, timestamp=None):
+        """
+        结束所有已到结束时间但还没有收到下一笔行情的K线，可在收盘后或定时调用
+        """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        closed = []
+        with self._lock:
+            for key, bar in list(self._current.items()):
+                if timestamp >= bar.end_time:
+                    del self._current[key]
+                    if bar.open is not None:
+                        self._history[key].append(bar)
+                        closed.append(bar)
+        self._emit(closed)
+        return closed
+
+    def seed(self, bars, period, timestamp=None):
+        """
+        用历史K线预热，bars 为 QuoteClient.get_bars 返回的 DataFrame
+        K线保留服务端的开始时间，最后一根K线尚未走完时作为当前K线继续更新
+        """
+        if bars is None or bars.empty:
+            return
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        with self._lock:
+            for row in bars.sort_values('time', kind='mergesort').itertuples(index=False):
+                key = (row.symbol, period, False)
+                start = int(row.time)
+                end = self._bounds(period, start)[1]
+                bar = Bar(row.symbol, period, start, end, row.open, row.high, row.low, row.close, float(row.volume))
+                if end > timestamp:
+                    self._current[key] = bar
+                else:
+                    self._history[key].append(bar)
+
+    def seed_from(self, quote_client, symbols, limit=100, **kwargs):
+        """
+        通过 QuoteClient.get_bars 加载各周期的历史K线，以秒数表示的周期无法预热
+        """
+        for period in self.periods:
+            if isinstance(period, BarPeriod):
+                self.seed(quote_client.get_bars(symbols, period=period, limit=limit, **kwargs), period)
+
+    def get_bars(self, symbol, period, include_current=False, hour_trading=False):
+        """
+        已走完的K线，按时间排序
+        """
+        key = (symbol, period, hour_trading)
+        with self._lock:
+            bars = list(self._history.get(key, ()))
+            current = self._current.get(key)
+        if include_current and current is not None and current.open is not None:
+            bars.append(current)
+        return bars
+
+    def get_current_bar(self, symbol, period, hour_trading=False):
+        with self._lock:
+            return self._current.get((symbol, period, hour_trading))
+
+    def _volume_delta(self, key, volume):
+        if volume is None:
+            return 0
+        if not self.cumulative_volume:
+            return volume
+        last = self._last_volume.get(key)
+        self._last_volume[key] = volume
+        if last is None:
+            # 第一笔推送只记录基准，不计入K线
+            return 0
+        return volume - last if volume >= last else volume
+
+    def _bounds(self, period, timestamp):
+        """
+        包含 timestamp 的K线的开始和结束时间，日内周期以当天开盘时间为起点切分
+        """
+        local = datetime.datetime.fromtimestamp(timestamp / 1000.0, self.timezone).replace(tzinfo=None)
+        day = datetime.datetime(local.year, local.month, local.day)
+        seconds = PERIOD_SECONDS.get(period, period)
+        if isinstance(seconds, int):
+            size = seconds * 1000
+            session_open = self._to_timestamp(datetime.datetime.combine(day.date(), self.session_open))
+            # 开盘前的行情(盘前)同样从开盘时间往前按周期切分
+            start = timestamp - (timestamp - session_open) % size
+            return start, start + size
+
+        if period == BarPeriod.DAY:
+            start, end = day, day + datetime.timedelta(days=1)
+        elif period == BarPeriod.WEEK:
+            start = day - datetime.timedelta(days=day.weekday())
+            end = start + datetime.timedelta(days=7)
+        elif period == BarPeriod.MONTH:
+            start = day.replace(day=1)
+            end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(
+                month=start.month + 1)
+        else:
+            start = day.replace(month=1, day=1)
+            end = start.replace(year=start.year + 1)
+        return self._to_timestamp(start), self._to_timestamp(end)
+
+    def _to_timestamp(self, local):
+        aware = self.timezone.localize(local)
+        return int((local - aware.utcoffset() - _EPOCH).total_seconds() * 1000)
+
+    def _emit(self, closed):
+        if self.on_bar:
+            for bar in closed:
+                self.on_bar(bar)
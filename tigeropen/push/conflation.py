@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+推送合并，限制同一股票等键的回调频率
+"""
+import threading
+import time
+import traceback
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+
+class Conflator(object):
+    """
+    合并同一个键(如股票代码)的连续推送，每个键在 interval 秒内最多回调一次
+    第一次推送立即回调，之后 interval 秒内收到的推送逐字段合并，到期后以合并结果回调一次
+    interval：同一个键两次回调的最小间隔，单位秒
+    emit：执行回调的函数，参数为 (key, callback, args)
+    """
+
+    def __init__(self, interval, emit):
+        self.interval = interval
+        self.received = 0
+        self.delivered = 0
+        self._emit = emit
+        self._condition = threading.Condition()
+        # 所有回调都在此锁内执行，取出和回调之间不会被其他线程插入，保证同一个键的回调顺序且不会并发
+        self._deliver_lock = threading.RLock()
+        self._pending = dict()
+        self._last_sent = dict()
+        self._thread = None
+        self._stopped = False
+
+    def submit(self, key, callback, args, merge=None):
+        """
+        :param merge: 合并函数，参数为 (旧的 args, 新的 args)，返回合并后的 args，为空时保留新的 args
+        """
+        now = _monotonic()
+        with self._condition:
+            self.received += 1
+            pending = self._pending.get(key)
+            if pending is not None:
+                old_callback, old_args = pending
+                self._pending[key] = (callback, merge(old_args, args) if merge else args)
+                return
+            last_sent = self._last_sent.get(key)
+            if last_sent is not None and now - last_sent < self.interval:
+                self._pending[key] = (callback, args)
+                self._ensure_started()
+                self._condition.notify()
+                return
+            self._last_sent[key] = now
+            self.delivered += 1
+        with self._deliver_lock:
+            self._emit(key, callback, args)
+
+    def flush(self):
+        """
+        立即回调所有等待中的合并结果
+        """
+        with self._deliver_lock:
+            with self._condition:
+                pending = list(self._pending.items())
+                self._pending.clear()
+                now = _monotonic()
+                for key, _ in pending:
+                    self._last_sent[key] = now
+                self.delivered += len(pending)
+            for key, (callback, args) in pending:
+                self._deliver(key, callback, args)
+
+    def stop(self):
+        """
+        停止后台线程，未回调的合并结果需要先调用 flush；停止后再次收到推送时会重新启动后台线程
+        """
+        with self._condition:
+            thread = self._thread
+            self._stopped = True
+            self._condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        with self._condition:
+            if self._thread is thread:
+                self._thread = None
+                self._stopped = False
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='tiger-push-conflator')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped and not self._has_due(_monotonic()):
+                    self._condition.wait(self._next_wait(_monotonic()))
+                if self._stopped:
+                    return
+            with self._deliver_lock:
+                with self._condition:
+                    now = _monotonic()
+                    due = [(key, self._pending.pop(key)) for key in list(self._pending)
+                           if self._last_sent.get(key, now) + self.interval <= now]
+                    for key, _ in due:
+                        self._last_sent[key] = now
+                    self.delivered += len(due)
+                for key, (callback, args) in due:
+                    self._deliver(key, callback, args)
+
+    def _has_due(self, now):
+        for key in self._pending:
+            if self._last_sent.get(key, now) + self.interval <= now:
+                return True
+        return False
+
+    def _next_wait(self, now):
+        """
+        距离最早到期的合并结果的秒数，没有等待中的结果时返回 None
+        """
+        if not self._pending:
+            return None
+        return max(min(self._last_sent.get(key, now) for key in self._pending) + self.interval - now, 0)
+
+    def _deliver(self, key, callback, args):
+        try:
+            self._emit(key, callback, args)
+        except Exception:
+            print(traceback.format_exc())
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+推送回调的后台分发线程
+"""
+import itertools
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+
+_monotonic = getattr(time, 'monotonic', time.time)
+
+# 队列满时丢弃最早的事件
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+# 同一股票未处理的事件合并为一个，队列满时丢弃最早的事件
+OVERFLOW_COALESCE = 'coalesce'
+# 队列满时阻塞推送接收线程，直到有空位
+OVERFLOW_BLOCK = 'block'
+
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_BLOCK)
+
+
+class _EventQueue(object):
+    __slots__ = ('name', 'max_size', 'overflow', 'events', 'scheduled', 'max_depth', 'dropped', 'coalesced',
+                 'processed')
+
+    def __init__(self, name, max_size, overflow):
+        self.name = name
+        self.max_size = max_size
+        self.overflow = overflow
+        self.events = OrderedDict()
+        self.scheduled = False
+        self.max_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.processed = 0
+
+
+class PushDispatcher(object):
+    """
+    在工作线程中执行推送回调，避免回调阻塞 stomp 的接收线程
+    每种推送类型一个有界队列，同一类型的回调按顺序执行，不同类型可由多个工作线程并行处理
+    max_workers：工作线程数
+    queue_size：每个队列的最大事件数
+    overflow：队列满时的默认处理策略，见 OVERFLOW_POLICIES
+    overflow_policies：按推送类型指定的处理策略，如 {'quote': OVERFLOW_COALESCE}
+    batch_size：工作线程每次从同一个队列连续处理的最大事件数
+    """
+
+    def __init__(self, max_workers=1, queue_size=10000, overflow=OVERFLOW_DROP_OLDEST, overflow_policies=None,
+                 batch_size=100):
+        for policy in [overflow] + list((overflow_policies or {}).values()):
+            if policy not in OVERFLOW_POLICIES:
+                raise ValueError('unknown overflow policy: ' + str(policy))
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.overflow_policies = dict(overflow_policies or {})
+        self.batch_size = batch_size
+        self._condition = threading.Condition()
+        self._queues = dict()
+        self._ready = deque()
+        self._sequence = itertools.count()
+        self._running = 0
+        self._stopped = False
+        self._workers = []
+        for i in range(max(max_workers, 1)):
+            worker = threading.Thread(target=self._run, name='tiger-push-dispatcher-%d' % i)
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, name, callback, args, key=None, merge=None):
+        """
+        提交一个回调
+        :param name: 推送类型，决定使用的队列
+        :param callback: 回调函数
+        :param args: 回调参数
+        :param key: 合并事件时使用的键，如股票代码
+        :param merge: 合并函数，参数为 (旧的 args, 新的 args)，返回合并后的 args，为空时保留新的 args
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            queue = self._queues.get(name)
+            if queue is None:
+                queue = _EventQueue(name, self.queue_size, self.overflow_policies.get(name, self.overflow))
+                self._queues[name] = queue
+            events = queue.events
+            if queue.overflow == OVERFLOW_COALESCE and key is not None:
+                event_key = ('key', key)
+                if event_key in events:
+                    _, old_args = events[event_key]
+                    events[event_key] = (callback, merge(old_args, args) if merge else args)
+                    queue.coalesced += 1
+                    return
+            else:
+                event_key = ('seq', next(self._sequence))
+            while len(events) >= queue.max_size:
+                if queue.overflow == OVERFLOW_BLOCK:
+                    self._condition.wait()
+                    if self._stopped:
+                        return
+                else:
+                    events.popitem(last=False)
+                    queue.dropped += 1
+            events[event_key] = (callback, args)
+            if len(events) > queue.max_depth:
+                queue.max_depth = len(events)
+            if not queue.scheduled:
+                queue.scheduled = True
+                self._ready.append(queue)
+                self._condition.notify_all()
+
+    def metrics(self):
+        """
+        各推送类型的队列统计
+        :return: {推送类型: {'depth', 'max_depth', 'dropped', 'coalesced', 'processed'}}
+        """
+        with self._condition:
+            return {name: {'depth': len(queue.events), 'max_depth': queue.max_depth, 'dropped': queue.dropped,
+                           'coalesced': queue.coalesced, 'processed': queue.processed}
+                    for name, queue in self._queues.items()}
+
+    def join(self, timeout=None):
+        """
+        等待所有已提交的回调执行完成
+        :return: 是否在 timeout 内完成
+        """
+        deadline = None if timeout is None else _monotonic() + timeout
+        with self._condition:
+            while self._ready or self._running:
+                if deadline is None:
+                    self._condition.wait()
+                else:
+                    remaining = deadline - _monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            return True
+
+    def stop(self, wait=True):
+        """
+        停止工作线程，wait 为 True 时先执行完已提交的回调
+        """
+        if wait:
+            self.join()
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._ready and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                queue = self._ready.popleft()
+                batch = []
+                while queue.events and len(batch) < self.batch_size:
+                    batch.append(queue.events.popitem(last=False)[1])
+                self._running += 1
+                # 唤醒因队列已满而阻塞的接收线程
+                self._condition.notify_all()
+            try:
+                for callback, args in batch:
+                    try:
+                        callback(*args)
+                    except Exception:
+                        print(traceback.format_exc())
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    queue.processed += len(batch)
+                    if queue.events:
+                        self._ready.append(queue)
+                    else:
+                        queue.scheduled = False
+                    self._condition.notify_all()
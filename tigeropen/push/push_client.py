@@ -4,12 +4,15 @@ Created on 2018/10/30
 
 @author: gaoan
 """
-import json
 import stomp
-import six
 import traceback
+from tigeropen.common.util.json_utils import loads
+from tigeropen.common.util.key_utils import KeyMapping
 from tigeropen.common.util.signature_utils import sign_with_rsa
 from tigeropen.common.consts.push_types import RequestType, ResponseType
+from tigeropen.push.conflation import Conflator
+from tigeropen.push.quote_tick import build_quote_decoder, decode_quote_tick, decode_quote_items, \
+    merge_quote_ticks, merge_quote_items
 
 QUOTE_KEYS_MAPPINGS = {'latestTime': 'latest_time', 'latestPrice': 'latest_price', 'LatestPrice': 'latest_price',
                        'preClose': 'prev_close', 'PreClose': 'prev_close', 'volume': 'volume', 'Volume': 'volume',
@@ -28,7 +31,9 @@ ASSET_KEYS_MAPPINGS = {'buyingPower': 'buying_power', 'cashBalance': 'cash',
 POSITION_KEYS_MAPPINGS = {'averageCost': 'average_cost', 'position': 'quantity', 'latestPrice': 'market_price',
                           'marketValue': 'market_value', 'orderType': 'order_type', 'realizedPnl': 'realized_pnl',
                           'unrealizedPnl': 'unrealized_pnl', 'secType': 'sec_type', 'localSymbol': 'local_symbol',
-                          'originSymbol': 'origin_symbol', 'contractId': 'contract_id'}
+                          'originSymbol': 'origin_symbol', 'contractId': 'contract_id', 'symbol': 'symbol',
+                          'currency': 'currency', 'exchange': 'exchange', 'market': 'market', 'expiry': 'expiry',
+                          'strike': 'strike', 'right': 'right', 'multiplier': 'multiplier'}
 
 ORDER_KEYS_MAPPINGS = {'parentId': 'parent_id', 'orderId': 'order_id', 'orderType': 'order_type',
                        'limitPrice': 'limit_price', 'auxPrice': 'aux_price', 'avgFillPrice': 'avg_fill_price',
@@ -37,26 +42,74 @@ ORDER_KEYS_MAPPINGS = {'parentId': 'parent_id', 'orderId': 'order_id', 'orderTyp
                        'remark': 'reason', 'localSymbol': 'local_symbol', 'originSymbol': 'origin_symbol',
                        'outsideRth': 'outside_rth', 'timeInForce': 'time_in_force', 'openTime': 'order_time',
                        'latestTime': 'trade_time', 'contractId': 'contract_id', 'trailStopPrice': 'trail_stop_price',
-                       'trailingPercent': 'trailing_percent', 'percentOffset': 'percent_offset'}
+                       'trailingPercent': 'trailing_percent', 'percentOffset': 'percent_offset', 'id': 'id',
+                       'symbol': 'symbol', 'currency': 'currency', 'exchange': 'exchange', 'market': 'market',
+                       'action': 'action', 'status': 'status', 'commission': 'commission', 'expiry': 'expiry',
+                       'strike': 'strike', 'right': 'right', 'multiplier': 'multiplier'}
+
+QUOTE_DECODER = build_quote_decoder(QUOTE_KEYS_MAPPINGS)
+ASSET_KEYS = KeyMapping(ASSET_KEYS_MAPPINGS, ignore_unmapped=True)
+POSITION_KEYS = KeyMapping(POSITION_KEYS_MAPPINGS, ignore_unmapped=True)
+ORDER_KEYS = KeyMapping(ORDER_KEYS_MAPPINGS, ignore_unmapped=True)
+
+
+# 推送回调在 PushDispatcher 中使用的队列名称
+EVENT_SUBSCRIBED_SYMBOLS = 'subscribed_symbols'
+EVENT_QUOTE = 'quote'
+EVENT_QUOTE_TICK = 'quote_tick'
+EVENT_ASSET = 'asset'
+EVENT_POSITION = 'position'
+EVENT_ORDER = 'order'
+
+
+def _merge_quote_changed(old_args, new_args):
+    return new_args[0], merge_quote_items(old_args[1], new_args[1]), new_args[2]
+
+
+def _merge_quote_tick_changed(old_args, new_args):
+    return merge_quote_ticks(old_args[0], new_args[0]),
+
+
+QUOTE_MERGES = {EVENT_QUOTE: _merge_quote_changed, EVENT_QUOTE_TICK: _merge_quote_tick_changed}
 
 
 class PushClient(object):
-    def __init__(self, host, port, use_ssl=True):
+    """
+    host, port, use_ssl：推送服务地址
+    dispatcher：可选，PushDispatcher 对象，设置后回调在其工作线程中执行，否则在推送接收线程中直接执行
+    conflation_interval：可选，行情推送合并间隔(秒)，设置后每个股票在该间隔内最多回调一次合并后的行情
+    """
+
+    def __init__(self, host, port, use_ssl=True, dispatcher=None, conflation_interval=None):
         self.host = host
         self.port = port
         self.use_ssl = use_ssl
+        self.dispatcher = dispatcher
+        self.conflator = None
+        if conflation_interval:
+            self.conflator = Conflator(conflation_interval, self._emit_conflated)
         self.stomp_connection = None
         self.counter = 0
         self.subscriptions = {}  # subscription callbacks indexed by subscriber's ID
 
         self.subscribed_symbols = None
         self.quote_changed = None
+        # 行情推送回调，参数为 QuoteTick，比 quote_changed 少一次构造 (字段, 值) 列表
+        self.quote_tick_changed = None
         self.asset_changed = None
         self.position_changed = None
         self.order_changed = None
         self.connect_callback = None
         self.disconnect_callback = None
         self.error_callback = None
+        # 按推送类型(ret-type)分发
+        self._handlers = {
+            str(ResponseType.GET_SUB_SYMBOLS_END.value): self._on_subscribed_symbols,
+            str(ResponseType.GET_QUOTE_CHANGE_END.value): self._on_quote_changed,
+            str(ResponseType.SUBSCRIBE_ASSET.value): self._on_asset_changed,
+            str(ResponseType.SUBSCRIBE_POSITION.value): self._on_position_changed,
+            str(ResponseType.SUBSCRIBE_ORDER_STATUS.value): self._on_order_changed,
+        }
 
     def connect(self, tiger_id, private_key):
         sign = sign_with_rsa(private_key, tiger_id, 'utf-8')
@@ -70,6 +123,9 @@ class PushClient(object):
     def disconnect(self):
         if self.stomp_connection:
             self.stomp_connection.disconnect()
+        if self.conflator is not None:
+            self.conflator.flush()
+            self.conflator.stop()
 
     def on_connected(self, headers, body):
         if self.connect_callback:
@@ -87,69 +143,80 @@ class PushClient(object):
         :param body: the frame's payload - the message body.
         """
         try:
-            response_type = headers.get('ret-type')
-            if response_type == str(ResponseType.GET_SUB_SYMBOLS_END.value):
-                if self.subscribed_symbols:
-                    data = json.loads(body)
-                    limit = data.get('limit')
-                    symbols = data.get('subscribedSymbols')
-                    focus_keys = data.get('symbolFocusKeys')
-                    used = data.get('used')
-                    self.subscribed_symbols(symbols, focus_keys, limit, used)
-            elif response_type == str(ResponseType.GET_QUOTE_CHANGE_END.value):
-                if self.quote_changed:
-                    data = json.loads(body)
-                    hour_trading = False
-                    if 'hourTradingLatestPrice' in data:
-                        hour_trading = True
-                    if 'symbol' in data:
-                        symbol = data.get('symbol')
-                        items = []
-                        for key, value in data.items():
-                            if key.startswith('hourTrading'):
-                                key = key[11:]
-                            if key == 'latestTime' and isinstance(value, six.string_types):
-                                continue
-                            if key in QUOTE_KEYS_MAPPINGS:
-                                items.append((QUOTE_KEYS_MAPPINGS.get(key), value))
-                        if items:
-                            self.quote_changed(symbol, items, hour_trading)
-            elif response_type == str(ResponseType.SUBSCRIBE_ASSET.value):
-                if self.asset_changed:
-                    data = json.loads(body)
-                    if 'account' in data:
-                        account = data.get('account')
-                        items = []
-                        for key, value in data.items():
-                            if key in ASSET_KEYS_MAPPINGS:
-                                items.append((ASSET_KEYS_MAPPINGS.get(key), value))
-                        if items:
-                            self.asset_changed(account, items)
-            elif response_type == str(ResponseType.SUBSCRIBE_POSITION.value):
-                if self.position_changed:
-                    data = json.loads(body)
-                    if 'account' in data:
-                        account = data.get('account')
-                        items = []
-                        for key, value in data.items():
-                            if key in POSITION_KEYS_MAPPINGS:
-                                items.append((POSITION_KEYS_MAPPINGS.get(key), value))
-                        if items:
-                            self.position_changed(account, items)
-            elif response_type == str(ResponseType.SUBSCRIBE_ORDER_STATUS.value):
-                if self.order_changed:
-                    data = json.loads(body)
-                    if 'account' in data:
-                        account = data.get('account')
-                        items = []
-                        for key, value in data.items():
-                            if key in ORDER_KEYS_MAPPINGS:
-                                items.append((ORDER_KEYS_MAPPINGS.get(key), value))
-                        if items:
-                            self.order_changed(account, items)
+            handler = self._handlers.get(headers.get('ret-type'))
+            if handler:
+                handler(body)
         except Exception as e:
             print(traceback.format_exc())
 
+    def _on_subscribed_symbols(self, body):
+        if self.subscribed_symbols:
+            data = loads(body)
+            limit = data.get('limit')
+            symbols = data.get('subscribedSymbols')
+            focus_keys = data.get('symbolFocusKeys')
+            used = data.get('used')
+            self._emit(EVENT_SUBSCRIBED_SYMBOLS, self.subscribed_symbols, (symbols, focus_keys, limit, used))
+
+    def _on_quote_changed(self, body):
+        if self.quote_changed or self.quote_tick_changed:
+            data = loads(body)
+            if 'symbol' not in data:
+                return
+            symbol = data.get('symbol')
+            hour_trading = 'hourTradingLatestPrice' in data
+            if self.quote_tick_changed:
+                tick = decode_quote_tick(data, QUOTE_DECODER)
+                if tick:
+                    self._emit_quote(EVENT_QUOTE_TICK, self.quote_tick_changed, (tick,), (symbol, hour_trading),
+                                     _merge_quote_tick_changed)
+            if self.quote_changed:
+                items = decode_quote_items(data, QUOTE_DECODER)
+                if items:
+                    self._emit_quote(EVENT_QUOTE, self.quote_changed, (symbol, items, hour_trading),
+                                     (symbol, hour_trading), _merge_quote_changed)
+
+    def _on_asset_changed(self, body):
+        if self.asset_changed:
+            account, items = self._decode_account_items(body, ASSET_KEYS)
+            if items:
+                self._emit(EVENT_ASSET, self.asset_changed, (account, items))
+
+    def _on_position_changed(self, body):
+        if self.position_changed:
+            account, items = self._decode_account_items(body, POSITION_KEYS)
+            if items:
+                self._emit(EVENT_POSITION, self.position_changed, (account, items))
+
+    def _on_order_changed(self, body):
+        if self.order_changed:
+            account, items = self._decode_account_items(body, ORDER_KEYS)
+            if items:
+                self._emit(EVENT_ORDER, self.order_changed, (account, items))
+
+    def _emit_quote(self, name, callback, args, key, merge):
+        if self.conflator is not None:
+            self.conflator.submit((name, key), callback, args, merge)
+        else:
+            self._emit(name, callback, args, key, merge)
+
+    def _emit_conflated(self, conflation_key, callback, args):
+        name, key = conflation_key
+        self._emit(name, callback, args, key, QUOTE_MERGES[name])
+
+    def _emit(self, name, callback, args, key=None, merge=None):
+        if self.dispatcher is not None:
+            self.dispatcher.submit(name, callback, args, key=key, merge=merge)
+        else:
+            callback(*args)
+
+    @staticmethod
+    def _decode_account_items(body, keys):
+        data = loads(body)
+        if 'account' not in data:
+            return None, None
+        return data.get('account'), keys.translate(data)
+
     def on_error(self, headers, body):
         pass
 
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+行情推送的解码与合并
+"""
+from collections import OrderedDict
+
+import six
+
+QUOTE_TICK_FIELDS = ('latest_time', 'latest_price', 'prev_close', 'volume', 'open', 'high', 'low', 'close',
+                     'ask_price', 'ask_size', 'bid_price', 'bid_size')
+
+
+class QuoteTick(object):
+    """
+    行情推送解析后的结果，未推送的字段为 None
+    """
+    __slots__ = ('symbol', 'hour_trading') + QUOTE_TICK_FIELDS
+
+    def __init__(self, symbol, hour_trading=False):
+        self.symbol = symbol
+        self.hour_trading = hour_trading
+        self.latest_time = None
+        self.latest_price = None
+        self.prev_close = None
+        self.volume = None
+        self.open = None
+        self.high = None
+        self.low = None
+        self.close = None
+        self.ask_price = None
+        self.ask_size = None
+        self.bid_price = None
+        self.bid_size = None
+
+    def items(self):
+        """
+        已推送的字段 [(字段, 值)]，与 quote_changed 回调的 items 格式一致
+        """
+        return [(name, getattr(self, name)) for name in QUOTE_TICK_FIELDS if getattr(self, name) is not None]
+
+    def to_dict(self):
+        dct = dict(self.items())
+        dct['symbol'] = self.symbol
+        dct['hour_trading'] = self.hour_trading
+        return dct
+
+    def __repr__(self):
+        return "QuoteTick(%s)" % self.to_dict().__repr__()
+
+
+def merge_quote_ticks(old, new):
+    """
+    合并同一股票的两次行情推送，new 中没有的字段沿用 old 的值
+    """
+    for name in QUOTE_TICK_FIELDS:
+        if getattr(new, name) is None:
+            setattr(new, name, getattr(old, name))
+    return new
+
+
+def merge_quote_items(old_items, new_items):
+    """
+    合并两次行情推送的 [(字段, 值)]，同一字段以 new_items 为准
+    """
+    merged = OrderedDict(old_items)
+    merged.update(new_items)
+    return list(merged.items())
+
+
+def build_quote_decoder(mappings):
+    """
+    由推送字段映射生成解析表，盘前盘后字段(hourTrading 前缀)直接映射到对应的属性，解析时不再截取字符串
+    :return: {推送字段: (属性名, 是否忽略字符串值)}
+    """
+    decoder = dict()
+    for key, name in mappings.items():
+        for prefixed in (key, 'hourTrading' + key):
+            # 字符串格式的 latestTime 不是时间戳，忽略
+            decoder[prefixed] = (name, key == 'latestTime')
+    return decoder
+
+
+def decode_quote_tick(data, decoder):
+    symbol = data.get('symbol')
+    if symbol is None:
+        return None
+    tick = QuoteTick(symbol, 'hourTradingLatestPrice' in data)
+    get_field = decoder.get
+    for key, value in data.items():
+        field = get_field(key)
+        if field is not None and not (field[1] and isinstance(value, six.string_types)):
+            setattr(tick, field[0], value)
+    return tick
+
+
+def decode_quote_items(data, decoder):
+    get_field = decoder.get
+    items = []
+    for key, value in data.items():
+        field = get_field(key)
+        if field is not None and not (field[1] and isinstance(value, six.string_types)):
+            items.append((field[0], value))
+    return items
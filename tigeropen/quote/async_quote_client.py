@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+基于 asyncio 的行情客户端，接口与 QuoteClient 一致
+"""
+import logging
+
+from tigeropen.async_tiger_open_client import AsyncTigerOpenClient
+from tigeropen.common.consts import SecurityType, Market, Language, QuoteRight, BarPeriod
+from tigeropen.quote.request.builders import market_status_request, symbols_request, symbol_names_request, \
+    trade_metas_request, briefs_request, stock_briefs_request, timeline_request, bars_request, trade_ticks_request, \
+    short_interest_request, option_expirations_request, option_chain_request, option_briefs_request, \
+    option_bars_request, option_trade_ticks_request, future_exchanges_request, future_contracts_request, \
+    current_future_contract_request, future_trading_times_request, future_bars_request, future_trade_ticks_request, \
+    future_brief_request
+from tigeropen.quote.response.future_briefs_response import FutureBriefsResponse
+from tigeropen.quote.response.future_contract_response import FutureContractResponse
+from tigeropen.quote.response.future_exchange_response import FutureExchangeResponse
+from tigeropen.quote.response.future_quote_bar_response import FutureQuoteBarResponse
+from tigeropen.quote.response.future_quote_ticks_response import FutureTradeTickResponse
+from tigeropen.quote.response.future_trading_times_response import FutureTradingTimesResponse
+from tigeropen.quote.response.market_status_response import MarketStatusResponse
+from tigeropen.quote.response.option_briefs_response import OptionBriefsResponse
+from tigeropen.quote.response.option_chains_response import OptionChainsResponse
+from tigeropen.quote.response.option_expirations_response import OptionExpirationsResponse
+from tigeropen.quote.response.option_quote_bar_response import OptionQuoteBarResponse
+from tigeropen.quote.response.option_quote_ticks_response import OptionTradeTickResponse
+from tigeropen.quote.response.quote_bar_response import QuoteBarResponse
+from tigeropen.quote.response.quote_brief_response import QuoteBriefResponse
+from tigeropen.quote.response.quote_ticks_response import TradeTickResponse
+from tigeropen.quote.response.quote_timeline_response import QuoteTimelineResponse
+from tigeropen.quote.response.stock_briefs_response import StockBriefsResponse
+from tigeropen.quote.response.stock_short_interest_response import ShortInterestResponse
+from tigeropen.quote.response.stock_trade_meta_response import TradeMetaResponse
+from tigeropen.quote.response.symbol_names_response import SymbolNamesResponse
+from tigeropen.quote.response.symbols_response import SymbolsResponse
+
+
+class AsyncQuoteClient(AsyncTigerOpenClient):
+    """
+    QuoteClient 的 asyncio 版本，接口与 QuoteClient 一致，所有方法均为协程
+    """
+
+    def __init__(self, client_config, logger=None, transport=None):
+        if not logger:
+            logger = logging.getLogger('tiger_openapi')
+        super(AsyncQuoteClient, self).__init__(client_config, logger=logger, transport=transport)
+        if client_config:
+            self._lang = client_config.language
+        else:
+            self._lang = Language.zh_CN
+
+    async def get_market_status(self, market=Market.ALL, lang=None):
+        request = market_status_request(market, lang or self._lang)
+        response = await self._fetch_response(request, MarketStatusResponse)
+        return response.markets if response else None
+
+    async def get_symbols(self, market=Market.ALL):
+        request = symbols_request(market)
+        response = await self._fetch_response(request, SymbolsResponse)
+        return response.symbols if response else None
+
+    async def get_symbol_names(self, market=Market.ALL, lang=None):
+        request = symbol_names_request(market, lang or self._lang)
+        response = await self._fetch_response(request, SymbolNamesResponse)
+        return response.symbol_names if response else None
+
+    async def get_trade_metas(self, symbols):
+        request = trade_metas_request(symbols)
+        response = await self._fetch_response(request, TradeMetaResponse)
+        return response.metas if response else None
+
+    async def get_briefs(self, symbols, include_hour_trading=False, include_ask_bid=False, right=QuoteRight.BR,
+                         lang=None):
+        request = briefs_request(symbols, include_hour_trading, include_ask_bid, right, lang or self._lang)
+        response = await self._fetch_response(request, QuoteBriefResponse)
+        return response.briefs if response else None
+
+    async def get_stock_briefs(self, symbols, lang=None):
+        request = stock_briefs_request(symbols, lang or self._lang)
+        response = await self._fetch_response(request, StockBriefsResponse)
+        return response.briefs if response else None
+
+    async def get_timeline(self, symbols, include_hour_trading=False, begin_time=-1, lang=None):
+        request = timeline_request(symbols, include_hour_trading, begin_time, lang or self._lang)
+        response = await self._fetch_response(request, QuoteTimelineResponse)
+        return response.timelines if response else None
+
+    async def get_bars(self, symbols, period=BarPeriod.DAY, begin_time=-1, end_time=-1, right=QuoteRight.BR,
+                       limit=251, lang=None):
+        request = bars_request(symbols, period, begin_time, end_time, right, limit, lang or self._lang)
+        response = await self._fetch_response(request, QuoteBarResponse)
+        return response.bars if response else None
+
+    async def get_trade_ticks(self, symbols, begin_index=0, end_index=30, limit=30, lang=None):
+        request = trade_ticks_request(symbols, begin_index, end_index, limit, lang or self._lang)
+        response = await self._fetch_response(request, TradeTickResponse)
+        return response.trade_ticks if response else None
+
+    async def get_short_interest(self, symbols, lang=None):
+        request = short_interest_request(symbols, lang or self._lang)
+        response = await self._fetch_response(request, ShortInterestResponse)
+        return response.short_interests if response else None
+
+    async def get_option_expirations(self, symbols):
+        request = option_expirations_request(symbols)
+        response = await self._fetch_response(request, OptionExpirationsResponse)
+        return response.expirations if response else None
+
+    async def get_option_chain(self, symbol, expiry):
+        request = option_chain_request(symbol, expiry)
+        response = await self._fetch_response(request, OptionChainsResponse)
+        return response.chain if response else None
+
+    async def get_option_briefs(self, identifiers):
+        request = option_briefs_request(identifiers)
+        response = await self._fetch_response(request, OptionBriefsResponse)
+        return response.briefs if response else None
+
+    async def get_option_bars(self, identifiers, begin_time=-1, end_time=4070880000000):
+        request = option_bars_request(identifiers, begin_time, end_time)
+        response = await self._fetch_response(request, OptionQuoteBarResponse)
+        return response.bars if response else None
+
+    async def get_option_trade_ticks(self, identifiers):
+        request = option_trade_ticks_request(identifiers)
+        response = await self._fetch_response(request, OptionTradeTickResponse)
+        return response.trade_ticks if response else None
+
+    async def get_future_exchanges(self, sec_type=SecurityType.FUT, lang=None):
+        request = future_exchanges_request(sec_type, lang or self._lang)
+        response = await self._fetch_response(request, FutureExchangeResponse)
+        return response.exchanges if response else None
+
+    async def get_future_contracts(self, exchange, lang=None):
+        request = future_contracts_request(exchange, lang or self._lang)
+        response = await self._fetch_response(request, FutureContractResponse)
+        return response.contracts if response else None
+
+    async def get_current_future_contract(self, future_type, lang=None):
+        request = current_future_contract_request(future_type, lang or self._lang)
+        response = await self._fetch_response(request, FutureContractResponse)
+        return response.contracts if response else None
+
+    async def get_future_trading_times(self, identifier, trading_date=None):
+        request = future_trading_times_request(identifier, trading_date)
+        response = await self._fetch_response(request, FutureTradingTimesResponse)
+        return response.trading_times if response else None
+
+    async def get_future_bars(self, identifiers, period=BarPeriod.DAY, begin_time=-1, end_time=-1, limit=1000):
+        request = future_bars_request(identifiers, period, begin_time, end_time, limit)
+        response = await self._fetch_response(request, FutureQuoteBarResponse)
+        return response.bars if response else None
+
+    async def get_future_trade_ticks(self, identifiers, begin_index=0, end_index=30, limit=1000):
+        request = future_trade_ticks_request(identifiers, begin_index, end_index, limit)
+        response = await self._fetch_response(request, FutureTradeTickResponse)
+        return response.trade_ticks if response else None
+
+    async def get_future_brief(self, identifiers):
+        request = future_brief_request(identifiers)
+        response = await self._fetch_response(request, FutureBriefsResponse)
+        return response.briefs if response else None
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+K线的本地磁盘缓存
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+
+BAR_KIND_STOCK = 'stock'
+BAR_KIND_FUTURE = 'future'
+BAR_KIND_OPTION = 'option'
+
+
+class BarCache(object):
+    """
+    K线本地磁盘缓存，每个 (品种类型, 代码, 周期, 复权) 对应一个文件
+    cache_dir：缓存目录
+    max_size：缓存目录的最大字节数，超过后按最近使用时间淘汰
+    refresh_interval：距上次刷新不足该秒数时直接使用缓存，不再请求最新数据
+    """
+
+    def __init__(self, cache_dir, max_size=1024 * 1024 * 1024, refresh_interval=0):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._refreshed = dict()
+        # 缓存目录的总字节数，第一次需要时扫描目录，之后随写入和删除增量更新
+        self._total_size = None
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    def path(self, kind, key, period=None, right=None):
+        # 文件名中保留可读的代码，并附加原始代码的哈希，避免不同代码替换字符后得到同一个文件
+        key = str(key)
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()[:16]
+        name = re.sub(r'[^A-Za-z0-9._-]', '_', key) + '-' + digest + '.pkl'
+        return os.path.join(self.cache_dir, kind, str(period or '-'), str(right or '-'), name)
+
+    def load(self, kind, key, period=None, right=None):
+        path = self.path(kind, key, period, right)
+        if not os.path.isfile(path):
+            return None
+        try:
+            bars = pd.read_pickle(path)
+        except Exception:
+            self._remove(path)
+            return None
+        # 更新修改时间，作为淘汰时的最近使用时间
+        os.utime(path, None)
+        return bars
+
+    def save(self, kind, key, bars, period=None, right=None):
+        path = self.path(kind, key, period, right)
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                pass
+        tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.current_thread().ident)
+        bars.to_pickle(tmp_path)
+        size = os.path.getsize(tmp_path)
+        old_size = self._file_size(path)
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+        self._refreshed[path] = time.time()
+        with self._lock:
+            if self._total_size is not None:
+                self._total_size += size - old_size
+        self.evict()
+
+    def touch(self, kind, key, period=None, right=None):
+        """
+        数据没有变化时只记录刷新时间，不重写文件
+        """
+        self._refreshed[self.path(kind, key, period, right)] = time.time()
+
+    def is_fresh(self, kind, key, period=None, right=None):
+        refreshed = self._refreshed.get(self.path(kind, key, period, right))
+        return refreshed is not None and time.time() - refreshed < self.refresh_interval
+
+    def evict(self):
+        """
+        缓存超过 max_size 时删除最久未使用的文件
+        """
+        if not self.max_size:
+            return
+        with self._lock:
+            if self._total_size is not None and self._total_size <= self.max_size:
+                return
+            files = []
+            total = 0
+            for root, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    if not name.endswith('.pkl'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+            if total > self.max_size:
+                for _, size, path in sorted(files):
+                    self._remove(path)
+                    total -= size
+                    if total <= self.max_size:
+                        break
+            self._total_size = total
+
+    def clear(self):
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.pkl'):
+                    self._remove(os.path.join(root, name))
+        with self._lock:
+            self._total_size = 0
+
+    def _remove(self, path):
+        self._refreshed.pop(path, None)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _file_size(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def is_changed(cached, merged):
+        """
+        合并后的K线与缓存中的是否不同，相同时无需重写缓存文件
+        """
+        if cached is None:
+            return merged is not None and not merged.empty
+        return not cached.equals(merged)
+
+    @staticmethod
+    def merge(cached, fresh):
+        """
+        合并缓存和新获取的K线，时间相同时以新数据为准(最后一根K线可能在缓存时尚未走完)
+        """
+        if fresh is None or fresh.empty:
+            return cached
+        if cached is None or cached.empty:
+            return fresh.sort_values('time', kind='mergesort').reset_index(drop=True)
+        merged = pd.concat([cached, fresh], ignore_index=True)
+        merged = merged.drop_duplicates(subset='time', keep='last')
+        return merged.sort_values('time', kind='mergesort').reset_index(drop=True)
@@ -7,6 +7,9 @@ Created on 2018/10/31
 
 
 class HourTrading(object):
+    __slots__ = ["trading_session", "latest_price", "prev_close", "latest_time", "volume", "open_price", "high_price",
+                 "low_price", "change"]
+
     def __init__(self):
         self.trading_session = None  # 盘前/盘后
         self.latest_price = None  # 最新价
@@ -19,14 +22,21 @@ class HourTrading(object):
         self.low_price = None  # 最低价
         self.change = None  # 涨跌额
 
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def __repr__(self):
         """
         String representation for this object.
         """
-        return "HourTrading(%s)" % self.__dict__
+        return "HourTrading(%s)" % self.to_dict()
 
 
 class QuoteBrief(object):
+    __slots__ = ["symbol", "market", "name", "sec_type", "latest_price", "prev_close", "latest_time", "volume",
+                 "open_price", "high_price", "low_price", "change", "bid_price", "bid_size", "ask_price", "ask_size",
+                 "halted", "delay", "auction", "expiry", "hour_trading"]
+
     def __init__(self):
         # contract info
         self.symbol = None  # 股票代号
@@ -56,5 +66,8 @@ class QuoteBrief(object):
 
         self.hour_trading = None  # 盘前盘后数据，可能为空（仅美股
 
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def __repr__(self):
-        return "QuoteBrief(%s)" % self.__dict__
+        return "QuoteBrief(%s)" % self.to_dict()
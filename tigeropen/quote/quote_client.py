@@ -4,12 +4,20 @@ Created on 2018/10/31
 
 @author: gaoan
 """
-import re
-import delorean
-import six
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import pandas as pd
 
 from tigeropen.common.consts import THREAD_LOCAL, SecurityType
 from tigeropen.common.exceptions import ApiException
+from tigeropen.common.reference_cache import create_reference_cache
+from tigeropen.quote.bar_cache import BarCache, BAR_KIND_STOCK, BAR_KIND_FUTURE, BAR_KIND_OPTION
 from tigeropen.quote.response.future_briefs_response import FutureBriefsResponse
 from tigeropen.quote.response.future_exchange_response import FutureExchangeResponse
 from tigeropen.quote.response.future_contract_response import FutureContractResponse
@@ -30,20 +38,16 @@ from tigeropen.quote.response.stock_trade_meta_response import TradeMetaResponse
 from tigeropen.quote.response.symbol_names_response import SymbolNamesResponse
 from tigeropen.quote.response.symbols_response import SymbolsResponse
 from tigeropen.tiger_open_client import TigerOpenClient
-from tigeropen.quote.request.model import MarketParams, MultipleQuoteParams, MultipleContractParams, \
-    FutureQuoteParams, FutureExchangeParams, FutureTypeParams, FutureTradingTimeParams, SingleContractParams, \
-    SingleOptionQuoteParams
-from tigeropen.quote.request import OpenApiRequest
+from tigeropen.quote.request.builders import market_status_request, symbols_request, symbol_names_request, \
+    trade_metas_request, briefs_request, stock_briefs_request, timeline_request, bars_request, trade_ticks_request, \
+    short_interest_request, option_expirations_request, option_chain_request, option_briefs_request, \
+    option_bars_request, option_trade_ticks_request, future_exchanges_request, future_contracts_request, \
+    current_future_contract_request, future_trading_times_request, future_bars_request, future_trade_ticks_request, \
+    future_brief_request
 from tigeropen.quote.response.quote_ticks_response import TradeTickResponse
 from tigeropen.quote.response.market_status_response import MarketStatusResponse
-from tigeropen.common.consts.service_types import MARKET_STATE, ALL_SYMBOLS, ALL_SYMBOL_NAMES, BRIEF, \
-    TIMELINE, KLINE, TRADE_TICK, OPTION_EXPIRATION, OPTION_CHAIN, FUTURE_EXCHANGE, OPTION_BRIEF, \
-    OPTION_KLINE, OPTION_TRADE_TICK, FUTURE_KLINE, FUTURE_TICK, FUTURE_CONTRACT_BY_EXCHANGE_CODE, \
-    FUTURE_TRADING_DATE, QUOTE_SHORTABLE_STOCKS, FUTURE_REAL_TIME_QUOTE, \
-    FUTURE_CURRENT_CONTRACT, QUOTE_REAL_TIME, QUOTE_STOCK_TRADE
+from tigeropen.common.consts.service_types import BRIEF, TIMELINE, KLINE, QUOTE_REAL_TIME, QUOTE_STOCK_TRADE
 from tigeropen.common.consts import Market, Language, QuoteRight, BarPeriod
-from tigeropen.common.util.contract_utils import extract_option_info
-from tigeropen.common.util.common_utils import eastern
 import logging
 
 
@@ -54,8 +58,21 @@ class QuoteClient(TigerOpenClient):
         super(QuoteClient, self).__init__(client_config, logger=logger)
         if client_config:
             self._lang = client_config.language
+            self._symbol_chunk_sizes = client_config.symbol_chunk_sizes
+            self._max_workers = client_config.quote_max_workers
+            self._bar_cache = None
+            if client_config.bar_cache_dir:
+                self._bar_cache = BarCache(client_config.bar_cache_dir, max_size=client_config.bar_cache_max_size,
+                                           refresh_interval=client_config.bar_cache_refresh_interval)
         else:
             self._lang = Language.zh_CN
+            self._symbol_chunk_sizes = dict()
+            self._max_workers = 1
+            self._bar_cache = None
+        # 线程池的工作线程在提交任务时才创建
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers) if self._max_workers and \
+            self._max_workers > 1 else None
+        self._reference_cache = create_reference_cache(client_config)
 
     def get_market_status(self, market=Market.ALL, lang=None):
         """
@@ -64,11 +81,7 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MarketParams()
-        params.market = market.value
-        params.lang = lang.value if lang else self._lang.value
-
-        request = OpenApiRequest(MARKET_STATE, biz_model=params)
+        request = market_status_request(market, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = MarketStatusResponse()
@@ -85,10 +98,10 @@ class QuoteClient(TigerOpenClient):
         :param market: US 美股，HK 港股， CN A股，ALL 所有
         :return:
         """
-        params = MarketParams()
-        params.market = market.value
+        return self.__get_reference(('symbols', market.value), market.value, lambda: self.__get_symbols(market))
 
-        request = OpenApiRequest(ALL_SYMBOLS, biz_model=params)
+    def __get_symbols(self, market):
+        request = symbols_request(market)
         response_content = self.__fetch_data(request)
         if response_content:
             response = SymbolsResponse()
@@ -107,11 +120,12 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MarketParams()
-        params.market = market.value
-        params.lang = lang.value if lang else self._lang.value
+        lang = lang if lang else self._lang
+        return self.__get_reference(('symbol_names', market.value, lang.value), market.value,
+                                    lambda: self.__get_symbol_names(market, lang))
 
-        request = OpenApiRequest(ALL_SYMBOL_NAMES, biz_model=params)
+    def __get_symbol_names(self, market, lang):
+        request = symbol_names_request(market, lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = SymbolNamesResponse()
@@ -129,10 +143,34 @@ class QuoteClient(TigerOpenClient):
         :param 股票代号列表
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-
-        request = OpenApiRequest(QUOTE_STOCK_TRADE, biz_model=params)
+        if self._reference_cache is not None:
+            return self.__get_cached_trade_metas(symbols)
+        return self.__get_trade_metas(symbols)
+
+    def __get_cached_trade_metas(self, symbols):
+        """
+        按股票缓存交易信息，只请求缓存中没有的股票
+        """
+        cache = self._reference_cache
+        metas = dict((symbol, cache.lookup(('trade_meta', symbol))) for symbol in symbols)
+        missing = [symbol for symbol in symbols if metas[symbol] is None]
+        if missing:
+            fetched = self.__get_trade_metas(missing)
+            if fetched is not None:
+                for symbol, meta in fetched.groupby('symbol', sort=False):
+                    cache.put(('trade_meta', symbol), meta.reset_index(drop=True))
+                    metas[symbol] = meta
+        frames = [metas[symbol] for symbol in symbols if metas.get(symbol) is not None]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def __get_trade_metas(self, symbols):
+        chunks = self.__split_symbols(QUOTE_STOCK_TRADE, symbols)
+        if len(chunks) > 1:
+            return self.__fetch_chunks(chunks, lambda chunk: self.__get_trade_metas(chunk))
+
+        request = trade_metas_request(symbols)
         response_content = self.__fetch_data(request)
         if response_content:
             response = TradeMetaResponse()
@@ -154,14 +192,12 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-        params.include_hour_trading = include_hour_trading
-        params.include_ask_bid = include_ask_bid
-        params.right = right.value
-        params.lang = lang.value if lang else self._lang.value
+        chunks = self.__split_symbols(BRIEF, symbols)
+        if len(chunks) > 1:
+            return self.__fetch_chunks(chunks, lambda chunk: self.get_briefs(chunk, include_hour_trading,
+                                                                             include_ask_bid, right, lang))
 
-        request = OpenApiRequest(BRIEF, biz_model=params)
+        request = briefs_request(symbols, include_hour_trading, include_ask_bid, right, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = QuoteBriefResponse()
@@ -180,11 +216,11 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-        params.lang = lang.value if lang else self._lang.value
+        chunks = self.__split_symbols(QUOTE_REAL_TIME, symbols)
+        if len(chunks) > 1:
+            return self.__fetch_chunks(chunks, lambda chunk: self.get_stock_briefs(chunk, lang))
 
-        request = OpenApiRequest(QUOTE_REAL_TIME, biz_model=params)
+        request = stock_briefs_request(symbols, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = StockBriefsResponse()
@@ -205,13 +241,12 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-        params.include_hour_trading = include_hour_trading
-        params.begin_time = begin_time
-        params.lang = lang.value if lang else self._lang.value
+        chunks = self.__split_symbols(TIMELINE, symbols)
+        if len(chunks) > 1:
+            return self.__fetch_chunks(chunks, lambda chunk: self.get_timeline(chunk, include_hour_trading,
+                                                                               begin_time, lang))
 
-        request = OpenApiRequest(TIMELINE, biz_model=params)
+        request = timeline_request(symbols, include_hour_trading, begin_time, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = QuoteTimelineResponse()
@@ -234,17 +269,20 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-        if period:
-            params.period = period.value
-        params.begin_time = begin_time
-        params.end_time = end_time
-        params.right = right.value
-        params.limit = limit
-        params.lang = lang.value if lang else self._lang.value
-
-        request = OpenApiRequest(KLINE, biz_model=params)
+        if self._bar_cache is not None:
+            return self.__get_cached_bars(
+                BAR_KIND_STOCK, symbols, 'symbol', period.value if period else None, right.value, begin_time,
+                end_time, limit, lambda keys, begin, end, size: self.__get_bars(keys, period, begin, end, right, size,
+                                                                                lang))
+        return self.__get_bars(symbols, period, begin_time, end_time, right, limit, lang)
+
+    def __get_bars(self, symbols, period, begin_time, end_time, right, limit, lang):
+        chunks = self.__split_symbols(KLINE, symbols)
+        if len(chunks) > 1:
+            return self.__fetch_chunks(chunks, lambda chunk: self.__get_bars(chunk, period, begin_time, end_time,
+                                                                             right, limit, lang))
+
+        request = bars_request(symbols, period, begin_time, end_time, right, limit, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = QuoteBarResponse()
@@ -254,6 +292,98 @@ class QuoteClient(TigerOpenClient):
             else:
                 raise ApiException(response.code, response.message)
 
+    def iter_bars(self, symbols, period=BarPeriod.DAY, begin_time=-1, end_time=-1, right=QuoteRight.BR, limit=1000,
+                  lang=None, max_workers=None, queue_size=16):
+        """
+        分页获取历史K线，逐批返回，适合下载较长时间段的数据
+        每个股票从 end_time 向前按时间窗口翻页，直到 begin_time 或没有更多数据；多个股票并发下载
+        :param symbols: 股票代码列表
+        :param period: K线周期
+        :param begin_time: 开始时间，-1 表示不限
+        :param end_time: 结束时间，-1 表示当前
+        :param right: 复权选项
+        :param limit: 每页数量
+        :param lang: 语言支持: zh_CN,zh_TW,en_US
+        :param max_workers: 同时下载的股票数，默认为 quote_max_workers
+        :param queue_size: 已下载但未被消费的最大批数，用于限制内存占用
+        :return: DataFrame 生成器，每批只包含一个股票，批内按时间升序，批与批之间已去除重复K线
+        """
+        if not symbols:
+            return
+        workers = min(max_workers or self._max_workers or 1, len(symbols))
+        if workers <= 1:
+            for symbol in symbols:
+                for bars in self.__paginate_bars(symbol, period, begin_time, end_time, right, limit, lang):
+                    yield bars
+            return
+
+        chunks = queue.Queue(maxsize=queue_size)
+        stopped = threading.Event()
+        done = object()
+
+        def download(symbol):
+            try:
+                for bars in self.__paginate_bars(symbol, period, begin_time, end_time, right, limit, lang):
+                    if not self.__put_until_stopped(chunks, bars, stopped):
+                        return
+                self.__put_until_stopped(chunks, done, stopped)
+            except Exception as e:
+                self.__put_until_stopped(chunks, e, stopped)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            for symbol in symbols:
+                executor.submit(download, symbol)
+            remaining = len(symbols)
+            while remaining:
+                item = chunks.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False)
+
+    @staticmethod
+    def __put_until_stopped(chunks, item, stopped):
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __paginate_bars(self, symbol, period, begin_time, end_time, right, limit, lang):
+        fetch = (lambda begin, end, size: self.__get_bars([symbol], period, begin, end, right, size, lang))
+        return self.__paginate(fetch, begin_time, end_time, limit)
+
+    @staticmethod
+    def __paginate(fetch, begin_time, end_time, limit):
+        """
+        向前翻页，下一页的结束时间为上一页最早一根K线的时间(含)，重叠的K线会被去除
+        fetch(begin_time, end_time, limit) 返回单个代码的K线，limit 为空时只请求一次
+        """
+        earliest = None
+        while True:
+            bars = fetch(begin_time, end_time, limit)
+            if bars is None or bars.empty:
+                return
+            count = len(bars)
+            if earliest is not None:
+                bars = bars[bars['time'] < earliest]
+                if bars.empty:
+                    return
+            bars = bars.sort_values('time', kind='mergesort').reset_index(drop=True)
+            earliest = int(bars['time'].iloc[0])
+            yield bars
+            if not limit or count < limit or (begin_time != -1 and earliest <= begin_time):
+                return
+            end_time = earliest
+
     def get_trade_ticks(self, symbols, begin_index=0, end_index=30, limit=30, lang=None):
         """
         获取逐笔成交
@@ -264,14 +394,7 @@ class QuoteClient(TigerOpenClient):
         :param lang: 语言支持: zh_CN,zh_TW,en_US
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-        params.begin_index = begin_index
-        params.end_index = end_index
-        params.limit = limit
-        params.lang = lang.value if lang else self._lang.value
-
-        request = OpenApiRequest(TRADE_TICK, biz_model=params)
+        request = trade_ticks_request(symbols, begin_index, end_index, limit, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = TradeTickResponse()
@@ -290,11 +413,7 @@ class QuoteClient(TigerOpenClient):
         :param lang:
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-        params.lang = lang.value if lang else self._lang.value
-
-        request = OpenApiRequest(QUOTE_SHORTABLE_STOCKS, biz_model=params)
+        request = short_interest_request(symbols, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = ShortInterestResponse()
@@ -312,10 +431,7 @@ class QuoteClient(TigerOpenClient):
         :param symbols: 股票列表
         :return:
         """
-        params = MultipleQuoteParams()
-        params.symbols = symbols
-
-        request = OpenApiRequest(OPTION_EXPIRATION, biz_model=params)
+        request = option_expirations_request(symbols)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OptionExpirationsResponse()
@@ -334,15 +450,7 @@ class QuoteClient(TigerOpenClient):
         :param expiry: 过期日(类似2019-01-04或者1546578000000)
         :return:
         """
-        params = MultipleContractParams()
-        param = SingleContractParams()
-        param.symbol = symbol
-        if isinstance(expiry, six.string_types) and re.match('[0-9]{4}\-[0-9]{2}\-[0-9]{2}', expiry):
-            param.expiry = int(delorean.parse(expiry, timezone=eastern, dayfirst=False).datetime.timestamp() * 1000)
-        else:
-            param.expiry = expiry
-        params.contracts = [param]
-        request = OpenApiRequest(OPTION_CHAIN, biz_model=params)
+        request = option_chain_request(symbol, expiry)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OptionChainsResponse()
@@ -360,21 +468,7 @@ class QuoteClient(TigerOpenClient):
         :param identifiers: 期权代码
         :return:
         """
-        params = MultipleContractParams()
-        contracts = []
-        for identifier in identifiers:
-            symbol, expiry, put_call, strike = extract_option_info(identifier)
-            if symbol is None or expiry is None or put_call is None or strike is None:
-                continue
-            param = SingleContractParams()
-            param.symbol = symbol
-            param.expiry = int(delorean.parse(expiry, timezone=eastern, dayfirst=False).datetime.timestamp() * 1000)
-            param.put_call = put_call
-            param.strike = strike
-            contracts.append(param)
-        params.contracts = contracts
-
-        request = OpenApiRequest(OPTION_BRIEF, biz_model=params)
+        request = option_briefs_request(identifiers)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OptionBriefsResponse()
@@ -394,24 +488,15 @@ class QuoteClient(TigerOpenClient):
         :param end_time: 结束时间
         :return:
         """
-        params = MultipleContractParams()
-        contracts = []
-        for identifier in identifiers:
-            symbol, expiry, put_call, strike = extract_option_info(identifier)
-            if symbol is None or expiry is None or put_call is None or strike is None:
-                continue
-            param = SingleOptionQuoteParams()
-            param.symbol = symbol
-            param.expiry = int(delorean.parse(expiry, timezone=eastern, dayfirst=False).datetime.timestamp() * 1000)
-            param.put_call = put_call
-            param.strike = strike
-            param.period = BarPeriod.DAY.value
-            param.begin_time = begin_time
-            param.end_time = end_time
-            contracts.append(param)
-        params.contracts = contracts
-
-        request = OpenApiRequest(OPTION_KLINE, biz_model=params)
+        if self._bar_cache is not None:
+            return self.__get_cached_bars(
+                BAR_KIND_OPTION, identifiers, None, BarPeriod.DAY.value, None, begin_time, end_time, None,
+                lambda keys, begin, end, size: self.__get_option_bars(keys, begin,
+                                                                      end if end != -1 else 4070880000000))
+        return self.__get_option_bars(identifiers, begin_time, end_time)
+
+    def __get_option_bars(self, identifiers, begin_time, end_time):
+        request = option_bars_request(identifiers, begin_time, end_time)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OptionQuoteBarResponse()
@@ -427,21 +512,7 @@ class QuoteClient(TigerOpenClient):
         :param identifiers: 期权代码
         :return:
         """
-        params = MultipleContractParams()
-        contracts = []
-        for identifier in identifiers:
-            symbol, expiry, put_call, strike = extract_option_info(identifier)
-            if symbol is None or expiry is None or put_call is None or strike is None:
-                continue
-            param = SingleContractParams()
-            param.symbol = symbol
-            param.expiry = int(delorean.parse(expiry, timezone=eastern, dayfirst=False).datetime.timestamp() * 1000)
-            param.put_call = put_call
-            param.strike = strike
-            contracts.append(param)
-        params.contracts = contracts
-
-        request = OpenApiRequest(OPTION_TRADE_TICK, biz_model=params)
+        request = option_trade_ticks_request(identifiers)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OptionTradeTickResponse()
@@ -460,11 +531,12 @@ class QuoteClient(TigerOpenClient):
         :param lang:
         :return:
         """
-        params = MarketParams()
-        params.sec_type = sec_type.value
-        params.lang = lang.value if lang else self._lang.value
+        lang = lang if lang else self._lang
+        return self.__get_reference(('future_exchanges', sec_type.value, lang.value), None,
+                                    lambda: self.__get_future_exchanges(sec_type, lang))
 
-        request = OpenApiRequest(FUTURE_EXCHANGE, biz_model=params)
+    def __get_future_exchanges(self, sec_type, lang):
+        request = future_exchanges_request(sec_type, lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureExchangeResponse()
@@ -482,11 +554,12 @@ class QuoteClient(TigerOpenClient):
         :param lang:
         :return:
         """
-        params = FutureExchangeParams()
-        params.exchange_code = exchange
-        params.lang = lang.value if lang else self._lang.value
+        lang = lang if lang else self._lang
+        return self.__get_reference(('future_contracts', exchange, lang.value), None,
+                                    lambda: self.__get_future_contracts(exchange, lang))
 
-        request = OpenApiRequest(FUTURE_CONTRACT_BY_EXCHANGE_CODE, biz_model=params)
+    def __get_future_contracts(self, exchange, lang):
+        request = future_contracts_request(exchange, lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureContractResponse()
@@ -504,11 +577,7 @@ class QuoteClient(TigerOpenClient):
         :param lang:
         :return:
         """
-        params = FutureTypeParams()
-        params.type = future_type
-        params.lang = lang.value if lang else self._lang.value
-
-        request = OpenApiRequest(FUTURE_CURRENT_CONTRACT, biz_model=params)
+        request = current_future_contract_request(future_type, lang or self._lang)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureContractResponse()
@@ -526,11 +595,7 @@ class QuoteClient(TigerOpenClient):
         :param trading_date:
         :return:
         """
-        params = FutureTradingTimeParams()
-        params.contract_code = identifier
-        params.trading_date = trading_date
-
-        request = OpenApiRequest(FUTURE_TRADING_DATE, biz_model=params)
+        request = future_trading_times_request(identifier, trading_date)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureTradingTimesResponse()
@@ -551,15 +616,14 @@ class QuoteClient(TigerOpenClient):
         :param limit: 数量限制
         :return:
         """
-        params = FutureQuoteParams()
-        params.contract_codes = identifiers
-        if period:
-            params.period = period.value
-        params.begin_time = begin_time
-        params.end_time = end_time
-        params.limit = limit
+        if self._bar_cache is not None:
+            return self.__get_cached_bars(
+                BAR_KIND_FUTURE, identifiers, 'identifier', period.value if period else None, None, begin_time,
+                end_time, limit, lambda keys, begin, end, size: self.__get_future_bars(keys, period, begin, end, size))
+        return self.__get_future_bars(identifiers, period, begin_time, end_time, limit)
 
-        request = OpenApiRequest(FUTURE_KLINE, biz_model=params)
+    def __get_future_bars(self, identifiers, period, begin_time, end_time, limit):
+        request = future_bars_request(identifiers, period, begin_time, end_time, limit)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureQuoteBarResponse()
@@ -578,13 +642,7 @@ class QuoteClient(TigerOpenClient):
         :param limit: 数量限制
         :return:
         """
-        params = FutureQuoteParams()
-        params.contract_codes = identifiers
-        params.begin_index = begin_index
-        params.end_index = end_index
-        params.limit = limit
-
-        request = OpenApiRequest(FUTURE_TICK, biz_model=params)
+        request = future_trade_ticks_request(identifiers, begin_index, end_index, limit)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureTradeTickResponse()
@@ -600,10 +658,7 @@ class QuoteClient(TigerOpenClient):
         :param identifiers: 期货代码
         :return:
         """
-        params = FutureQuoteParams()
-        params.contract_codes = identifiers
-
-        request = OpenApiRequest(FUTURE_REAL_TIME_QUOTE, biz_model=params)
+        request = future_brief_request(identifiers)
         response_content = self.__fetch_data(request)
         if response_content:
             response = FutureBriefsResponse()
@@ -613,6 +668,145 @@ class QuoteClient(TigerOpenClient):
             else:
                 raise ApiException(response.code, response.message)
 
+    def __get_cached_bars(self, kind, keys, key_column, period, right, begin_time, end_time, limit, fetch):
+        """
+        通过本地缓存获取K线，每个代码分别处理后按原始顺序合并
+        fetch(keys, begin_time, end_time, limit) 从服务端获取多个代码的K线
+        key_column：返回结果中区分代码的列，没有缓存的代码合并为一次请求后按该列拆分；为空时逐个请求
+        """
+        if not keys:
+            return None
+        cache = self._bar_cache
+        results = dict()
+        cached_items = []
+        missing = []
+        for key in keys:
+            cached = cache.load(kind, key, period, right)
+            if cached is None or cached.empty:
+                missing.append(key)
+            else:
+                cached_items.append((key, cached))
+
+        if missing and key_column is not None:
+            bars = fetch(missing, begin_time, end_time, limit)
+            if bars is not None and not bars.empty:
+                missing_keys = set(missing)
+                for key, group in bars.groupby(key_column, sort=False):
+                    if key not in missing_keys:
+                        continue
+                    group = group.reset_index(drop=True)
+                    cache.save(kind, key, BarCache.merge(None, group), period, right)
+                    results[key] = group
+            missing = []
+
+        items = [(key, None) for key in missing] + cached_items
+        if items:
+            bars_list = self.__map(lambda item: self.__get_cached_key_bars(
+                kind, item[0], item[1], period, right, begin_time, end_time, limit, fetch), items)
+            for (key, _), bars in zip(items, bars_list):
+                results[key] = bars
+
+        frames = [results[key] for key in keys if results.get(key) is not None]
+        if not frames:
+            return None
+        return pd.concat(frames, ignore_index=True)
+
+    def __get_cached_key_bars(self, kind, key, cached, period, right, begin_time, end_time, limit, fetch):
+        cache = self._bar_cache
+        page = (lambda begin, end, size: fetch([key], begin, end, size))
+        if cached is None:
+            bars = fetch([key], begin_time, end_time, limit)
+            if bars is not None and not bars.empty:
+                cache.save(kind, key, BarCache.merge(None, bars), period, right)
+            return bars
+
+        original = cached
+        refreshed = False
+        if not cache.is_fresh(kind, key, period, right):
+            # 最后一根K线缓存时可能尚未走完，从它开始(含)重新获取到最新
+            last_time = int(cached['time'].iloc[-1])
+            for bars in self.__paginate(page, last_time, -1, limit):
+                cached = BarCache.merge(cached, bars)
+            refreshed = True
+
+        first_time = int(cached['time'].iloc[0])
+        # 结束时间早于缓存时获取的K线与缓存不连续，只用于本次返回，不写入缓存
+        earlier = None
+        if begin_time != -1 and begin_time < first_time:
+            for bars in self.__paginate(page, begin_time, first_time, limit):
+                cached = BarCache.merge(cached, bars)
+        elif begin_time == -1 and limit:
+            in_range = cached if end_time == -1 else cached[cached['time'] <= end_time]
+            missing = limit - len(in_range)
+            if missing > 0:
+                before_cache = end_time != -1 and end_time < first_time
+                earlier = [] if before_cache else None
+                for bars in self.__paginate(page, -1, end_time if before_cache else first_time, limit):
+                    if end_time != -1:
+                        bars = bars[bars['time'] <= end_time]
+                    if before_cache:
+                        earlier.append(bars)
+                    else:
+                        cached = BarCache.merge(cached, bars)
+                    missing -= len(bars)
+                    if missing <= 0:
+                        break
+        # 只有新增或修改了K线时才重写缓存文件
+        if cached is not original and BarCache.is_changed(original, cached):
+            cache.save(kind, key, cached, period, right)
+        elif refreshed:
+            cache.touch(kind, key, period, right)
+
+        bars = cached
+        if earlier:
+            bars = pd.concat(earlier, ignore_index=True).sort_values('time', kind='mergesort')
+        if begin_time != -1:
+            bars = bars[bars['time'] >= begin_time]
+        if end_time != -1:
+            bars = bars[bars['time'] <= end_time]
+        if limit:
+            bars = bars.tail(limit)
+        return bars.reset_index(drop=True)
+
+    def __get_reference(self, key, market, loader):
+        """
+        启用参考数据缓存时优先从缓存读取
+        """
+        if self._reference_cache is None:
+            return loader()
+        return self._reference_cache.get(key, loader, market=market)
+
+    def __split_symbols(self, service_type, symbols):
+        """
+        按接口配置的每批数量拆分股票列表
+        """
+        chunk_size = self._symbol_chunk_sizes.get(service_type) if self._symbol_chunk_sizes else None
+        if not chunk_size or not symbols or len(symbols) <= chunk_size:
+            return [symbols]
+        return [symbols[i:i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+
+    def __fetch_chunks(self, chunks, fetch):
+        """
+        并发请求各批数据，并按原始顺序合并结果(DataFrame 拼接，列表连接)
+        """
+        results = [result for result in self.__map(fetch, chunks) if result is not None]
+        if not results:
+            return None
+        if isinstance(results[0], pd.DataFrame):
+            return pd.concat(results, ignore_index=True)
+        merged = []
+        for result in results:
+            merged.extend(result)
+        return merged
+
+    def __map(self, func, items):
+        """
+        有多个任务且配置了并发数时在线程池中执行，结果与 items 顺序一致
+        """
+        if self._executor is not None and len(items) > 1:
+            return list(self._executor.map(func, items))
+        return [func(item) for item in items]
+
     def __fetch_data(self, request):
         try:
             response = super(QuoteClient, self).execute(request)
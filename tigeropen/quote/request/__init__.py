@@ -15,6 +15,10 @@ class OpenApiRequest(object):
         self._method = method
         self._biz_model = biz_model
 
+    @property
+    def method(self):
+        return self._method
+
     @property
     def biz_model(self):
         return self._biz_model
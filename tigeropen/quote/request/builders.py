@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+行情接口的请求构造，QuoteClient 和 AsyncQuoteClient 共用
+lang 参数为已确定的 Language，由客户端传入(未指定时使用配置中的语言)
+"""
+import re
+
+import delorean
+import six
+
+from tigeropen.common.consts import BarPeriod
+from tigeropen.common.consts.service_types import MARKET_STATE, ALL_SYMBOLS, ALL_SYMBOL_NAMES, BRIEF, \
+    TIMELINE, KLINE, TRADE_TICK, OPTION_EXPIRATION, OPTION_CHAIN, FUTURE_EXCHANGE, OPTION_BRIEF, \
+    OPTION_KLINE, OPTION_TRADE_TICK, FUTURE_KLINE, FUTURE_TICK, FUTURE_CONTRACT_BY_EXCHANGE_CODE, \
+    FUTURE_TRADING_DATE, QUOTE_SHORTABLE_STOCKS, FUTURE_REAL_TIME_QUOTE, \
+    FUTURE_CURRENT_CONTRACT, QUOTE_REAL_TIME, QUOTE_STOCK_TRADE
+from tigeropen.common.util.common_utils import eastern
+from tigeropen.common.util.contract_utils import extract_option_info
+from tigeropen.quote.request import OpenApiRequest
+from tigeropen.quote.request.model import MarketParams, MultipleQuoteParams, MultipleContractParams, \
+    FutureQuoteParams, FutureExchangeParams, FutureTypeParams, FutureTradingTimeParams, SingleContractParams, \
+    SingleOptionQuoteParams
+
+
+def _parse_expiry(expiry):
+    return int(delorean.parse(expiry, timezone=eastern, dayfirst=False).datetime.timestamp() * 1000)
+
+
+def _option_contract_params(identifiers, param_class):
+    """
+    将期权代码转换为合约参数，无法解析的代码会被忽略
+    """
+    contracts = []
+    for identifier in identifiers:
+        symbol, expiry, put_call, strike = extract_option_info(identifier)
+        if symbol is None or expiry is None or put_call is None or strike is None:
+            continue
+        param = param_class()
+        param.symbol = symbol
+        param.expiry = _parse_expiry(expiry)
+        param.put_call = put_call
+        param.strike = strike
+        contracts.append(param)
+    return contracts
+
+
+def market_status_request(market, lang):
+    params = MarketParams()
+    params.market = market.value
+    params.lang = lang.value
+    return OpenApiRequest(MARKET_STATE, biz_model=params)
+
+
+def symbols_request(market):
+    params = MarketParams()
+    params.market = market.value
+    return OpenApiRequest(ALL_SYMBOLS, biz_model=params)
+
+
+def symbol_names_request(market, lang):
+    params = MarketParams()
+    params.market = market.value
+    params.lang = lang.value
+    return OpenApiRequest(ALL_SYMBOL_NAMES, biz_model=params)
+
+
+def trade_metas_request(symbols):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    return OpenApiRequest(QUOTE_STOCK_TRADE, biz_model=params)
+
+
+def briefs_request(symbols, include_hour_trading, include_ask_bid, right, lang):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    params.include_hour_trading = include_hour_trading
+    params.include_ask_bid = include_ask_bid
+    params.right = right.value
+    params.lang = lang.value
+    return OpenApiRequest(BRIEF, biz_model=params)
+
+
+def stock_briefs_request(symbols, lang):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    params.lang = lang.value
+    return OpenApiRequest(QUOTE_REAL_TIME, biz_model=params)
+
+
+def timeline_request(symbols, include_hour_trading, begin_time, lang):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    params.include_hour_trading = include_hour_trading
+    params.begin_time = begin_time
+    params.lang = lang.value
+    return OpenApiRequest(TIMELINE, biz_model=params)
+
+
+def bars_request(symbols, period, begin_time, end_time, right, limit, lang):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    if period:
+        params.period = period.value
+    params.begin_time = begin_time
+    params.end_time = end_time
+    params.right = right.value
+    params.limit = limit
+    params.lang = lang.value
+    return OpenApiRequest(KLINE, biz_model=params)
+
+
+def trade_ticks_request(symbols, begin_index, end_index, limit, lang):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    params.begin_index = begin_index
+    params.end_index = end_index
+    params.limit = limit
+    params.lang = lang.value
+    return OpenApiRequest(TRADE_TICK, biz_model=params)
+
+
+def short_interest_request(symbols, lang):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    params.lang = lang.value
+    return OpenApiRequest(QUOTE_SHORTABLE_STOCKS, biz_model=params)
+
+
+def option_expirations_request(symbols):
+    params = MultipleQuoteParams()
+    params.symbols = symbols
+    return OpenApiRequest(OPTION_EXPIRATION, biz_model=params)
+
+
+def option_chain_request(symbol, expiry):
+    params = MultipleContractParams()
+    param = SingleContractParams()
+    param.symbol = symbol
+    if isinstance(expiry, six.string_types) and re.match(r'[0-9]{4}-[0-9]{2}-[0-9]{2}', expiry):
+        param.expiry = _parse_expiry(expiry)
+    else:
+        param.expiry = expiry
+    params.contracts = [param]
+    return OpenApiRequest(OPTION_CHAIN, biz_model=params)
+
+
+def option_briefs_request(identifiers):
+    params = MultipleContractParams()
+    params.contracts = _option_contract_params(identifiers, SingleContractParams)
+    return OpenApiRequest(OPTION_BRIEF, biz_model=params)
+
+
+def option_bars_request(identifiers, begin_time, end_time):
+    params = MultipleContractParams()
+    contracts = _option_contract_params(identifiers, SingleOptionQuoteParams)
+    for param in contracts:
+        param.period = BarPeriod.DAY.value
+        param.begin_time = begin_time
+        param.end_time = end_time
+    params.contracts = contracts
+    return OpenApiRequest(OPTION_KLINE, biz_model=params)
+
+
+def option_trade_ticks_request(identifiers):
+    params = MultipleContractParams()
+    params.contracts = _option_contract_params(identifiers, SingleContractParams)
+    return OpenApiRequest(OPTION_TRADE_TICK, biz_model=params)
+
+
+def future_exchanges_request(sec_type, lang):
+    params = MarketParams()
+    params.sec_type = sec_type.value
+    params.lang = lang.value
+    return OpenApiRequest(FUTURE_EXCHANGE, biz_model=params)
+
+
+def future_contracts_request(exchange, lang):
+    params = FutureExchangeParams()
+    params.exchange_code = exchange
+    params.lang = lang.value
+    return OpenApiRequest(FUTURE_CONTRACT_BY_EXCHANGE_CODE, biz_model=params)
+
+
+def current_future_contract_request(future_type, lang):
+    params = FutureTypeParams()
+    params.type = future_type
+    params.lang = lang.value
+    return OpenApiRequest(FUTURE_CURRENT_CONTRACT, biz_model=params)
+
+
+def future_trading_times_request(identifier, trading_date):
+    params = FutureTradingTimeParams()
+    params.contract_code = identifier
+    params.trading_date = trading_date
+    return OpenApiRequest(FUTURE_TRADING_DATE, biz_model=params)
+
+
+def future_bars_request(identifiers, period, begin_time, end_time, limit):
+    params = FutureQuoteParams()
+    params.contract_codes = identifiers
+    if period:
+        params.period = period.value
+    params.begin_time = begin_time
+    params.end_time = end_time
+    params.limit = limit
+    return OpenApiRequest(FUTURE_KLINE, biz_model=params)
+
+
+def future_trade_ticks_request(identifiers, begin_index, end_index, limit):
+    params = FutureQuoteParams()
+    params.contract_codes = identifiers
+    params.begin_index = begin_index
+    params.end_index = end_index
+    params.limit = limit
+    return OpenApiRequest(FUTURE_TICK, biz_model=params)
+
+
+def future_brief_request(identifiers):
+    params = FutureQuoteParams()
+    params.contract_codes = identifiers
+    return OpenApiRequest(FUTURE_REAL_TIME_QUOTE, biz_model=params)
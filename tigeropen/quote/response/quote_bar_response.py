@@ -6,6 +6,7 @@ Created on 2018/10/31
 """
 import json
 import six
+import numpy as np
 import pandas as pd
 
 from tigeropen.common.util.string_utils import get_string
@@ -13,6 +14,8 @@ from tigeropen.common.response import TigerResponse
 
 COLUMNS = ['symbol', 'time', 'open', 'high', 'low', 'close', 'volume']
 BAR_FIELD_MAPPINGS = {'avgPrice': 'avg_price'}
+INTEGER_TYPES = frozenset(six.integer_types)
+NUMBER_TYPES = INTEGER_TYPES | frozenset([float])
 
 
 class QuoteBarResponse(TigerResponse):
@@ -27,19 +30,39 @@ class QuoteBarResponse(TigerResponse):
             self._is_success = response['is_success']
 
         if self.data and isinstance(self.data, list):
-            bar_items = []
-            for symbol_item in self.data:
-                symbol = symbol_item.get('symbol')
-                if 'items' in symbol_item:
-                    for item in symbol_item['items']:
-                        item_values = {'symbol': symbol}
-                        for key, value in item.items():
-                            if value is None:
-                                continue
-                            if isinstance(value, six.string_types):
-                                value = get_string(value)
-                            tag = BAR_FIELD_MAPPINGS[key] if key in BAR_FIELD_MAPPINGS else key
-                            item_values[tag] = value
-                        bar_items.append([item_values.get(tag) for tag in COLUMNS])
-
-            self.bars = pd.DataFrame(bar_items, columns=COLUMNS)
+            self.bars = self.parse_bars(self.data)
+
+    @staticmethod
+    def parse_bars(data):
+        """
+        按列解析K线，每个字段直接生成一列 numpy 数组
+        """
+        symbols = []
+        counts = []
+        values = {tag: [] for tag in COLUMNS[1:]}
+        for symbol_item in data:
+            items = symbol_item.get('items')
+            if not items:
+                continue
+            symbol = symbol_item.get('symbol')
+            if isinstance(symbol, six.string_types):
+                symbol = get_string(symbol)
+            symbols.append(symbol)
+            counts.append(len(items))
+            for tag, column in values.items():
+                column.extend([item.get(tag) for item in items])
+
+        columns = {'symbol': np.repeat(np.array(symbols, dtype=object), counts)}
+        for tag, column in values.items():
+            columns[tag] = QuoteBarResponse._to_array(column)
+        return pd.DataFrame(columns, columns=COLUMNS)
+
+    @staticmethod
+    def _to_array(column):
+        kinds = set(map(type, column))
+        if kinds and kinds <= INTEGER_TYPES:
+            return np.array(column, dtype='int64')
+        if kinds and kinds <= NUMBER_TYPES:
+            return np.array(column, dtype='float64')
+        # 存在缺失值、字符串等其他类型时交给 pandas 推断类型，与逐行构造 DataFrame 的结果一致
+        return pd.Series(column, dtype=object if not kinds else None)
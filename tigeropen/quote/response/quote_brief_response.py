@@ -5,17 +5,21 @@ Created on 2018/10/31
 @author: gaoan
 """
 
-import json
 import six
 from tigeropen.common.consts import TradingSession
+from tigeropen.common.util.field_utils import get_field_mapping
 from tigeropen.common.util.string_utils import get_string
 from tigeropen.quote.domain.quote_brief import QuoteBrief, HourTrading
 from tigeropen.common.response import TigerResponse
+from tigeropen.common.util.json_utils import decode_data
 
 BRIEF_FIELD_MAPPINGS = {'latestPrice': 'latest_price', 'preClose': 'prev_close', 'secType': 'sec_type',
                         'timestamp': 'latest_time', 'askPrice': 'ask_price', 'askSize': 'ask_size',
                         'bidPrice': 'bid_price', 'bidSize': 'bid_size'}
 
+BRIEF_FIELDS = get_field_mapping(QuoteBrief, BRIEF_FIELD_MAPPINGS)
+HOUR_TRADING_FIELDS = get_field_mapping(HourTrading, BRIEF_FIELD_MAPPINGS)
+
 
 class QuoteBriefResponse(TigerResponse):
     def __init__(self):
@@ -29,7 +33,7 @@ class QuoteBriefResponse(TigerResponse):
             self._is_success = response['is_success']
 
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             if 'items' in data_json:
                 for item in data_json['items']:
                     brief = QuoteBrief()
@@ -49,13 +53,12 @@ class QuoteBriefResponse(TigerResponse):
                                     elif sub_value == '盘后':
                                         hour_trading.trading_session = TradingSession.AfterHours
                                 else:
-                                    sub_tag = BRIEF_FIELD_MAPPINGS[
-                                        sub_key] if sub_key in BRIEF_FIELD_MAPPINGS else sub_key
-                                    if hasattr(hour_trading, sub_tag):
+                                    sub_tag = HOUR_TRADING_FIELDS.get(sub_key)
+                                    if sub_tag is not None:
                                         setattr(hour_trading, sub_tag, sub_value)
                             brief.hour_trading = hour_trading
                         else:
-                            tag = BRIEF_FIELD_MAPPINGS[key] if key in BRIEF_FIELD_MAPPINGS else key
-                            if hasattr(brief, tag):
+                            tag = BRIEF_FIELDS.get(key)
+                            if tag is not None:
                                 setattr(brief, tag, value)
                     self.briefs.append(brief)
@@ -4,18 +4,20 @@ Created on 2018/10/31
 
 @author: gaoan
 """
-import json
 import six
 import pandas as pd
 from tigeropen.common.consts import TradingSession
+from tigeropen.common.util.field_utils import get_field_mapping
 from tigeropen.common.util.string_utils import get_string
 from tigeropen.quote.domain.quote_brief import HourTrading
 from tigeropen.common.response import TigerResponse
+from tigeropen.common.util.json_utils import decode_data
 
 COLUMNS = ['time', 'price', 'avg_price', 'pre_close', 'volume']
 TIMELINE_FIELD_MAPPINGS = {'avgPrice': 'avg_price'}
 BRIEF_FIELD_MAPPINGS = {'open': 'open_price', 'high': 'high_price', 'low': 'low_price', 'preClose': 'prev_close',
                         'latestPrice': 'latest_price'}
+HOUR_TRADING_FIELDS = get_field_mapping(HourTrading, BRIEF_FIELD_MAPPINGS)
 
 
 class QuoteHourTradingTimelineResponse(TigerResponse):
@@ -31,7 +33,7 @@ class QuoteHourTradingTimelineResponse(TigerResponse):
             self._is_success = response['is_success']
 
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             pre_close = data_json.get('preClose')
             if 'detail' in data_json:
                 detail = data_json['detail']
@@ -50,8 +52,8 @@ class QuoteHourTradingTimelineResponse(TigerResponse):
                         elif value == '盘后':
                             hour_trading.trading_session = TradingSession.AfterHours
                     else:
-                        tag = BRIEF_FIELD_MAPPINGS[key] if key in BRIEF_FIELD_MAPPINGS else key
-                        if hasattr(hour_trading, tag):
+                        tag = HOUR_TRADING_FIELDS.get(key)
+                        if tag is not None:
                             setattr(hour_trading, tag, value)
                 self.hour_trading = hour_trading
             if 'items' in data_json:
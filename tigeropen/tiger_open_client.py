@@ -6,14 +6,18 @@ Created on 2018/9/20
 """
 from __future__ import unicode_literals
 import datetime
-import uuid
+import itertools
+import logging
 import sys
 
 from tigeropen.common.consts import *
 from tigeropen.common.consts.params import *
 from tigeropen.common.util.common_utils import has_value
+from tigeropen.common.util import json_utils
 from tigeropen.common.util.signature_utils import *
 from tigeropen.common.util.web_utils import *
+from tigeropen.common.util.rate_limiter import get_rate_limiter
+from tigeropen.common.util.request_context import RequestContext, get_request_context
 from tigeropen.common.exceptions import *
 
 if not PYTHON_VERSION_3:
@@ -26,8 +30,23 @@ class TigerOpenClient(object):
     client_config：客户端配置，包含tiger_id、应用私钥、老虎公钥等
     logger：日志对象，客户端执行信息会通过此日志对象输出
     """
+    # 是否为交易客户端，SignVerifyPolicy.TRADE_ONLY 策略下只对交易客户端的响应验签
+    _is_trade_client = False
 
     def __init__(self, client_config, logger=None):
+        self._setup(client_config, logger)
+        if self.__config.use_connection_pool:
+            self.__connection_pool = HTTPConnectionPool(max_size=self.__config.connection_pool_size,
+                                                        idle_timeout=self.__config.connection_idle_timeout,
+                                                        max_requests=self.__config.connection_max_requests)
+        # 后台验签线程在第一次提交验签任务时才启动
+        self.__deferred_verifier = DeferredSignVerifier(callback=self._on_deferred_verify_failed)
+
+    """
+    内部方法，初始化同步和异步客户端共用的配置，连接池和后台验签器由各客户端自行创建
+    """
+
+    def _setup(self, client_config, logger):
         self.__config = client_config
         self.__logger = logger
         self.__headers = {
@@ -36,6 +55,33 @@ class TigerOpenClient(object):
             "Connection": "Keep-Alive",
             "User-Agent": 'openapi-python-sdk-' + OPEN_API_SDK_VERSION
         }
+        self.__connection_pool = None
+        self.__rate_limiter = get_rate_limiter()
+        if self.__config.rate_limits:
+            self.__rate_limiter.update_limits(self.__config.rate_limits)
+        if self.__config.global_rate_limit:
+            self.__rate_limiter.set_global_limit(*self.__config.global_rate_limit)
+        self.__sign_verify_counter = itertools.count()
+        self.__deferred_verifier = None
+
+    @property
+    def client_config(self):
+        return self.__config
+
+    @property
+    def headers(self):
+        return self.__headers
+
+    @property
+    def deferred_verifier(self):
+        """
+        DEFERRED 验签策略下的后台验签器，可通过 verified/failed/dropped/pending 查看验签统计
+        """
+        return self.__deferred_verifier
+
+    @property
+    def rate_limiter(self):
+        return self.__rate_limiter
 
     """
     内部方法，从params中抽取公共参数
@@ -66,8 +112,8 @@ class TigerOpenClient(object):
     """
     内部方法，通过请求request对象构造请求查询字符串和业务参数
     """
-    def __prepare_request(self, request):
-        THREAD_LOCAL.logger = self.__logger
+    def _prepare_request(self, request, context=None):
+        context = context or get_request_context(self.__logger)
         params = request.get_params()
         params[P_TIMESTAMP] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         common_params = self.__get_common_params(params)
@@ -78,12 +124,12 @@ class TigerOpenClient(object):
         try:
             sign = sign_with_rsa(self.__config.private_key, sign_content, self.__config.charset)
         except Exception as e:
-            raise RequestException('[' + THREAD_LOCAL.uuid + ']request sign failed. ' + str(e))
+            raise RequestException('[' + context.request_id + ']request sign failed. ' + str(e))
         all_params[P_SIGN] = sign
 
-        log_url = self.__config.server_url + '?' + sign_content + "&sign=" + sign
-        if THREAD_LOCAL.logger:
-            THREAD_LOCAL.logger.info('[' + THREAD_LOCAL.uuid + ']request:' + log_url)
+        if context.is_enabled_for(logging.INFO):
+            log_url = self.__config.server_url + '?' + sign_content + "&sign=" + sign
+            context.log_body(logging.INFO, 'request', log_url, self.__config.log_request_limit)
 
         return all_params
 
@@ -91,40 +137,98 @@ class TigerOpenClient(object):
     内部方法，解析请求返回结果并做验签
     """
 
-    def __parse_response(self, response_str, timestamp=None):
+    def _parse_response(self, response_str, timestamp=None, context=None):
+        context = context or get_request_context(self.__logger)
+        response_str, response_content = self._load_response(response_str, context)
+        sign = self._get_response_sign(response_content, timestamp)
+        if sign is None:
+            return response_content
+
+        policy = self.__config.sign_verify_policy
+        if policy == SignVerifyPolicy.DEFERRED:
+            self.__deferred_verifier.submit(self.__config.tiger_public_key, timestamp.encode('utf-8'),
+                                            sign.encode('utf-8'), response_str, context.request_id)
+        elif self._should_verify(policy):
+            self._verify_sign(context, timestamp, sign, response_str)
+
+        return response_content
+
+    """
+    内部方法，解码并解析响应内容
+    """
+
+    def _load_response(self, response_str, context):
         if PYTHON_VERSION_3:
             response_str = response_str.decode(self.__config.charset)
-        if THREAD_LOCAL.logger:
-            THREAD_LOCAL.logger.info('[' + THREAD_LOCAL.uuid + ']response:' + response_str)
+        context.log_body(logging.INFO, 'response', response_str, self.__config.log_response_limit)
+        return response_str, json_utils.loads(response_str)
 
-        response_content = json.loads(response_str)
+    """
+    内部方法，返回需要验签的签名，未配置老虎公钥或响应没有签名时返回 None
+    """
 
+    def _get_response_sign(self, response_content, timestamp):
         if not self.__config.tiger_public_key or 'sign' not in response_content or not timestamp:
-            return response_content
+            return None
+        return response_content.get('sign')
+
+    """
+    内部方法，按验签策略判断当前响应是否需要同步验签
+    """
 
-        sign = response_content.get('sign')
+    def _should_verify(self, policy):
+        if policy == SignVerifyPolicy.ALWAYS:
+            return True
+        if policy == SignVerifyPolicy.TRADE_ONLY:
+            return self._is_trade_client
+        if policy == SignVerifyPolicy.SAMPLED:
+            return next(self.__sign_verify_counter) % max(self.__config.sign_verify_sample_rate or 1, 1) == 0
+        return False
 
+    def _verify_sign(self, context, timestamp, sign, response_str):
         try:
             verify_res = verify_with_rsa(self.__config.tiger_public_key, timestamp.encode('utf-8'),
                                          sign.encode('utf-8'))
         except Exception as e:
-            raise ResponseException('[' + THREAD_LOCAL.uuid + ']response sign verify failed. ' + str(e) + ' '
+            raise ResponseException('[' + context.request_id + ']response sign verify failed. ' + str(e) + ' '
                                     + response_str)
         if not verify_res:
-            raise ResponseException('[' + THREAD_LOCAL.uuid + ']response sign verify failed. ' + response_str)
+            raise ResponseException('[' + context.request_id + ']response sign verify failed. ' + response_str)
 
-        return response_content
+    def _on_deferred_verify_failed(self, exception):
+        if self.__logger:
+            self.__logger.error(exception)
+        if self.__config.sign_verify_callback:
+            self.__config.sign_verify_callback(exception)
+
+    """
+    内部方法，按接口频率限制等待或拒绝请求
+    """
+
+    def __acquire_rate_limit(self, request, context):
+        if not self.__rate_limiter.acquire(request.method, blocking=self.__config.rate_limit_blocking,
+                                           timeout=self.__config.rate_limit_timeout):
+            raise RateLimitException('[' + context.request_id + ']rate limit exceeded. method:' + request.method)
 
     """
     执行接口请求
     """
 
     def execute(self, request):
-        THREAD_LOCAL.uuid = str(uuid.uuid1())
+        context = RequestContext(request.method, self.__logger).activate()
+        self.__acquire_rate_limit(request, context)
         query_string = None
-        params = self.__prepare_request(request)
+        params = self._prepare_request(request, context)
 
         response = do_post(self.__config.server_url, query_string, self.__headers, params, self.__config.timeout,
-                           self.__config.charset)
+                           self.__config.charset, pool=self.__connection_pool)
+
+        return self._parse_response(response, params.get('timestamp'), context)
+
+    """
+    关闭连接池中的空闲连接
+    """
 
-        return self.__parse_response(response, params.get('timestamp'))
+    def close(self):
+        if self.__connection_pool:
+            self.__connection_pool.clear()
@@ -4,7 +4,7 @@ Created on 2018/9/20
 
 @author: gaoan
 """
-from tigeropen.common.consts import Language
+from tigeropen.common.consts import Language, SignVerifyPolicy
 
 
 class TigerOpenClientConfig(object):
@@ -44,6 +44,53 @@ class TigerOpenClientConfig(object):
         ## 以下为可选参数
         # 请求读取超时，单位秒，默认15s
         self._timeout = 15
+        # 是否复用 HTTP 长连接
+        self._use_connection_pool = True
+        # 每个主机最多保留的空闲连接数
+        self._connection_pool_size = 10
+        # 空闲连接的最长保留时间，单位秒
+        self._connection_idle_timeout = 60
+        # 单个连接最多发送的请求数，超过后重建连接
+        self._connection_max_requests = 1000
+        # 多股票行情接口每次请求的最大股票数量 {service_type: 数量}，超过后自动拆分为多次请求并发获取
+        # 默认不拆分，如 {BRIEF: 50, QUOTE_REAL_TIME: 50, KLINE: 50, TIMELINE: 50, QUOTE_STOCK_TRADE: 50}
+        self._symbol_chunk_sizes = dict()
+        # 拆分请求及启用K线缓存时的最大并发数
+        self._quote_max_workers = 4
+        # 批量下单、撤单时的最大并发数
+        self._trade_max_workers = 8
+        # 每个账户预先申请并保留的订单号数量，为 0 时不预取
+        self._order_id_pool_size = 0
+        # 接口限流配置 {service_type: (次数, 周期秒数)}，同一进程内的客户端共享
+        self._rate_limits = dict()
+        # 所有接口共享的总频率限制 (次数, 周期秒数)
+        self._global_rate_limit = None
+        # 超过频率限制时是否阻塞等待，否则抛出 RateLimitException
+        self._rate_limit_blocking = True
+        # 阻塞等待的最长时间，单位秒，None 表示一直等待
+        self._rate_limit_timeout = None
+        # K线本地缓存目录，为空时不启用缓存
+        self._bar_cache_dir = None
+        # K线缓存的最大字节数
+        self._bar_cache_max_size = 1024 * 1024 * 1024
+        # 距上次刷新不足该秒数时直接使用缓存，单位秒
+        self._bar_cache_refresh_interval = 0
+        # 股票列表、合约等参考数据的缓存有效期，单位秒，为 0 时不缓存
+        self._reference_cache_ttl = 0
+        # 参考数据缓存的持久化目录，为空时只缓存在内存中
+        self._reference_cache_dir = None
+        # 参考数据是否在每个市场每天的数据刷新时间之后过期
+        self._reference_cache_session_refresh = True
+        # 响应验签策略，见 SignVerifyPolicy
+        self._sign_verify_policy = SignVerifyPolicy.ALWAYS
+        # SAMPLED 策略下每多少个响应验签一次
+        self._sign_verify_sample_rate = 100
+        # DEFERRED 策略下验签失败时的回调，参数为 ResponseException
+        self._sign_verify_callback = None
+        # 请求日志的最大字符数，超过部分截断，为空时不截断
+        self._log_request_limit = 2048
+        # 响应日志的最大字符数，超过部分截断，为空时不截断
+        self._log_response_limit = 2048
     
     @property
     def tiger_id(self):
@@ -140,3 +187,187 @@ class TigerOpenClientConfig(object):
     @timeout.setter
     def timeout(self, value):
         self._timeout = value
+
+    @property
+    def use_connection_pool(self):
+        return self._use_connection_pool
+
+    @use_connection_pool.setter
+    def use_connection_pool(self, value):
+        self._use_connection_pool = value
+
+    @property
+    def connection_pool_size(self):
+        return self._connection_pool_size
+
+    @connection_pool_size.setter
+    def connection_pool_size(self, value):
+        self._connection_pool_size = value
+
+    @property
+    def connection_idle_timeout(self):
+        return self._connection_idle_timeout
+
+    @connection_idle_timeout.setter
+    def connection_idle_timeout(self, value):
+        self._connection_idle_timeout = value
+
+    @property
+    def connection_max_requests(self):
+        return self._connection_max_requests
+
+    @connection_max_requests.setter
+    def connection_max_requests(self, value):
+        self._connection_max_requests = value
+
+    @property
+    def symbol_chunk_sizes(self):
+        return self._symbol_chunk_sizes
+
+    @symbol_chunk_sizes.setter
+    def symbol_chunk_sizes(self, value):
+        self._symbol_chunk_sizes = value
+
+    @property
+    def quote_max_workers(self):
+        return self._quote_max_workers
+
+    @quote_max_workers.setter
+    def quote_max_workers(self, value):
+        self._quote_max_workers = value
+
+    @property
+    def trade_max_workers(self):
+        return self._trade_max_workers
+
+    @trade_max_workers.setter
+    def trade_max_workers(self, value):
+        self._trade_max_workers = value
+
+    @property
+    def order_id_pool_size(self):
+        return self._order_id_pool_size
+
+    @order_id_pool_size.setter
+    def order_id_pool_size(self, value):
+        self._order_id_pool_size = value
+
+    @property
+    def rate_limits(self):
+        return self._rate_limits
+
+    @rate_limits.setter
+    def rate_limits(self, value):
+        self._rate_limits = value
+
+    @property
+    def global_rate_limit(self):
+        return self._global_rate_limit
+
+    @global_rate_limit.setter
+    def global_rate_limit(self, value):
+        self._global_rate_limit = value
+
+    @property
+    def rate_limit_blocking(self):
+        return self._rate_limit_blocking
+
+    @rate_limit_blocking.setter
+    def rate_limit_blocking(self, value):
+        self._rate_limit_blocking = value
+
+    @property
+    def rate_limit_timeout(self):
+        return self._rate_limit_timeout
+
+    @rate_limit_timeout.setter
+    def rate_limit_timeout(self, value):
+        self._rate_limit_timeout = value
+
+    @property
+    def bar_cache_dir(self):
+        return self._bar_cache_dir
+
+    @bar_cache_dir.setter
+    def bar_cache_dir(self, value):
+        self._bar_cache_dir = value
+
+    @property
+    def bar_cache_max_size(self):
+        return self._bar_cache_max_size
+
+    @bar_cache_max_size.setter
+    def bar_cache_max_size(self, value):
+        self._bar_cache_max_size = value
+
+    @property
+    def bar_cache_refresh_interval(self):
+        return self._bar_cache_refresh_interval
+
+    @bar_cache_refresh_interval.setter
+    def bar_cache_refresh_interval(self, value):
+        self._bar_cache_refresh_interval = value
+
+    @property
+    def sign_verify_policy(self):
+        return self._sign_verify_policy
+
+    @sign_verify_policy.setter
+    def sign_verify_policy(self, value):
+        self._sign_verify_policy = SignVerifyPolicy(value)
+
+    @property
+    def sign_verify_sample_rate(self):
+        return self._sign_verify_sample_rate
+
+    @sign_verify_sample_rate.setter
+    def sign_verify_sample_rate(self, value):
+        self._sign_verify_sample_rate = value
+
+    @property
+    def sign_verify_callback(self):
+        return self._sign_verify_callback
+
+    @sign_verify_callback.setter
+    def sign_verify_callback(self, value):
+        self._sign_verify_callback = value
+
+    @property
+    def log_request_limit(self):
+        return self._log_request_limit
+
+    @log_request_limit.setter
+    def log_request_limit(self, value):
+        self._log_request_limit = value
+
+    @property
+    def log_response_limit(self):
+        return self._log_response_limit
+
+    @log_response_limit.setter
+    def log_response_limit(self, value):
+        self._log_response_limit = value
+
+    @property
+    def reference_cache_ttl(self):
+        return self._reference_cache_ttl
+
+    @reference_cache_ttl.setter
+    def reference_cache_ttl(self, value):
+        self._reference_cache_ttl = value
+
+    @property
+    def reference_cache_dir(self):
+        return self._reference_cache_dir
+
+    @reference_cache_dir.setter
+    def reference_cache_dir(self, value):
+        self._reference_cache_dir = value
+
+    @property
+    def reference_cache_session_refresh(self):
+        return self._reference_cache_session_refresh
+
+    @reference_cache_session_refresh.setter
+    def reference_cache_session_refresh(self, value):
+        self._reference_cache_session_refresh = value
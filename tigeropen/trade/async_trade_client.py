@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+基于 asyncio 的交易客户端，接口与 TradeClient 一致
+"""
+import asyncio
+import logging
+
+from tigeropen.async_tiger_open_client import AsyncTigerOpenClient
+from tigeropen.common.consts import SecurityType, Market, Currency
+from tigeropen.common.exceptions import ResponseException
+from tigeropen.trade.domain.order import Order
+from tigeropen.trade.request.builders import managed_accounts_request, contracts_request, contract_request, \
+    positions_request, assets_request, orders_request, open_orders_request, order_request, order_id_request, \
+    place_order_request, modify_order_request, cancel_order_request
+from tigeropen.trade.response.account_profile_response import ProfilesResponse
+from tigeropen.trade.response.assets_response import AssetsResponse
+from tigeropen.trade.response.contracts_response import ContractsResponse
+from tigeropen.trade.response.order_id_response import OrderIdResponse
+from tigeropen.trade.response.orders_response import OrdersResponse
+from tigeropen.trade.response.positions_response import PositionsResponse
+
+
+class AsyncTradeClient(AsyncTigerOpenClient):
+    """
+    TradeClient 的 asyncio 版本，接口与 TradeClient 一致，所有方法均为协程
+    """
+    _is_trade_client = True
+
+    def __init__(self, client_config, logger=None, transport=None):
+        if not logger:
+            logger = logging.getLogger('tiger_openapi')
+        super(AsyncTradeClient, self).__init__(client_config, logger=logger, transport=transport)
+        if client_config:
+            self._account = client_config.account
+            self._standard_account = client_config.standard_account
+            self._paper_account = client_config.paper_account
+            self._lang = client_config.language
+            self._max_workers = client_config.trade_max_workers
+        else:
+            self._account = None
+            self._standard_account = None
+            self._paper_account = None
+            self._max_workers = 1
+
+    async def get_managed_accounts(self, account=None):
+        request = managed_accounts_request(account if account else self._account)
+        response = await self._fetch_response(request, ProfilesResponse)
+        return response.profiles if response else None
+
+    async def get_contracts(self, symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        request = contracts_request(self._account, symbol, sec_type, currency, exchange)
+        response = await self._fetch_response(request, ContractsResponse)
+        return response.contracts if response else None
+
+    async def get_contract(self, contract_id):
+        request = contract_request(self._account, contract_id)
+        response = await self._fetch_response(request, ContractsResponse)
+        if response:
+            return response.contracts[0] if len(response.contracts) == 1 else None
+        return None
+
+    async def get_positions(self, account=None, sec_type=SecurityType.STK, currency=Currency.ALL, market=Market.ALL,
+                            symbol=None, sub_accounts=None):
+        request = positions_request(account if account else self._account, sec_type, currency, market, symbol,
+                                    sub_accounts)
+        response = await self._fetch_response(request, PositionsResponse)
+        return response.positions if response else None
+
+    async def get_assets(self, account=None, sub_accounts=None, segment=False, market_value=False):
+        request = assets_request(account if account else self._account, sub_accounts, segment, market_value)
+        response = await self._fetch_response(request, AssetsResponse)
+        return response.assets if response else None
+
+    async def get_orders(self, account=None, sec_type=None, market=Market.ALL, symbol=None, start_time=None,
+                         end_time=None, limit=100, is_brief=False):
+        request = orders_request(account if account else self._account, sec_type, market, symbol, start_time,
+                                 end_time, limit, is_brief)
+        response = await self._fetch_response(request, OrdersResponse)
+        return response.orders if response else None
+
+    async def get_open_orders(self, account=None, sec_type=None, market=Market.ALL, symbol=None, start_time=None,
+                              end_time=None):
+        request = open_orders_request(account if account else self._account, sec_type, market, symbol, start_time,
+                                      end_time)
+        response = await self._fetch_response(request, OrdersResponse)
+        return response.orders if response else None
+
+    async def get_order(self, account=None, id=None, order_id=None, is_brief=False):
+        request = order_request(account if account else self._account, id, order_id, is_brief)
+        response = await self._fetch_response(request, OrdersResponse)
+        if response:
+            return response.orders[0] if len(response.orders) == 1 else None
+        return None
+
+    async def create_order(self, account, contract, action, order_type, quantity, limit_price=None, aux_price=None,
+                           trail_stop_price=None, trailing_percent=None, percent_offset=None, time_in_force=None,
+                           outside_rth=None):
+        request = order_id_request(account if account else self._account)
+        response = await self._fetch_response(request, OrderIdResponse)
+        if response:
+            return Order(account, contract, action, order_type, quantity, limit_price=limit_price,
+                         aux_price=aux_price, trail_stop_price=trail_stop_price,
+                         trailing_percent=trailing_percent, percent_offset=percent_offset,
+                         time_in_force=time_in_force, outside_rth=outside_rth, order_id=response.order_id)
+        return None
+
+    async def place_order(self, order):
+        request = place_order_request(order)
+        response = await self._fetch_response(request, OrderIdResponse)
+        if response:
+            order.id = response.id
+            return response.order_id == order.order_id if order.order_id else True
+        return False
+
+    async def modify_order(self, order, quantity=None, limit_price=None, aux_price=None,
+                           trail_stop_price=None, trailing_percent=None, percent_offset=None,
+                           time_in_force=None, outside_rth=None):
+        request = modify_order_request(order, quantity, limit_price, aux_price, trail_stop_price, trailing_percent,
+                                       percent_offset, time_in_force, outside_rth)
+        response = await self._fetch_response(request, OrderIdResponse)
+        if response:
+            return response.order_id == order.order_id if order.order_id else response.id == order.id
+        return False
+
+    async def cancel_order(self, account=None, id=None, order_id=None):
+        request = cancel_order_request(account if account else self._account, id, order_id)
+        response = await self._fetch_response(request, OrderIdResponse)
+        if response:
+            return response.order_id == order_id if order_id else response.id == id
+        return False
+
+    async def place_orders(self, orders):
+        """
+        批量下单，结果与 orders 顺序一致，成功为订单的全局 id，失败为对应的异常对象
+        """
+        async def place(order):
+            if not await self.place_order(order):
+                raise ResponseException('place order failed. order_id:' + str(order.order_id))
+            return order.id
+
+        return await self._dispatch(place, orders)
+
+    async def cancel_orders(self, ids, account=None):
+        """
+        批量撤单，结果与 ids 顺序一致，成功为订单的全局 id，失败为对应的异常对象
+        """
+        async def cancel(id):
+            if not await self.cancel_order(account=account, id=id):
+                raise ResponseException('cancel order failed. id:' + str(id))
+            return id
+
+        return await self._dispatch(cancel, ids)
+
+    async def _dispatch(self, func, items):
+        semaphore = asyncio.Semaphore(max(self._max_workers or 1, 1))
+
+        async def call(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*[call(item) for item in items], return_exceptions=True)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+本地合约索引，按合约字段、contract_id 和期权标识查找合约
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from tigeropen.common.consts import SecurityType, Currency
+from tigeropen.common.util.contract_utils import extract_option_info, get_option_identifier
+
+
+def _value(value):
+    return getattr(value, 'value', value)
+
+
+def option_identifier(contract):
+    """
+    期权合约的唯一标识，非期权或信息不全时返回 None
+    """
+    if _value(contract.sec_type) != 'OPT' or not (contract.symbol and contract.expiry and contract.put_call
+                                                  and contract.strike is not None):
+        return None
+    expiry = str(contract.expiry).replace('-', '')
+    return get_option_identifier(contract.symbol, expiry, contract.put_call, float(contract.strike))
+
+
+def normalize_option_identifier(identifier):
+    symbol, expiry, put_call, strike = extract_option_info(identifier)
+    if symbol is None:
+        return identifier
+    return get_option_identifier(symbol, expiry.replace('-', ''), put_call, strike)
+
+
+class ContractIndex(object):
+    """
+    本地合约索引，按 (symbol, sec_type, currency, exchange)、contract_id 和期权标识查找合约，查询不需要请求服务端
+    可在启动时通过 prewarm 批量加载交易范围内的合约
+    trade_client：用于加载合约的 TradeClient
+    max_workers：批量加载时的最大并发数
+    """
+
+    def __init__(self, trade_client=None, max_workers=8):
+        self._trade_client = trade_client
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._by_key = dict()
+        self._by_id = dict()
+        self._by_option = dict()
+
+    @staticmethod
+    def make_key(symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        return symbol, _value(sec_type), _value(currency), exchange
+
+    def add(self, contract, key=None):
+        """
+        加入合约，key 为查询条件，默认按合约自身的属性索引
+        """
+        with self._lock:
+            self._add(contract, key)
+
+    def add_all(self, contracts, key=None):
+        """
+        加入合约，key 为查询条件；contracts 为空时不记录该查询，下次查询仍会请求服务端
+        """
+        if not contracts:
+            return
+        with self._lock:
+            if key is not None:
+                self._by_key[key] = list(contracts)
+            for contract in contracts:
+                self._add(contract)
+
+    def get_contracts(self, symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        """
+        本地查找合约，没有加载过时返回 None
+        """
+        contracts = self._by_key.get(self.make_key(symbol, sec_type, currency, exchange))
+        return list(contracts) if contracts is not None else None
+
+    def get_contract(self, symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        contracts = self._by_key.get(self.make_key(symbol, sec_type, currency, exchange))
+        return contracts[0] if contracts else None
+
+    def get_by_id(self, contract_id):
+        return self._by_id.get(contract_id)
+
+    def get_option(self, identifier):
+        """
+        按期权标识查找，如 'AAPL  190118C00150000'
+        """
+        return self._by_option.get(normalize_option_identifier(identifier))
+
+    def resolve(self, symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        """
+        优先本地查找，没有时通过 TradeClient.get_contracts 加载并加入索引
+        """
+        contract = self.get_contract(symbol, sec_type, currency, exchange)
+        if contract is None and self._trade_client is not None:
+            contracts = self.load([(symbol, sec_type, currency, exchange)])[0]
+            if isinstance(contracts, list) and contracts:
+                contract = contracts[0]
+        return contract
+
+    def load(self, queries):
+        """
+        批量并发加载合约
+        :param queries: 股票代码，或 (symbol, sec_type, currency, exchange) 元组的列表，元组可只包含前几项
+        :return: 与 queries 顺序一致的结果列表，成功为合约列表，失败为对应的异常对象
+        """
+        keys = [self.make_key(*query) if isinstance(query, (tuple, list)) else self.make_key(query)
+                for query in queries]
+
+        def fetch(key):
+            symbol, sec_type, currency, exchange = key
+            try:
+                contracts = self._trade_client.get_contracts(
+                    symbol, sec_type=SecurityType(sec_type) if sec_type else None,
+                    currency=Currency(currency) if currency else None, exchange=exchange)
+            except Exception as e:
+                return e
+            self.add_all(contracts, key)
+            return contracts
+
+        if self.max_workers and self.max_workers > 1 and len(keys) > 1:
+            executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(keys)))
+            try:
+                return list(executor.map(fetch, keys))
+            finally:
+                executor.shutdown(wait=False)
+        return [fetch(key) for key in keys]
+
+    def prewarm(self, universe, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        """
+        启动时加载交易范围内还没有索引的合约
+        :param universe: 股票代码或 (symbol, sec_type, currency, exchange) 元组的列表
+        :return: 加载失败的查询及异常 [(query, exception)]
+        """
+        queries = []
+        for item in universe:
+            query = tuple(item) if isinstance(item, (tuple, list)) else (item, sec_type, currency, exchange)
+            if self.make_key(*query) not in self._by_key:
+                queries.append(query)
+        return [(query, result) for query, result in zip(queries, self.load(queries))
+                if isinstance(result, Exception)]
+
+    def invalidate(self, symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        """
+        移除查询条件对应的合约(如合约到期或变更后)，下次查询时重新从服务端加载
+        """
+        with self._lock:
+            contracts = self._by_key.pop(self.make_key(symbol, sec_type, currency, exchange), None)
+            for contract in contracts or []:
+                own_key = self.make_key(contract.symbol, contract.sec_type, contract.currency, contract.exchange)
+                own_contracts = self._by_key.get(own_key)
+                if own_contracts is not None and contract in own_contracts:
+                    own_contracts.remove(contract)
+                    if not own_contracts:
+                        del self._by_key[own_key]
+                if contract.contract_id is not None and self._by_id.get(contract.contract_id) is contract:
+                    del self._by_id[contract.contract_id]
+                identifier = option_identifier(contract)
+                if identifier and self._by_option.get(identifier) is contract:
+                    del self._by_option[identifier]
+
+    def clear(self):
+        with self._lock:
+            self._by_key.clear()
+            self._by_id.clear()
+            self._by_option.clear()
+
+    def _add(self, contract, key=None):
+        if key is None:
+            key = self.make_key(contract.symbol, contract.sec_type, contract.currency, contract.exchange)
+        contracts = self._by_key.setdefault(key, [])
+        if contract not in contracts:
+            contracts.append(contract)
+        if contract.contract_id is not None:
+            self._by_id[contract.contract_id] = contract
+        identifier = option_identifier(contract)
+        if identifier:
+            self._by_option[identifier] = contract
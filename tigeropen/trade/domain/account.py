@@ -15,6 +15,11 @@ class Account(object):
     If connected to a broker, one can update these values with the trading
     account values as reported by the broker.
     """
+    __slots__ = ["settled_cash", "accrued_interest", "accrued_cash", "accrued_dividend", "buying_power",
+                 "equity_with_loan", "gross_position_value", "regt_equity", "regt_margin", "initial_margin_requirement",
+                 "maintenance_margin_requirement", "available_funds", "excess_liquidity", "cushion",
+                 "day_trades_remaining", "leverage", "net_leverage", "net_liquidation", "cash", "sma", "currency",
+                 "timestamp"]
 
     def __init__(self):
         self.settled_cash = float('inf')
@@ -40,11 +45,20 @@ class Account(object):
         self.currency = None
         self.timestamp = None
 
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def __repr__(self):
-        return "Account({0})".format(self.__dict__)
+        return "Account({0})".format(self.to_dict())
 
 
 class MarketValue(object):
+    __slots__ = ["currency", "net_liquidation", "cash_balance", "total_cash_balance", "forex_cash_balance",
+                 "net_interest", "stock_market_value", "option_market_value", "future_option_market_value",
+                 "mutual_fund_market_value", "money_market_fund_value", "corporate_bond_value", "treasury_bond_value",
+                 "treasury_bill_value", "warrant_value", "future_pnl", "unrealized_pnl", "realized_pnl",
+                 "exchange_rate", "cash_cum_qty", "net_dividend", "timestamp"]
+
     def __init__(self):
         self.currency = None
         self.net_liquidation = float('inf')
@@ -69,11 +83,16 @@ class MarketValue(object):
         self.net_dividend = float('inf')
         self.timestamp = None
 
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def __repr__(self):
-        return "MarketValue({0})".format(self.__dict__)
+        return "MarketValue({0})".format(self.to_dict())
 
 
 class PortfolioAccount(object):
+    __slots__ = ["_account", "_summary", "_segments", "_market_values"]
+
     def __init__(self, account):
         self._account = account
         self._summary = Account()
@@ -114,5 +133,13 @@ class PortfolioAccount(object):
     def market_values(self):
         return self._market_values
 
+    def to_dict(self):
+        return {
+            'account': self._account,
+            'summary': self._summary,
+            'segments': self._segments,
+            'market_values': self._market_values
+        }
+
     def __repr__(self):
-        return "PortfolioAccount({0})".format(self.__dict__)
+        return "PortfolioAccount({0})".format({name: getattr(self, name) for name in self.__slots__})
@@ -7,6 +7,9 @@ Created on 2018/9/20
 
 
 class Contract(object):
+    __slots__ = ["contract_id", "symbol", "currency", "sec_type", "exchange", "origin_symbol", "local_symbol", "expiry",
+                 "strike", "put_call", "multiplier"]
+
     def __init__(self, symbol, currency, contract_id=None, sec_type=None, exchange=None, origin_symbol=None,
                  local_symbol=None, expiry=None, strike=None, put_call=None, multiplier=None):
         self.contract_id = contract_id
@@ -21,6 +24,9 @@ class Contract(object):
         self.put_call = put_call
         self.multiplier = multiplier
 
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
     def __repr__(self):
         if self.symbol:
             if self.origin_symbol is not None:
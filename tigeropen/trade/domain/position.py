@@ -7,6 +7,9 @@ Created on 2018/9/20
 
 
 class Position(object):
+    __slots__ = ["account", "contract", "quantity", "average_cost", "market_price", "market_value", "realized_pnl",
+                 "unrealized_pnl"]
+
     def __init__(self, account, contract, quantity=0, average_cost=None, market_price=None, market_value=None,
                  realized_pnl=None, unrealized_pnl=None):
         self.account = account
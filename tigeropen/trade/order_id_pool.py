@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+订单号预取池
+"""
+import threading
+from collections import defaultdict, deque
+
+
+class OrderIdPool(object):
+    """
+    订单号预取池，后台提前向 ORDER_NO 接口申请订单号，每个账户保留 size 个可用订单号
+    fetch：申请一个订单号的函数，参数为账户，返回订单号
+    size：每个账户预留的订单号数量
+    logger：日志对象，后台申请失败时输出错误
+    """
+
+    def __init__(self, fetch, size=5, logger=None):
+        self.size = size
+        self._fetch = fetch
+        self._logger = logger
+        self._ids = defaultdict(deque)
+        self._refilling = set()
+        self._lock = threading.Lock()
+
+    def get(self, account):
+        """
+        取出一个订单号并在后台补充，池中没有可用订单号时同步申请
+        """
+        with self._lock:
+            ids = self._ids[account]
+            order_id = ids.popleft() if ids else None
+        self.refill(account)
+        if order_id is None:
+            order_id = self._fetch(account)
+        return order_id
+
+    def available(self, account):
+        with self._lock:
+            return len(self._ids[account]) if account in self._ids else 0
+
+    def refill(self, account):
+        """
+        在后台将账户的可用订单号补充到 size 个，同一账户同时只有一个补充线程
+        """
+        with self._lock:
+            if account in self._refilling or len(self._ids[account]) >= self.size:
+                return
+            self._refilling.add(account)
+        thread = threading.Thread(target=self._refill, args=(account,), name='tiger-order-id-pool')
+        thread.daemon = True
+        thread.start()
+
+    def clear(self, account=None):
+        with self._lock:
+            if account is None:
+                self._ids.clear()
+            else:
+                self._ids.pop(account, None)
+
+    def _refill(self, account):
+        try:
+            while True:
+                with self._lock:
+                    if len(self._ids[account]) >= self.size:
+                        return
+                order_id = self._fetch(account)
+                if order_id is None:
+                    return
+                with self._lock:
+                    self._ids[account].append(order_id)
+        except Exception as e:
+            if self._logger:
+                self._logger.error(e, exc_info=True)
+        finally:
+            with self._lock:
+                self._refilling.discard(account)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+本地订单状态缓存，由订单推送更新
+"""
+import threading
+from collections import defaultdict
+
+from tigeropen.trade.domain.order import Order, ORDER_STATUS
+from tigeropen.trade.response import CONTRACT_FIELDS
+from tigeropen.trade.response.orders_response import OrdersResponse
+
+ACTIVE_STATUSES = {ORDER_STATUS.PENDING_NEW, ORDER_STATUS.NEW, ORDER_STATUS.PARTIALLY_FILLED, ORDER_STATUS.HELD,
+                   ORDER_STATUS.PENDING_CANCEL}
+
+# 推送字段名与 Contract 属性名不一致的字段
+CONTRACT_ATTRIBUTES = {'right': 'put_call'}
+
+
+def _is_active(order):
+    try:
+        return order.active
+    except TypeError:
+        # 数量或成交数量未知时按订单状态判断
+        return order._status in ACTIVE_STATUSES
+
+
+def _order_key(order):
+    return order.id if order.id is not None else (order.account, order.order_id)
+
+
+class OrderStore(object):
+    """
+    本地订单状态，先通过 TradeClient.get_open_orders 加载未完成订单，之后由 PushClient 的订单推送增量更新
+    订单按 id、(account, order_id)、账户和股票代码索引，查询不再需要请求服务端
+    trade_client：用于加载订单的 TradeClient
+    """
+
+    def __init__(self, trade_client=None):
+        self._trade_client = trade_client
+        self._lock = threading.RLock()
+        self._orders = dict()
+        self._by_order_id = dict()
+        self._by_account = defaultdict(dict)
+        self._by_symbol = defaultdict(dict)
+        self._open_by_account = defaultdict(dict)
+        self._open_by_symbol = defaultdict(dict)
+
+    def load(self, account=None, sec_type=None, market=None, symbol=None):
+        """
+        通过 get_open_orders 加载当前未完成订单
+        """
+        kwargs = dict(account=account, sec_type=sec_type, symbol=symbol)
+        if market is not None:
+            kwargs['market'] = market
+        orders = self._trade_client.get_open_orders(**kwargs)
+        for order in orders or []:
+            self.add(order)
+        return orders
+
+    def attach(self, push_client):
+        """
+        接收 PushClient 的订单推送，已设置的 order_changed 回调仍会被调用
+        """
+        callback = push_client.order_changed
+
+        def order_changed(account, items):
+            self.on_order_changed(account, items)
+            if callback:
+                callback(account, items)
+
+        push_client.order_changed = order_changed
+
+    def add(self, order):
+        with self._lock:
+            key = _order_key(order)
+            existing = self._orders.get(key)
+            if existing is not None and existing is not order:
+                self._unindex(key, existing)
+            self._index(key, order)
+
+    def remove(self, id=None, order_id=None, account=None):
+        with self._lock:
+            order = self.get(id=id, order_id=order_id, account=account)
+            if order is not None:
+                self._unindex(_order_key(order), order)
+            return order
+
+    def clear(self):
+        with self._lock:
+            self._orders.clear()
+            self._by_order_id.clear()
+            self._by_account.clear()
+            self._by_symbol.clear()
+            self._open_by_account.clear()
+            self._open_by_symbol.clear()
+
+    def on_order_changed(self, account, items):
+        """
+        处理订单推送，items 为 PushClient 解析后的 [(字段, 值)]
+        """
+        fields = dict(items)
+        fields['account'] = account
+        with self._lock:
+            order = self.get(id=fields.get('id'), order_id=fields.get('order_id'), account=account)
+            if order is None:
+                self.add(OrdersResponse.parse_order(fields))
+                return
+            key = _order_key(order)
+            self._unindex(key, order)
+            self._apply(order, fields)
+            self._index(_order_key(order), order)
+
+    def get(self, id=None, order_id=None, account=None):
+        with self._lock:
+            if id is not None and id in self._orders:
+                return self._orders[id]
+            if order_id is not None:
+                return self._by_order_id.get((account, order_id))
+            return None
+
+    def get_orders(self, account=None, symbol=None):
+        """
+        本地保存的订单，包括已完成的订单
+        """
+        return self._select(self._by_account, self._by_symbol, account, symbol, self._orders)
+
+    def get_open_orders(self, account=None, symbol=None):
+        """
+        本地保存的未完成订单
+        """
+        return self._select(self._open_by_account, self._open_by_symbol, account, symbol, None)
+
+    def _select(self, by_account, by_symbol, account, symbol, all_orders):
+        with self._lock:
+            if symbol is not None:
+                orders = by_symbol.get(symbol)
+                if not orders:
+                    return []
+                if account is not None:
+                    return [order for order in orders.values() if order.account == account]
+                return list(orders.values())
+            if account is not None:
+                return list(by_account.get(account, {}).values())
+            if all_orders is None:
+                return [order for orders in by_account.values() for order in orders.values()]
+            return list(all_orders.values())
+
+    def _index(self, key, order):
+        symbol = order.contract.symbol if order.contract is not None else None
+        self._orders[key] = order
+        if order.order_id is not None:
+            self._by_order_id[(order.account, order.order_id)] = order
+        self._by_account[order.account][key] = order
+        self._by_symbol[symbol][key] = order
+        if _is_active(order):
+            self._open_by_account[order.account][key] = order
+            self._open_by_symbol[symbol][key] = order
+
+    def _unindex(self, key, order):
+        symbol = order.contract.symbol if order.contract is not None else None
+        self._orders.pop(key, None)
+        if order.order_id is not None:
+            self._by_order_id.pop((order.account, order.order_id), None)
+        for index, index_key in ((self._by_account, order.account), (self._by_symbol, symbol),
+                                 (self._open_by_account, order.account), (self._open_by_symbol, symbol)):
+            orders = index.get(index_key)
+            if orders is not None:
+                orders.pop(key, None)
+                if not orders:
+                    del index[index_key]
+
+    @staticmethod
+    def _apply(order, fields):
+        parsed = OrdersResponse.parse_order(fields)
+        for tag, value in fields.items():
+            if value is None:
+                continue
+            if tag == 'status':
+                order.status = parsed.status
+            elif tag in CONTRACT_FIELDS:
+                attribute = CONTRACT_ATTRIBUTES.get(tag, tag)
+                if order.contract is not None and hasattr(order.contract, attribute):
+                    setattr(order.contract, attribute, value)
+            elif tag in Order.__slots__:
+                setattr(order, tag, getattr(parsed, tag))
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+由快照和推送维护的本地持仓和资产镜像
+"""
+import logging
+import threading
+from collections import defaultdict
+
+from tigeropen.trade.domain.account import PortfolioAccount
+from tigeropen.trade.response import CONTRACT_FIELDS
+from tigeropen.trade.response.positions_response import PositionsResponse
+
+# 推送字段名与 Contract 属性名不一致的字段
+CONTRACT_ATTRIBUTES = {'right': 'put_call'}
+# 用于在没有 contract_id 时区分同一股票代码下不同合约的字段
+CONTRACT_MATCH_FIELDS = ('sec_type', 'expiry', 'strike', 'right')
+
+
+def _position_key(position):
+    contract = position.contract
+    return position.account, contract.symbol, contract.sec_type, contract.expiry, contract.strike, contract.put_call
+
+
+class PortfolioMirror(object):
+    """
+    本地持仓和资产镜像，先通过 get_positions/get_assets 加载快照，之后由 PushClient 的持仓和资产推送增量更新
+    持仓按账户和股票代码索引，可定期与服务端对账修正偏差
+    trade_client：用于加载快照和对账的 TradeClient
+    logger：日志对象，输出无法匹配的持仓推送和后台对账的错误
+    position_kwargs：加载持仓时传给 get_positions 的其他参数，如 sec_type、market
+    """
+
+    def __init__(self, trade_client=None, logger=None, **position_kwargs):
+        if not logger:
+            logger = logging.getLogger('tiger_openapi')
+        self._trade_client = trade_client
+        self._logger = logger
+        self._position_kwargs = position_kwargs
+        self._lock = threading.RLock()
+        self._accounts = set()
+        self._assets = dict()
+        self._positions = defaultdict(dict)
+        self._by_symbol = defaultdict(dict)
+        self._by_contract_id = dict()
+        self._reconcile_stop = None
+
+    def load(self, account=None):
+        """
+        加载账户的持仓和资产快照，替换本地已有的数据
+        """
+        positions = self._trade_client.get_positions(account=account, **self._position_kwargs) or []
+        assets = self._trade_client.get_assets(account=account) or []
+        with self._lock:
+            self._accounts.add(account)
+            for asset in assets:
+                self._assets[asset.account] = asset
+            for position_account in self._snapshot_accounts(account, positions):
+                self._clear_positions(position_account)
+            for position in positions:
+                self._add_position(position)
+        return positions, assets
+
+    def attach(self, push_client):
+        """
+        接收 PushClient 的持仓和资产推送，已设置的 position_changed/asset_changed 回调仍会被调用
+        """
+        position_callback = push_client.position_changed
+        asset_callback = push_client.asset_changed
+
+        def position_changed(account, items):
+            self.on_position_changed(account, items)
+            if position_callback:
+                position_callback(account, items)
+
+        def asset_changed(account, items):
+            self.on_asset_changed(account, items)
+            if asset_callback:
+                asset_callback(account, items)
+
+        push_client.position_changed = position_changed
+        push_client.asset_changed = asset_changed
+
+    def on_position_changed(self, account, items):
+        """
+        处理持仓推送，items 为 PushClient 解析后的 [(字段, 值)]，数量为 0 时删除持仓
+        推送匹配到多个本地持仓时无法确定是哪一个，不做修改，留待对账修正
+        """
+        fields = dict(items)
+        fields['account'] = account
+        with self._lock:
+            candidates = self._match_positions(account, fields)
+            if len(candidates) > 1:
+                self._logger.warning('position push of %s %s matches %d local positions, left for reconcile: %s',
+                                     account, fields.get('symbol'), len(candidates), fields)
+                return
+            if candidates:
+                position = candidates[0]
+                self._remove_position(position)
+                self._apply(position, fields)
+            else:
+                position = PositionsResponse.parse_position(fields)
+            if position.quantity:
+                self._add_position(position)
+
+    def on_asset_changed(self, account, items):
+        """
+        处理资产推送，更新账户资产汇总
+        """
+        with self._lock:
+            asset = self._assets.get(account)
+            if asset is None:
+                asset = PortfolioAccount(account)
+                self._assets[account] = asset
+            summary = asset.summary
+            for tag, value in items:
+                if value is not None and hasattr(summary, tag):
+                    setattr(summary, tag, value)
+
+    def get_asset(self, account):
+        with self._lock:
+            return self._assets.get(account)
+
+    def get_positions(self, account=None, symbol=None):
+        with self._lock:
+            if symbol is not None:
+                positions = self._by_symbol.get(symbol)
+                if not positions:
+                    return []
+                if account is not None:
+                    return [position for position in positions.values() if position.account == account]
+                return list(positions.values())
+            if account is not None:
+                return list(self._positions.get(account, {}).values())
+            return [position for positions in self._positions.values() for position in positions.values()]
+
+    def get_position(self, account, symbol):
+        """
+        账户在某个股票代码下的持仓，同一代码有多个合约(如期权)时返回第一个
+        """
+        positions = self.get_positions(account=account, symbol=symbol)
+        return positions[0] if positions else None
+
+    def get_quantity(self, account, symbol):
+        return sum(position.quantity or 0 for position in self.get_positions(account=account, symbol=symbol))
+
+    def reconcile(self):
+        """
+        重新请求已加载账户的持仓和资产并替换本地数据
+        :return: 本地与服务端数量不一致的持仓 [(account, symbol, 本地数量, 服务端数量)]
+        """
+        drifts = []
+        with self._lock:
+            accounts = list(self._accounts)
+        for account in accounts:
+            positions = self._trade_client.get_positions(account=account, **self._position_kwargs) or []
+            assets = self._trade_client.get_assets(account=account) or []
+            with self._lock:
+                local = dict()
+                for position_account in self._snapshot_accounts(account, positions):
+                    for key, position in self._positions.get(position_account, {}).items():
+                        local[key] = position.quantity or 0
+                    self._clear_positions(position_account)
+                for position in positions:
+                    key = _position_key(position)
+                    local_quantity = local.pop(key, 0)
+                    if local_quantity != (position.quantity or 0):
+                        drifts.append((position.account, position.contract.symbol, local_quantity,
+                                       position.quantity))
+                    self._add_position(position)
+                for key, quantity in local.items():
+                    if quantity:
+                        drifts.append((key[0], key[1], quantity, 0))
+                for asset in assets:
+                    self._assets[asset.account] = asset
+        return drifts
+
+    def start_reconcile(self, interval):
+        """
+        在后台线程中每隔 interval 秒对账一次
+        """
+        self.stop_reconcile()
+        stop = threading.Event()
+        self._reconcile_stop = stop
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.reconcile()
+                except Exception as e:
+                    self._logger.error(e, exc_info=True)
+
+        thread = threading.Thread(target=run, name='tiger-portfolio-reconcile')
+        thread.daemon = True
+        thread.start()
+
+    def stop_reconcile(self):
+        if self._reconcile_stop is not None:
+            self._reconcile_stop.set()
+            self._reconcile_stop = None
+
+    @staticmethod
+    def _snapshot_accounts(account, positions):
+        """
+        快照覆盖的账户，account 为空时表示配置中的默认账户，以持仓中的账户为准
+        """
+        accounts = set([position.account for position in positions])
+        if account is not None:
+            accounts.add(account)
+        return accounts
+
+    def _match_positions(self, account, fields):
+        """
+        与推送字段匹配的本地持仓，有 contract_id 时按合约匹配，否则按股票代码和推送中的合约字段筛选
+        """
+        contract_id = fields.get('contract_id')
+        if contract_id is not None and (account, contract_id) in self._by_contract_id:
+            return [self._by_contract_id[(account, contract_id)]]
+        candidates = [position for position in self._by_symbol.get(fields.get('symbol'), {}).values()
+                      if position.account == account]
+        for field in CONTRACT_MATCH_FIELDS:
+            if fields.get(field) is not None:
+                attribute = CONTRACT_ATTRIBUTES.get(field, field)
+                candidates = [position for position in candidates
+                              if getattr(position.contract, attribute) in (None, fields[field])]
+        return candidates
+
+    def _add_position(self, position):
+        key = _position_key(position)
+        self._positions[position.account][key] = position
+        self._by_symbol[position.contract.symbol][key] = position
+        if position.contract.contract_id is not None:
+            self._by_contract_id[(position.account, position.contract.contract_id)] = position
+
+    def _remove_position(self, position):
+        key = _position_key(position)
+        for index, index_key in ((self._positions, position.account), (self._by_symbol, position.contract.symbol)):
+            positions = index.get(index_key)
+            if positions is not None:
+                positions.pop(key, None)
+                if not positions:
+                    del index[index_key]
+        if position.contract.contract_id is not None:
+            self._by_contract_id.pop((position.account, position.contract.contract_id), None)
+
+    def _clear_positions(self, account):
+        for position in list(self._positions.get(account, {}).values()):
+            self._remove_position(position)
+
+    @staticmethod
+    def _apply(position, fields):
+        for tag, value in fields.items():
+            if value is None:
+                continue
+            if tag in CONTRACT_FIELDS:
+                attribute = CONTRACT_ATTRIBUTES.get(tag, tag)
+                if hasattr(position.contract, attribute):
+                    setattr(position.contract, attribute, value)
+            elif hasattr(position, tag):
+                setattr(position, tag, value)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+交易接口的请求构造，TradeClient 和 AsyncTradeClient 共用
+account 参数为已确定的账户，由客户端传入(未指定时使用配置中的账户)
+"""
+from tigeropen.common.consts.service_types import CONTRACT, ACCOUNTS, POSITIONS, ASSETS, ORDERS, ORDER_NO, \
+    CANCEL_ORDER, MODIFY_ORDER, PLACE_ORDER, ACTIVE_ORDERS
+from tigeropen.quote.request import OpenApiRequest
+from tigeropen.trade.request.model import ContractParams, AccountsParams, AssetParams, PositionParams, OrdersParams, \
+    OrderParams, PlaceModifyOrderParams, CancelOrderParams
+
+
+def managed_accounts_request(account):
+    params = AccountsParams()
+    params.account = account
+    return OpenApiRequest(ACCOUNTS, biz_model=params)
+
+
+def contracts_request(account, symbol, sec_type, currency, exchange):
+    params = ContractParams()
+    params.account = account
+    params.symbol = symbol
+    if sec_type:
+        params.sec_type = sec_type.value
+    if currency:
+        params.currency = currency.value
+    params.exchange = exchange
+    return OpenApiRequest(CONTRACT, biz_model=params)
+
+
+def contract_request(account, contract_id):
+    params = ContractParams()
+    params.account = account
+    params.contract_id = contract_id
+    return OpenApiRequest(CONTRACT, biz_model=params)
+
+
+def positions_request(account, sec_type, currency, market, symbol, sub_accounts):
+    params = PositionParams()
+    params.account = account
+    if sec_type:
+        params.sec_type = sec_type.value
+    params.sub_accounts = sub_accounts
+    if currency:
+        params.currency = currency.value
+    if market:
+        params.market = market.value
+    params.symbol = symbol
+    return OpenApiRequest(POSITIONS, biz_model=params)
+
+
+def assets_request(account, sub_accounts, segment, market_value):
+    params = AssetParams()
+    params.account = account
+    params.sub_accounts = sub_accounts
+    params.segment = segment
+    params.market_value = market_value
+    return OpenApiRequest(ASSETS, biz_model=params)
+
+
+def orders_request(account, sec_type, market, symbol, start_time, end_time, limit, is_brief):
+    params = OrdersParams()
+    params.account = account
+    if sec_type:
+        params.sec_type = sec_type.value
+    params.market = market.value
+    params.symbol = symbol
+    params.start_data = start_time
+    params.end_date = end_time
+    params.limit = limit
+    params.is_brief = is_brief
+    return OpenApiRequest(ORDERS, biz_model=params)
+
+
+def open_orders_request(account, sec_type, market, symbol, start_time, end_time):
+    params = OrdersParams()
+    params.account = account
+    if sec_type:
+        params.sec_type = sec_type.value
+    params.market = market.value
+    params.symbol = symbol
+    params.start_data = start_time
+    params.end_date = end_time
+    return OpenApiRequest(ACTIVE_ORDERS, biz_model=params)
+
+
+def order_request(account, id, order_id, is_brief):
+    params = OrderParams()
+    params.account = account
+    params.id = id
+    params.order_id = order_id
+    params.is_brief = is_brief
+    return OpenApiRequest(ORDERS, biz_model=params)
+
+
+def order_id_request(account):
+    params = AccountsParams()
+    params.account = account
+    return OpenApiRequest(ORDER_NO, biz_model=params)
+
+
+def place_order_request(order):
+    params = PlaceModifyOrderParams()
+    params.account = order.account
+    params.contract = order.contract
+    params.action = order.action
+    params.order_type = order.order_type
+    params.order_id = order.order_id
+    params.quantity = order.quantity
+    params.limit_price = order.limit_price
+    params.aux_price = order.aux_price
+    params.trail_stop_price = order.trail_stop_price
+    params.trailing_percent = order.trailing_percent
+    params.percent_offset = order.percent_offset
+    params.time_in_force = order.time_in_force
+    params.outside_rth = order.outside_rth
+    return OpenApiRequest(PLACE_ORDER, biz_model=params)
+
+
+def modify_order_request(order, quantity, limit_price, aux_price, trail_stop_price, trailing_percent,
+                         percent_offset, time_in_force, outside_rth):
+    """
+    未指定的参数沿用订单原来的值
+    """
+    params = PlaceModifyOrderParams()
+    params.account = order.account
+    params.order_id = order.order_id
+    params.id = order.id
+    params.contract = order.contract
+    params.action = order.action
+    params.order_type = order.order_type
+    params.quantity = quantity if quantity is not None else order.quantity
+    params.limit_price = limit_price if limit_price is not None else order.limit_price
+    params.aux_price = aux_price if aux_price is not None else order.aux_price
+    params.trail_stop_price = trail_stop_price if trail_stop_price is not None else order.trail_stop_price
+    params.trailing_percent = trailing_percent if trailing_percent is not None else order.trailing_percent
+    params.percent_offset = percent_offset if percent_offset is not None else order.percent_offset
+    params.time_in_force = time_in_force if time_in_force is not None else order.time_in_force
+    params.outside_rth = outside_rth if outside_rth is not None else order.outside_rth
+    return OpenApiRequest(MODIFY_ORDER, biz_model=params)
+
+
+def cancel_order_request(account, id, order_id):
+    params = CancelOrderParams()
+    params.account = account
+    params.order_id = order_id
+    params.id = id
+    return OpenApiRequest(CANCEL_ORDER, biz_model=params)
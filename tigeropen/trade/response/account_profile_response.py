@@ -4,8 +4,8 @@ Created on 2018/10/31
 
 @author: gaoan
 """
-import json
 from tigeropen.common.response import TigerResponse
+from tigeropen.common.util.json_utils import decode_data
 from tigeropen.common.util.string_utils import get_string
 from tigeropen.trade.domain.profile import AccountProfile
 
@@ -22,7 +22,7 @@ class ProfilesResponse(TigerResponse):
             self._is_success = response['is_success']
 
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             if 'items' in data_json:
                 for item in data_json['items']:
                     account, capability, status = None, None, None
@@ -4,10 +4,11 @@ Created on 2018/9/20
 
 @author: gaoan
 """
-import json
 from tigeropen.common.response import TigerResponse
-from tigeropen.trade.domain.account import PortfolioAccount
-from tigeropen.common.util.string_utils import camel_to_underline
+from tigeropen.common.util.json_utils import decode_data
+from tigeropen.common.util.field_utils import FieldMapping, get_field_mapping
+from tigeropen.trade.domain.account import PortfolioAccount, Account, MarketValue
+from tigeropen.common.util.key_utils import camel_to_underline
 
 ACCOUNT_FIELD_MAPPINGS = {'sMA': 'sma', 'updateTime': 'timestamp', 'realizedPnL': 'realized_pnl',
                           'unrealizedPnL': 'unrealized_pnl', 'regTMargin': 'regt_margin', 'regTEquity': 'regt_equity',
@@ -16,6 +17,11 @@ ACCOUNT_FIELD_MAPPINGS = {'sMA': 'sma', 'updateTime': 'timestamp', 'realizedPnL'
 
 MARKET_VALUE_FIELD_MAPPINGS = {'updateTime': 'timestamp'}
 
+ACCOUNT_FIELDS = get_field_mapping(Account, ACCOUNT_FIELD_MAPPINGS, camel_to_underline)
+MARKET_VALUE_FIELDS = get_field_mapping(MarketValue, ACCOUNT_FIELD_MAPPINGS, camel_to_underline)
+# 账户数据中需要单独解析的分类字段
+SECTION_FIELDS = FieldMapping(('market_values', 'segments'), normalize=camel_to_underline)
+
 
 class AssetsResponse(TigerResponse):
     def __init__(self):
@@ -29,7 +35,7 @@ class AssetsResponse(TigerResponse):
             self._is_success = response['is_success']
 
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             if 'items' in data_json:
                 for item in data_json['items']:
                     account = item['account']
@@ -39,10 +45,12 @@ class AssetsResponse(TigerResponse):
                     for key, value in item.items():
                         if value is None:
                             continue
-                        tag = ACCOUNT_FIELD_MAPPINGS[key] if key in ACCOUNT_FIELD_MAPPINGS else camel_to_underline(key)
-                        if hasattr(summary, tag):
+                        tag = ACCOUNT_FIELDS.get(key)
+                        if tag is not None:
                             setattr(summary, tag, value)
-                        elif 'market_values' == tag:
+                            continue
+                        tag = SECTION_FIELDS.get(key)
+                        if 'market_values' == tag:
                             if isinstance(value, dict):
                                 for sub_key, sub_value in value.items():
                                     currency = sub_key
@@ -73,24 +81,8 @@ class AssetsResponse(TigerResponse):
 
     @staticmethod
     def _parse_segment(segment, sub_value):
-        for segment_key, segment_value in sub_value.items():
-            if segment_value is None:
-                continue
-            if segment_key in ACCOUNT_FIELD_MAPPINGS:
-                sub_tag = ACCOUNT_FIELD_MAPPINGS[segment_key]
-            else:
-                sub_tag = camel_to_underline(segment_key)
-            if hasattr(segment, sub_tag):
-                setattr(segment, sub_tag, segment_value)
+        ACCOUNT_FIELDS.apply(segment, sub_value)
 
     @staticmethod
     def _parse_market_value(market_value, sub_value):
-        for mv_key, mv_value in sub_value.items():
-            if mv_value is None:
-                continue
-            if mv_key in ACCOUNT_FIELD_MAPPINGS:
-                sub_tag = ACCOUNT_FIELD_MAPPINGS[mv_key]
-            else:
-                sub_tag = camel_to_underline(mv_key)
-            if hasattr(market_value, sub_tag):
-                setattr(market_value, sub_tag, mv_value)
+        MARKET_VALUE_FIELDS.apply(market_value, sub_value)
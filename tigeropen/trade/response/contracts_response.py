@@ -4,9 +4,9 @@ Created on 2018/10/31
 
 @author: gaoan
 """
-import json
 import six
 from tigeropen.common.response import TigerResponse
+from tigeropen.common.util.json_utils import decode_data
 from tigeropen.common.util.string_utils import get_string
 from tigeropen.trade.domain.contract import Contract
 from tigeropen.trade.response import CONTRACT_FIELDS
@@ -27,7 +27,7 @@ class ContractsResponse(TigerResponse):
             self._is_success = response['is_success']
         
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             if 'items' in data_json:
                 for item in data_json['items']:
                     contract_fields = {}
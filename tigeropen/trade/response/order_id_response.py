@@ -4,8 +4,8 @@ Created on 2018/10/31
 
 @author: gaoan
 """
-import json
 from tigeropen.common.response import TigerResponse
+from tigeropen.common.util.json_utils import decode_data
 
 
 class OrderIdResponse(TigerResponse):
@@ -21,7 +21,7 @@ class OrderIdResponse(TigerResponse):
             self._is_success = response['is_success']
         
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             if 'code' in data_json and data_json['code'] != '0':
                 self.code = int(data_json['code'])
                 if 'message' in data_json:
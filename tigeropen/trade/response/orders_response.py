@@ -4,9 +4,10 @@ Created on 2018/10/31
 
 @author: gaoan
 """
-import json
 import six
 from tigeropen.common.response import TigerResponse
+from tigeropen.common.util.json_utils import decode_data
+from tigeropen.common.util.key_utils import KeyMapping
 from tigeropen.common.util.string_utils import get_string
 from tigeropen.trade.domain.contract import Contract
 from tigeropen.trade.domain.order import Order, ORDER_STATUS
@@ -22,6 +23,7 @@ ORDER_FIELD_MAPPINGS = {'parentId': 'parent_id', 'orderId': 'order_id', 'orderTy
                         'contractId': 'contract_id',
                         'trailStopPrice': 'trail_stop_price', 'trailingPercent': 'trailing_percent',
                         'percentOffset': 'percent_offset'}
+ORDER_KEYS = KeyMapping(ORDER_FIELD_MAPPINGS)
 
 
 class OrdersResponse(TigerResponse):
@@ -36,7 +38,7 @@ class OrdersResponse(TigerResponse):
             self._is_success = response['is_success']
 
         if self.data:
-            data_json = json.loads(self.data)
+            data_json = decode_data(self.data)
             if 'items' in data_json:
                 for item in data_json['items']:
                     order = OrdersResponse.parse_order(item)
@@ -56,7 +58,7 @@ class OrdersResponse(TigerResponse):
                 continue
             if isinstance(value, six.string_types):
                 value = get_string(value)
-            tag = ORDER_FIELD_MAPPINGS[key] if key in ORDER_FIELD_MAPPINGS else key
+            tag = ORDER_KEYS.get(key)
             if tag in CONTRACT_FIELDS:
                 contract_fields[tag] = value
             else:
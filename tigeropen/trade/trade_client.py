@@ -4,20 +4,24 @@ Created on 2018/9/20
 
 @author: gaoan
 """
+from concurrent.futures import ThreadPoolExecutor
+
 from tigeropen.common.consts import THREAD_LOCAL, SecurityType, Market, Currency
+from tigeropen.common.exceptions import ResponseException
+from tigeropen.common.reference_cache import create_reference_cache, CURRENCY_MARKETS
 from tigeropen.trade.domain.order import Order
+from tigeropen.trade.contract_index import ContractIndex
+from tigeropen.trade.order_id_pool import OrderIdPool
 from tigeropen.trade.response.account_profile_response import ProfilesResponse
 
 from tigeropen.trade.response.contracts_response import ContractsResponse
 from tigeropen.trade.response.order_id_response import OrderIdResponse
 from tigeropen.trade.response.orders_response import OrdersResponse
 from tigeropen.tiger_open_client import TigerOpenClient, ApiException
-from tigeropen.trade.request.model import ContractParams, AccountsParams, AssetParams, PositionParams, OrdersParams, \
-    OrderParams, PlaceModifyOrderParams, CancelOrderParams
-from tigeropen.quote.request import OpenApiRequest
+from tigeropen.trade.request.builders import managed_accounts_request, contracts_request, contract_request, \
+    positions_request, assets_request, orders_request, open_orders_request, order_request, order_id_request, \
+    place_order_request, modify_order_request, cancel_order_request
 from tigeropen.trade.response.assets_response import AssetsResponse
-from tigeropen.common.consts.service_types import CONTRACT, ACCOUNTS, POSITIONS, ASSETS, ORDERS, ORDER_NO, CANCEL_ORDER, \
-    MODIFY_ORDER, PLACE_ORDER, ACTIVE_ORDERS
 
 import logging
 
@@ -25,6 +29,8 @@ from tigeropen.trade.response.positions_response import PositionsResponse
 
 
 class TradeClient(TigerOpenClient):
+    _is_trade_client = True
+
     def __init__(self, client_config, logger=None):
         if not logger:
             logger = logging.getLogger('tiger_openapi')
@@ -34,15 +40,26 @@ class TradeClient(TigerOpenClient):
             self._standard_account = client_config.standard_account
             self._paper_account = client_config.paper_account
             self._lang = client_config.language
+            self._max_workers = client_config.trade_max_workers
+            self._order_id_pool = None
+            if client_config.order_id_pool_size:
+                self._order_id_pool = OrderIdPool(self.__get_order_id, size=client_config.order_id_pool_size,
+                                                  logger=logger)
         else:
             self._account = None
             self._standard_account = None
             self._paper_account = None
+            self._max_workers = 1
+            self._order_id_pool = None
+        # 线程池的工作线程在提交任务时才创建
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers) if self._max_workers and \
+            self._max_workers > 1 else None
+        self._reference_cache = create_reference_cache(client_config)
+        # 本地合约索引，通过 prewarm_contracts 加载后 get_contracts/get_contract 不再请求服务端
+        self.contract_index = ContractIndex(self, max_workers=self._max_workers)
 
     def get_managed_accounts(self, account=None):
-        params = AccountsParams()
-        params.account = account if account else self._account
-        request = OpenApiRequest(ACCOUNTS, biz_model=params)
+        request = managed_accounts_request(account if account else self._account)
         response_content = self.__fetch_data(request)
         if response_content:
             response = ProfilesResponse()
@@ -54,16 +71,19 @@ class TradeClient(TigerOpenClient):
         return None
 
     def get_contracts(self, symbol, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
-        params = ContractParams()
-        params.account = self._account
-        params.symbol = symbol
-        if sec_type:
-            params.sec_type = sec_type.value
-        if currency:
-            params.currency = currency.value
-        params.exchange = exchange
-
-        request = OpenApiRequest(CONTRACT, biz_model=params)
+        contracts = self.contract_index.get_contracts(symbol, sec_type, currency, exchange)
+        if contracts is not None:
+            return contracts
+        if self._reference_cache is not None:
+            key = ('contracts', self._account, symbol, sec_type.value if sec_type else None,
+                   currency.value if currency else None, exchange)
+            market = CURRENCY_MARKETS.get(currency.value) if currency else None
+            return self._reference_cache.get(key, lambda: self.__get_contracts(symbol, sec_type, currency, exchange),
+                                             market=market)
+        return self.__get_contracts(symbol, sec_type, currency, exchange)
+
+    def __get_contracts(self, symbol, sec_type, currency, exchange):
+        request = contracts_request(self._account, symbol, sec_type, currency, exchange)
         response_content = self.__fetch_data(request)
         if response_content:
             response = ContractsResponse()
@@ -75,12 +95,25 @@ class TradeClient(TigerOpenClient):
 
         return None
 
-    def get_contract(self, contract_id):
-        params = ContractParams()
-        params.account = self._account
-        params.contract_id = contract_id
+    def prewarm_contracts(self, universe, sec_type=SecurityType.STK, currency=Currency.USD, exchange=None):
+        """
+        批量加载交易范围内的合约到本地索引
+        :param universe: 股票代码或 (symbol, sec_type, currency, exchange) 元组的列表
+        :return: 加载失败的查询及异常 [(query, exception)]
+        """
+        return self.contract_index.prewarm(universe, sec_type=sec_type, currency=currency, exchange=exchange)
 
-        request = OpenApiRequest(CONTRACT, biz_model=params)
+    def get_contract(self, contract_id):
+        contract = self.contract_index.get_by_id(contract_id)
+        if contract is not None:
+            return contract
+        if self._reference_cache is not None:
+            return self._reference_cache.get(('contract', self._account, contract_id),
+                                             lambda: self.__get_contract(contract_id))
+        return self.__get_contract(contract_id)
+
+    def __get_contract(self, contract_id):
+        request = contract_request(self._account, contract_id)
         response_content = self.__fetch_data(request)
         if response_content:
             response = ContractsResponse()
@@ -95,18 +128,8 @@ class TradeClient(TigerOpenClient):
     def get_positions(self, account=None, sec_type=SecurityType.STK, currency=Currency.ALL, market=Market.ALL,
                       symbol=None,
                       sub_accounts=None):
-        params = PositionParams()
-        params.account = account if account else self._account
-        if sec_type:
-            params.sec_type = sec_type.value
-        params.sub_accounts = sub_accounts
-        if currency:
-            params.currency = currency.value
-        if market:
-            params.market = market.value
-        params.symbol = symbol
-
-        request = OpenApiRequest(POSITIONS, biz_model=params)
+        request = positions_request(account if account else self._account, sec_type, currency, market, symbol,
+                                    sub_accounts)
         response_content = self.__fetch_data(request)
         if response_content:
             response = PositionsResponse()
@@ -119,13 +142,7 @@ class TradeClient(TigerOpenClient):
         return None
 
     def get_assets(self, account=None, sub_accounts=None, segment=False, market_value=False):
-        params = AssetParams()
-        params.account = account if account else self._account
-        params.sub_accounts = sub_accounts
-        params.segment = segment
-        params.market_value = market_value
-
-        request = OpenApiRequest(ASSETS, biz_model=params)
+        request = assets_request(account if account else self._account, sub_accounts, segment, market_value)
         response_content = self.__fetch_data(request)
         if response_content:
             response = AssetsResponse()
@@ -139,17 +156,8 @@ class TradeClient(TigerOpenClient):
 
     def get_orders(self, account=None, sec_type=None, market=Market.ALL, symbol=None, start_time=None, end_time=None,
                    limit=100, is_brief=False):
-        params = OrdersParams()
-        params.account = account if account else self._account
-        if sec_type:
-            params.sec_type = sec_type.value
-        params.market = market.value
-        params.symbol = symbol
-        params.start_data = start_time
-        params.end_date = end_time
-        params.limit = limit
-        params.is_brief = is_brief
-        request = OpenApiRequest(ORDERS, biz_model=params)
+        request = orders_request(account if account else self._account, sec_type, market, symbol, start_time,
+                                 end_time, limit, is_brief)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrdersResponse()
@@ -172,15 +180,8 @@ class TradeClient(TigerOpenClient):
         :param end_time:
         :return:
         """
-        params = OrdersParams()
-        params.account = account if account else self._account
-        if sec_type:
-            params.sec_type = sec_type.value
-        params.market = market.value
-        params.symbol = symbol
-        params.start_data = start_time
-        params.end_date = end_time
-        request = OpenApiRequest(ACTIVE_ORDERS, biz_model=params)
+        request = open_orders_request(account if account else self._account, sec_type, market, symbol, start_time,
+                                      end_time)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrdersResponse()
@@ -192,12 +193,7 @@ class TradeClient(TigerOpenClient):
         return None
 
     def get_order(self, account=None, id=None, order_id=None, is_brief=False):
-        params = OrderParams()
-        params.account = account if account else self._account
-        params.id = id
-        params.order_id = order_id
-        params.is_brief = is_brief
-        request = OpenApiRequest(ORDERS, biz_model=params)
+        request = order_request(account if account else self._account, id, order_id, is_brief)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrdersResponse()
@@ -211,41 +207,41 @@ class TradeClient(TigerOpenClient):
     def create_order(self, account, contract, action, order_type, quantity, limit_price=None, aux_price=None,
                      trail_stop_price=None, trailing_percent=None, percent_offset=None, time_in_force=None,
                      outside_rth=None):
-        params = AccountsParams()
-        params.account = account if account else self._account
-        request = OpenApiRequest(ORDER_NO, biz_model=params)
+        order_account = account if account else self._account
+        if self._order_id_pool is not None:
+            order_id = self._order_id_pool.get(order_account)
+        else:
+            order_id = self.__get_order_id(order_account)
+        if order_id is None:
+            return None
+
+        return Order(account, contract, action, order_type, quantity, limit_price=limit_price,
+                     aux_price=aux_price, trail_stop_price=trail_stop_price,
+                     trailing_percent=trailing_percent, percent_offset=percent_offset,
+                     time_in_force=time_in_force, outside_rth=outside_rth, order_id=order_id)
+
+    def prefetch_order_ids(self, account=None):
+        """
+        在后台为账户预先申请订单号，需要配置 order_id_pool_size
+        """
+        if self._order_id_pool is not None:
+            self._order_id_pool.refill(account if account else self._account)
+
+    def __get_order_id(self, account):
+        request = order_id_request(account)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrderIdResponse()
             response.parse_response_content(response_content)
             if response.is_success():
-                order_id = response.order_id
-                order = Order(account, contract, action, order_type, quantity, limit_price=limit_price,
-                              aux_price=aux_price, trail_stop_price=trail_stop_price,
-                              trailing_percent=trailing_percent, percent_offset=percent_offset,
-                              time_in_force=time_in_force, outside_rth=outside_rth, order_id=order_id)
-                return order
+                return response.order_id
             else:
                 raise ApiException(response.code, response.message)
 
         return None
 
     def place_order(self, order):
-        params = PlaceModifyOrderParams()
-        params.account = order.account
-        params.contract = order.contract
-        params.action = order.action
-        params.order_type = order.order_type
-        params.order_id = order.order_id
-        params.quantity = order.quantity
-        params.limit_price = order.limit_price
-        params.aux_price = order.aux_price
-        params.trail_stop_price = order.trail_stop_price
-        params.trailing_percent = order.trailing_percent
-        params.percent_offset = order.percent_offset
-        params.time_in_force = order.time_in_force
-        params.outside_rth = order.outside_rth
-        request = OpenApiRequest(PLACE_ORDER, biz_model=params)
+        request = place_order_request(order)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrderIdResponse()
@@ -261,22 +257,8 @@ class TradeClient(TigerOpenClient):
     def modify_order(self, order, quantity=None, limit_price=None, aux_price=None,
                      trail_stop_price=None, trailing_percent=None, percent_offset=None,
                      time_in_force=None, outside_rth=None):
-        params = PlaceModifyOrderParams()
-        params.account = order.account
-        params.order_id = order.order_id
-        params.id = order.id
-        params.contract = order.contract
-        params.action = order.action
-        params.order_type = order.order_type
-        params.quantity = quantity if quantity is not None else order.quantity
-        params.limit_price = limit_price if limit_price is not None else order.limit_price
-        params.aux_price = aux_price if aux_price is not None else order.aux_price
-        params.trail_stop_price = trail_stop_price if trail_stop_price is not None else order.trail_stop_price
-        params.trailing_percent = trailing_percent if trailing_percent is not None else order.trailing_percent
-        params.percent_offset = percent_offset if percent_offset is not None else order.percent_offset
-        params.time_in_force = time_in_force if time_in_force is not None else order.time_in_force
-        params.outside_rth = outside_rth if outside_rth is not None else order.outside_rth
-        request = OpenApiRequest(MODIFY_ORDER, biz_model=params)
+        request = modify_order_request(order, quantity, limit_price, aux_price, trail_stop_price, trailing_percent,
+                                       percent_offset, time_in_force, outside_rth)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrderIdResponse()
@@ -289,11 +271,7 @@ class TradeClient(TigerOpenClient):
         return False
 
     def cancel_order(self, account=None, id=None, order_id=None):
-        params = CancelOrderParams()
-        params.account = account if account else self._account
-        params.order_id = order_id
-        params.id = id
-        request = OpenApiRequest(CANCEL_ORDER, biz_model=params)
+        request = cancel_order_request(account if account else self._account, id, order_id)
         response_content = self.__fetch_data(request)
         if response_content:
             response = OrderIdResponse()
@@ -305,6 +283,48 @@ class TradeClient(TigerOpenClient):
 
         return False
 
+    def place_orders(self, orders):
+        """
+        批量下单，订单并发提交，单个订单失败不影响其他订单
+        :param orders: Order 对象列表
+        :return: 与 orders 顺序一致的结果列表，成功为订单的全局 id，失败为对应的异常对象
+        """
+        def place(order):
+            if not self.place_order(order):
+                raise ResponseException('place order failed. order_id:' + str(order.order_id))
+            return order.id
+
+        return self.__dispatch(place, orders)
+
+    def cancel_orders(self, ids, account=None):
+        """
+        批量撤单，并发提交，单个订单失败不影响其他订单
+        :param ids: 订单全局 id 列表
+        :param account: 账户，默认为配置中的账户
+        :return: 与 ids 顺序一致的结果列表，成功为订单的全局 id，失败为对应的异常对象
+        """
+        def cancel(id):
+            if not self.cancel_order(account=account, id=id):
+                raise ResponseException('cancel order failed. id:' + str(id))
+            return id
+
+        return self.__dispatch(cancel, ids)
+
+    def __dispatch(self, func, items):
+        """
+        并发执行 func，每次调用仍经过限流和连接池，异常作为结果返回
+        """
+        def call(item):
+            try:
+                return func(item)
+            except Exception as e:
+                return e
+
+        items = list(items)
+        if self._executor is not None and len(items) > 1:
+            return list(self._executor.map(call, items))
+        return [call(item) for item in items]
+
     def __fetch_data(self, request):
         try:
             response = super(TradeClient, self).execute(request)